@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'adaptive.py'
+__description__ = '''Monte Carlo adaptativo: lotes hasta alcanzar la precisión pedida'''
+
+import argparse
+import json
+import math
+from dataclasses import asdict, fields
+from multiprocessing import Pool
+from statistics import NormalDist
+
+import numpy as np
+
+from rng import RandomStreams
+from simulation import (SessionConfig, run_sessions, EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT,
+                        EXIT_MAX_ROUNDS)
+from sweep import expand_grid, config_key, task_seed
+
+# -- Motivos de salida que cuentan como ruina
+RUIN = (EXIT_BROKE, EXIT_INSUFFICIENT)
+
+# -- Estado de cada configuración al terminar
+PRECISE = 'precise'
+DOMINATED = 'dominated'
+BUDGET = 'max_sessions'
+
+class RunningMean:
+    '''
+    Media y varianza acumuladas por lotes (combinación de Chan et al.)
+    '''
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def merge(self, values:np.ndarray) -> None:
+        n = len(values)
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    @property
+    def stderr(self) -> float:
+        if self.n < 2:
+            return math.inf
+        return math.sqrt(self.m2 / (self.n - 1) / self.n)
+
+def wilson(successes:int, n:int, z:float) -> tuple:
+    '''
+    Intervalo de Wilson para una proporción (se comporta bien cerca de 0 y 1)
+    '''
+    if not n:
+        return 0.0, 1.0
+    p = successes / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - half), min(1.0, center + half)
+
+class Estimate:
+    '''
+    Estimaciones acumuladas de una configuración: probabilidad de ruina, profit
+    medio y rondas hasta salir, con intervalos de confianza.
+
+    Los intervalos se revisan después de cada lote, así que el nivel de confianza
+    se reparte entre las revisiones (alpha / (k (k + 1)) en la revisión k, que suma
+    alpha): la cobertura se mantiene aunque se detenga en cualquier momento.
+    '''
+
+    def __init__(self, config:SessionConfig, confidence:float=0.95):
+        self.config = config
+        self.confidence = confidence
+        self.looks = 0
+        self.z = 0.0
+        self.ruin = 0
+        self.exits = {reason: 0 for reason in (EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT, EXIT_MAX_ROUNDS)}
+        self.profit = RunningMean()
+        self.rounds = RunningMean()
+        self.status = None
+
+    @property
+    def sessions(self) -> int:
+        return self.profit.n
+
+    def update(self, batch:dict) -> None:
+        self.profit.merge(batch['profit'])
+        self.rounds.merge(batch['rounds'])
+        for reason, count in batch['exits'].items():
+            self.exits[reason] += count
+        self.ruin = sum(self.exits[reason] for reason in RUIN)
+        self.looks += 1
+        alpha = (1 - self.confidence) / (self.looks * (self.looks + 1))
+        self.z = NormalDist().inv_cdf(1 - alpha / 2)
+
+    def ruin_interval(self) -> tuple:
+        return wilson(self.ruin, self.sessions, self.z)
+
+    def profit_interval(self) -> tuple:
+        half = self.z * self.profit.stderr
+        return self.profit.mean - half, self.profit.mean + half
+
+    def rounds_interval(self) -> tuple:
+        half = self.z * self.rounds.stderr
+        return self.rounds.mean - half, self.rounds.mean + half
+
+    def is_precise(self, ruin_precision:float, profit_precision:float, rounds_precision:float) -> bool:
+        '''
+        Todas las semiamplitudes pedidas (None = sin requisito) están dentro del objetivo
+        '''
+        checks = ((ruin_precision, self.ruin_interval()),
+                  (profit_precision, self.profit_interval()),
+                  (rounds_precision, self.rounds_interval()))
+        return all(target is None or (high - low) / 2 <= target for target, (low, high) in checks)
+
+    def dominates(self, other:'Estimate') -> bool:
+        '''
+        Claramente mejor en ambos criterios: más profit y menos ruina, con intervalos separados
+        '''
+        return (self.profit_interval()[0] > other.profit_interval()[1]
+                and self.ruin_interval()[1] < other.ruin_interval()[0])
+
+    def summary(self) -> dict:
+        n = self.sessions
+        ruin_low, ruin_high = self.ruin_interval()
+        profit_low, profit_high = self.profit_interval()
+        rounds_low, rounds_high = self.rounds_interval()
+        return {
+            'key': config_key(self.config),
+            'config': asdict(self.config),
+            'status': self.status,
+            'sessions': n,
+            **{f'{reason}_rate': count / n if n else 0.0 for reason, count in self.exits.items()},
+            'ruin_rate': self.ruin / n if n else 0.0,
+            'ruin_ci': [ruin_low, ruin_high],
+            'mean_profit': self.profit.mean,
+            'profit_ci': [profit_low, profit_high],
+            'mean_rounds': self.rounds.mean,
+            'rounds_ci': [rounds_low, rounds_high],
+        }
+
+def run_batch(task:tuple) -> dict:
+    '''
+    Juega un lote de sesiones de una configuración (se llama dentro del proceso del pool)
+    '''
+    index, params, sessions, seed_sequence, engine = task
+    config = SessionConfig(**params)
+    if engine == 'vectorized':
+        from vectorized import simulate
+        sim = simulate(config, sessions, seed=seed_sequence)
+        reasons = sim.exit_reasons()
+        profit = (sim.wallet - sim.initial_wallet).astype(np.float64)
+        rounds = sim.rounds.astype(np.float64)
+    else:
+        results = run_sessions(config, sessions, seed=seed_sequence)
+        reasons = np.array([r.exit_reason for r in results])
+        profit = np.array([r.profit for r in results], dtype=np.float64)
+        rounds = np.array([r.rounds for r in results], dtype=np.float64)
+    exits = {reason: int((reasons == reason).sum()) for reason in (EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT, EXIT_MAX_ROUNDS)}
+    return {'index': index, 'profit': profit, 'rounds': rounds, 'exits': exits}
+
+def adaptive_sweep(configs:list, ruin_precision:float=0.01, profit_precision:float=None, rounds_precision:float=None,
+                   batch:int=1000, min_sessions:int=2000, max_sessions:int=200000, confidence:float=0.95,
+                   seed:int=0, engine:str='scalar', workers:int=None, drop_dominated:bool=True) -> list:
+    '''
+    Juega lotes de `batch` sesiones para todas las configuraciones activas. Cada
+    configuración se detiene al alcanzar la precisión pedida (semiamplitud de los
+    intervalos), al agotar `max_sessions` o, si `drop_dominated`, cuando otra la
+    domina claramente. Retorna las `Estimate` en el orden de `configs`.
+    '''
+    estimates = [Estimate(config, confidence) for config in configs]
+    # -- Cada configuración tiene sus propios flujos; cada lote es un hijo independiente
+    streams = [RandomStreams(task_seed(seed, config_key(config))) for config in configs]
+
+    pool = Pool(processes=workers) if workers != 1 else None
+    try:
+        while True:
+            active = [i for i, e in enumerate(estimates) if e.status is None]
+            if not active:
+                break
+            tasks = [(i, asdict(configs[i]), batch, streams[i].split(1)[0].seed_sequence, engine) for i in active]
+            batches = pool.imap_unordered(run_batch, tasks) if pool is not None else map(run_batch, tasks)
+            for result in batches:
+                estimates[result['index']].update(result)
+
+            for i in active:
+                estimate = estimates[i]
+                if estimate.sessions < min_sessions:
+                    continue
+                if estimate.is_precise(ruin_precision, profit_precision, rounds_precision):
+                    estimate.status = PRECISE
+                elif estimate.sessions >= max_sessions:
+                    estimate.status = BUDGET
+
+            if drop_dominated and len(estimates) > 1:
+                ready = [e for e in estimates if e.sessions >= min_sessions and e.status != DOMINATED]
+                for estimate in ready:
+                    if estimate.status is None and any(other.dominates(estimate) for other in ready if other is not estimate):
+                        estimate.status = DOMINATED
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return estimates
+
+def adaptive_run(config:SessionConfig, **kwargs) -> Estimate:
+    '''
+    Igual que `adaptive_sweep` para una sola configuración
+    '''
+    return adaptive_sweep([config], **kwargs)[0]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Monte Carlo adaptativo de la Ruleta')
+
+    parser.add_argument('--method', type=str, default='TOP2', help='Estrategias separadas por coma (TOP2,TOP3,COMMONS)')
+    parser.add_argument('--hot_amount', type=str, default='40', help='Montos por número caliente separados por coma')
+    parser.add_argument('--profit_out', type=str, default='33', help='Porcentajes de profit separados por coma')
+    parser.add_argument('--use_antigala', type=str, default='0', help='Valores 0/1 separados por coma')
+    parser.add_argument('--gale', type=str, default='1,2,4', help='Secuencias de gale separadas por punto y coma (1,2,4;1,1,1)')
+    parser.add_argument('--max_rounds', type=int, default=100, help='Límite de rondas por sesión')
+    parser.add_argument('--configs', type=str, help='Archivo JSON con una lista de configuraciones (ignora el grid)')
+    parser.add_argument('--ruin_precision', type=float, default=0.01, help='Semiamplitud objetivo de la probabilidad de ruina')
+    parser.add_argument('--profit_precision', type=float, default=None, help='Semiamplitud objetivo del profit medio (DOP)')
+    parser.add_argument('--rounds_precision', type=float, default=None, help='Semiamplitud objetivo de las rondas hasta salir')
+    parser.add_argument('--batch', type=int, default=1000, help='Sesiones por lote')
+    parser.add_argument('--min_sessions', type=int, default=2000, help='Sesiones mínimas antes de detener una configuración')
+    parser.add_argument('--max_sessions', type=int, default=200000, help='Sesiones máximas por configuración')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Nivel de confianza de los intervalos')
+    parser.add_argument('--keep_dominated', action='store_true', help='No descartar configuraciones dominadas')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla base')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos del pool (por defecto todos los núcleos)')
+    parser.add_argument('--engine', type=str, choices=['scalar', 'vectorized'], default='scalar', help='Motor de simulación')
+    parser.add_argument('--output', type=str, default=None, help='Archivo de resultados (JSON lines, opcional)')
+
+    args = parser.parse_args()
+
+    if args.configs:
+        allowed = {f.name for f in fields(SessionConfig)}
+        with open(args.configs, encoding='utf-8') as f:
+            configs = [SessionConfig(**{k: v for k, v in item.items() if k in allowed}) for item in json.load(f)]
+    else:
+        configs = expand_grid({
+            'method': args.method.replace(' ', '').split(','),
+            'hot_amount': [int(x) for x in args.hot_amount.split(',')],
+            'profit_out': [int(x) for x in args.profit_out.split(',')],
+            'use_antigala': [bool(int(x)) for x in args.use_antigala.split(',')],
+            'gale': [[int(x) for x in gale.split(',')] for gale in args.gale.replace(' ', '').split(';')],
+        }, base=SessionConfig(max_rounds=args.max_rounds))
+
+    estimates = adaptive_sweep(configs, ruin_precision=args.ruin_precision, profit_precision=args.profit_precision,
+                               rounds_precision=args.rounds_precision, batch=args.batch,
+                               min_sessions=args.min_sessions, max_sessions=args.max_sessions,
+                               confidence=args.confidence, seed=args.seed, engine=args.engine,
+                               workers=args.workers, drop_dominated=not args.keep_dominated)
+
+    total = sum(e.sessions for e in estimates)
+    for e in estimates:
+        row = e.summary()
+        print(f"\t {row['config']['method']} gale {row['config']['gale']} antigala {int(row['config']['use_antigala'])} - {row['status']} con {row['sessions']} sesiones:"
+              f" ruina {row['ruin_rate']:.2%} [{row['ruin_ci'][0]:.2%}, {row['ruin_ci'][1]:.2%}]"
+              f" - profit {row['mean_profit']:.1f} [{row['profit_ci'][0]:.1f}, {row['profit_ci'][1]:.1f}]")
+    print(f'Se simularon {total} sesiones en total')
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            for e in estimates:
+                f.write(json.dumps(e.summary()) + '\n')
@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'analytics.py'
+__description__ = '''Análisis vectorizado de historiales de tiradas grabados'''
+
+import argparse
+import json
+import math
+
+import numpy as np
+
+from spinlog import SpinLog, NO_SPIN
+from wheel import Wheel
+
+# -- Registros procesados por bloque (memoria acotada sin importar el tamaño del registro)
+CHUNK = 1 << 22
+
+def _chunks(log:SpinLog, chunk:int):
+    for start in range(0, len(log), chunk):
+        yield np.asarray(log.records[start:start + chunk])
+
+def _spin_chunks(log:SpinLog, chunk:int):
+    '''
+    Números ganadores por bloque, sin los registros sin tirada
+    '''
+    for records in _chunks(log, chunk):
+        numbers = records['number']
+        yield numbers[numbers != NO_SPIN].astype(np.int64)
+
+def _session_chunks(log:SpinLog, chunk:int):
+    '''
+    (números, sesiones) por bloque, sin los registros sin tirada, agrupados por
+    sesión con un orden estable: cada sesión conserva el orden de sus rondas
+    '''
+    for records in _chunks(log, chunk):
+        records = records[records['number'] != NO_SPIN]
+        sessions = records['session'].astype(np.int64)
+        order = np.argsort(sessions, kind='stable')
+        yield records['number'][order].astype(np.int64), sessions[order]
+
+def _grow(array:np.ndarray, size:int, fill) -> np.ndarray:
+    '''
+    Agrega filas con `fill` hasta tener `size` (estado por sesión)
+    '''
+    if len(array) >= size:
+        return array
+    return np.concatenate((array, np.full((size - len(array),) + array.shape[1:], fill, dtype=array.dtype)))
+
+def _session_index(sessions:np.ndarray, counts:np.ndarray) -> tuple:
+    '''
+    Posición de cada tirada dentro de su sesión (continuando desde `counts`, las
+    tiradas ya vistas de cada sesión) y qué registros abren el tramo de su sesión
+    en el bloque. Actualiza `counts`.
+    '''
+    index = np.arange(len(sessions))
+    first = np.concatenate(([True], sessions[1:] != sessions[:-1]))
+    start = np.maximum.accumulate(np.where(first, index, 0))
+    position = counts[sessions] + index - start
+    last = np.concatenate((first[1:], [True]))
+    counts[sessions[last]] = position[last] + 1
+    return position, first
+
+def chi2_sf(stat:float, dof:int) -> float:
+    '''
+    P(X >= stat) para una chi-cuadrado con `dof` grados de libertad
+    (función gamma incompleta regularizada, sin depender de SciPy)
+    '''
+    if stat <= 0:
+        return 1.0
+    a, x = dof / 2, stat / 2
+    if x < a + 1:
+        # -- Serie de la gamma incompleta inferior
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(-x + a * math.log(x) - math.lgamma(a)))
+    # -- Fracción continua de la gamma incompleta superior (Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    i = 0
+    while True:
+        i += 1
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return h * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+def pocket_frequency(log:SpinLog, wheel:Wheel, chunk:int=CHUNK) -> dict:
+    '''
+    Frecuencia por casilla y prueba chi-cuadrado de uniformidad
+    '''
+    size = max(wheel.numbers) + 1
+    counts = np.zeros(size, dtype=np.int64)
+    for numbers in _spin_chunks(log, chunk):
+        counts += np.bincount(numbers, minlength=size)[:size]
+
+    observed = counts[list(wheel.numbers)]
+    total = int(observed.sum())
+    expected = total / wheel.size if total else 0
+    stat = float(((observed - expected) ** 2 / expected).sum()) if total else 0.0
+    return {
+        'spins': total,
+        'frequency': {wheel.label(n): int(c) for n, c in zip(wheel.numbers, observed)},
+        'chi_square': stat,
+        'dof': wheel.size - 1,
+        'p_value': chi2_sf(stat, wheel.size - 1),
+    }
+
+def hot_persistence(log:SpinLog, wheel:Wheel, window:int=7, top:int=2, chunk:int=CHUNK) -> dict:
+    '''
+    Divide las tiradas de cada sesión en ventanas consecutivas de `window` y toma
+    los `top` más frecuentes de cada una (como `get_hotters`, desempatando por
+    orden de la rueda). Mide cuántos de ellos repiten como hotters en la ventana
+    siguiente de la misma sesión y qué fracción de las tiradas siguientes cae en ellos.
+    Las tiradas que no completan una ventana al final de una sesión se descartan.
+    Funciona con sesiones intercaladas; la memoria crece con las sesiones, no con las tiradas.
+    '''
+    positions = np.full(max(wheel.numbers) + 1, -1, dtype=np.int64)
+    positions[list(wheel.numbers)] = np.arange(wheel.size)
+
+    # -- Por sesión: tiradas vistas, ventana en curso y hotters de la última ventana completa
+    counts = np.zeros(0, dtype=np.int64)
+    pending = np.zeros((0, window), dtype=np.int64)
+    previous = np.zeros((0, wheel.size), dtype=bool)
+    has_previous = np.zeros(0, dtype=bool)
+
+    repeated = hits = pairs = total = 0
+
+    def compare(current, following, following_pos):
+        nonlocal repeated, hits, pairs
+        repeated += int((current & following).sum())
+        pairs += len(current)
+        hits += int(np.take_along_axis(current, following_pos, axis=1).sum())
+
+    for numbers, sessions in _session_chunks(log, chunk):
+        if not len(numbers):
+            continue
+        size = int(sessions.max()) + 1
+        counts, pending = _grow(counts, size, 0), _grow(pending, size, -1)
+        previous, has_previous = _grow(previous, size, False), _grow(has_previous, size, False)
+
+        seen = counts.copy()
+        position, first = _session_index(sessions, counts)
+        # -- Una fila por (sesión, ventana) del bloque; la primera puede continuar la ventana en curso
+        number = position // window
+        opens = first | np.concatenate(([True], number[1:] != number[:-1]))
+        group = np.cumsum(opens) - 1
+        group_sessions, group_windows = sessions[opens], number[opens]
+        windows = np.full((len(group_sessions), window), -1, dtype=np.int64)
+        resumed = (group_windows == seen[group_sessions] // window) & (seen[group_sessions] % window > 0)
+        windows[resumed] = pending[group_sessions[resumed]]
+        windows[group, position % window] = positions[numbers]
+
+        # -- Solo la última ventana de cada sesión puede quedar incompleta: se guarda para el bloque siguiente
+        complete = (group_windows + 1) * window <= counts[group_sessions]
+        pending[group_sessions[~complete]] = windows[~complete]
+        windows, group_sessions = windows[complete], group_sessions[complete]
+        if not len(windows):
+            continue
+        total += len(windows)
+
+        cells = (np.arange(len(windows))[:, None] * wheel.size + windows).ravel()
+        frequency = np.bincount(cells, minlength=len(windows) * wheel.size).reshape(len(windows), wheel.size)
+        # -- Orden estable: a igual frecuencia gana la casilla anterior en la rueda
+        hot = np.argsort(-frequency, axis=1, kind='stable')[:, :top]
+        hot_mask = np.zeros((len(windows), wheel.size), dtype=bool)
+        hot_mask[np.arange(len(windows))[:, None], hot] = True
+
+        # -- Ventanas seguidas de la misma sesión dentro del bloque
+        same = group_sessions[1:] == group_sessions[:-1]
+        compare(hot_mask[:-1][same], hot_mask[1:][same], windows[1:][same])
+        # -- Primera ventana de cada sesión frente a la última del bloque anterior
+        starts = np.concatenate(([True], ~same))
+        linked = has_previous[group_sessions[starts]]
+        compare(previous[group_sessions[starts][linked]], hot_mask[starts][linked], windows[starts][linked])
+        ends = np.concatenate((~same, [True]))
+        previous[group_sessions[ends]] = hot_mask[ends]
+        has_previous[group_sessions[ends]] = True
+
+    return {
+        'window': window,
+        'top': top,
+        'windows': total,
+        'repeat_rate': repeated / (pairs * top) if pairs else 0.0,
+        'next_window_hit_rate': hits / (pairs * window) if pairs else 0.0,
+        'expected_hit_rate': top / wheel.size,
+    }
+
+def streaks_and_gaps(log:SpinLog, wheel:Wheel, max_length:int=1000, chunk:int=CHUNK) -> dict:
+    '''
+    Distribución de rachas (mismo número seguido) y de huecos (tiradas entre
+    dos apariciones del mismo número), dentro de cada sesión. Los valores
+    mayores a `max_length` se acumulan en el último. Funciona con sesiones
+    intercaladas; la memoria crece con las sesiones, no con las tiradas.
+    '''
+    size = max(wheel.numbers) + 1
+    streaks = np.zeros(max_length + 1, dtype=np.int64)
+    gaps = np.zeros(max_length + 1, dtype=np.int64)
+    # -- Por sesión: tiradas vistas, racha abierta y última posición de cada número
+    counts = np.zeros(0, dtype=np.int64)
+    run_number = np.zeros(0, dtype=np.int64)
+    run_length = np.zeros(0, dtype=np.int64)
+    last_seen = np.zeros((0, size), dtype=np.int64)
+
+    def add(hist, values):
+        hist += np.bincount(np.minimum(values, max_length), minlength=max_length + 1)
+
+    for numbers, sessions in _session_chunks(log, chunk):
+        if not len(numbers):
+            continue
+        n_sessions = int(sessions.max()) + 1
+        counts, run_number = _grow(counts, n_sessions, 0), _grow(run_number, n_sessions, -1)
+        run_length, last_seen = _grow(run_length, n_sessions, 0), _grow(last_seen, n_sessions, -1)
+        position, first = _session_index(sessions, counts)
+
+        # -- Rachas: tramos iguales de cada sesión; el primero continúa la racha abierta de la sesión
+        starts = np.flatnonzero(first | np.concatenate(([True], numbers[1:] != numbers[:-1])))
+        lengths = np.diff(np.concatenate((starts, [len(numbers)])))
+        ends = np.concatenate((first[starts[1:]], [True]))
+        opening = first[starts]
+        open_sessions = sessions[starts[opening]]
+        carried = run_length[open_sessions]
+        joined = run_number[open_sessions] == numbers[starts[opening]]
+        lengths[opening] += np.where(joined, carried, 0)
+        closed = carried[~joined]
+        add(streaks, closed[closed > 0])
+        add(streaks, lengths[~ends])
+        end_sessions = sessions[starts[ends]]
+        run_number[end_sessions] = numbers[starts[ends]]
+        run_length[end_sessions] = lengths[ends]
+
+        # -- Huecos: diferencias de posición entre apariciones del mismo número en la misma sesión
+        order = np.lexsort((numbers, sessions))
+        sorted_sessions, sorted_numbers, sorted_position = sessions[order], numbers[order], position[order]
+        change = (sorted_sessions[1:] != sorted_sessions[:-1]) | (sorted_numbers[1:] != sorted_numbers[:-1])
+        opens = np.concatenate(([True], change))
+        previous = np.empty_like(sorted_position)
+        previous[1:] = sorted_position[:-1]
+        previous[opens] = last_seen[sorted_sessions[opens], sorted_numbers[opens]]
+        valid = previous >= 0
+        add(gaps, sorted_position[valid] - previous[valid] - 1)
+        closes = np.concatenate((change, [True]))
+        last_seen[sorted_sessions[closes], sorted_numbers[closes]] = sorted_position[closes]
+
+    add(streaks, run_length[run_length > 0])
+
+    def nonzero(hist):
+        return {int(i): int(c) for i, c in enumerate(hist) if c}
+
+    return {'streaks': nonzero(streaks), 'gaps': nonzero(gaps),
+            'mean_gap': float((np.arange(max_length + 1) * gaps).sum() / gaps.sum()) if gaps.sum() else 0.0}
+
+def drawdown_curves(log:SpinLog, initial_wallet:int=None, chunk:int=CHUNK) -> dict:
+    '''
+    Caída de cartera respecto al máximo previo de cada sesión. Retorna la caída
+    media y máxima por ronda (curvas) y la máxima caída de cada sesión.
+    Funciona también con registros de sesiones intercaladas (simulación vectorizada).
+    '''
+    peaks = np.zeros(0, dtype=np.int64)
+    worst = np.zeros(0, dtype=np.int64)
+    curve_sum = np.zeros(0, dtype=np.float64)
+    curve_max = np.zeros(0, dtype=np.int64)
+    curve_count = np.zeros(0, dtype=np.int64)
+
+    for records in _chunks(log, chunk):
+        records = records[records['number'] != NO_SPIN]
+        if not len(records):
+            continue
+        session = records['session'].astype(np.int64)
+        rounds = records['round'].astype(np.int64)
+        wallet = records['wallet'].astype(np.int64)
+
+        sessions = int(session.max()) + 1
+        start_peak = np.iinfo(np.int64).min if initial_wallet is None else initial_wallet
+        peaks, worst = _grow(peaks, sessions, start_peak), _grow(worst, sessions, 0)
+        span = int(rounds.max()) + 1
+        curve_sum, curve_max, curve_count = _grow(curve_sum, span, 0), _grow(curve_max, span, 0), _grow(curve_count, span, 0)
+
+        # -- Máximo acumulado por sesión: se ordena por sesión (estable, respeta el orden de rondas)
+        # -- y se separan los tramos con un desplazamiento mayor que el rango de carteras
+        order = np.argsort(session, kind='stable')
+        session, rounds, wallet = session[order], rounds[order], wallet[order]
+        _, segment = np.unique(session, return_inverse=True)
+        low = int(wallet.min())
+        scale = int(wallet.max()) - low + 1
+        keyed = segment * scale + (wallet - low)
+        peak = np.maximum.accumulate(keyed) - segment * scale + low
+        peak = np.maximum(peak, peaks[session])
+
+        drawdown = peak - wallet
+        np.maximum.at(worst, session, drawdown)
+        np.maximum.at(peaks, session, peak)
+        curve_sum += np.bincount(rounds, weights=drawdown, minlength=len(curve_sum))
+        np.maximum.at(curve_max, rounds, drawdown)
+        curve_count += np.bincount(rounds, minlength=len(curve_count))
+
+    played = curve_count > 0
+    return {
+        'rounds': np.flatnonzero(played),
+        'mean_drawdown': curve_sum[played] / curve_count[played],
+        'max_drawdown': curve_max[played],
+        'session_max_drawdown': worst,
+    }
+
+def summarize(path:str, wheel:Wheel, window:int=7, top:int=2, initial_wallet:int=None, chunk:int=CHUNK) -> dict:
+    '''
+    Reporte completo de un registro de tiradas
+    '''
+    log = SpinLog(path)
+    drawdown = drawdown_curves(log, initial_wallet=initial_wallet, chunk=chunk)
+    return {
+        'records': len(log),
+        'frequency': pocket_frequency(log, wheel, chunk=chunk),
+        'persistence': hot_persistence(log, wheel, window=window, top=top, chunk=chunk),
+        'streaks_and_gaps': streaks_and_gaps(log, wheel, chunk=chunk),
+        'drawdown': {
+            'sessions': int(len(drawdown['session_max_drawdown'])),
+            'mean_session_max_drawdown': float(drawdown['session_max_drawdown'].mean()) if len(drawdown['session_max_drawdown']) else 0.0,
+            'worst_drawdown': int(drawdown['max_drawdown'].max()) if len(drawdown['max_drawdown']) else 0,
+        },
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Análisis de un registro de tiradas')
+
+    parser.add_argument('path', type=str, help='Archivo de registro (.rlog)')
+    parser.add_argument('--numbers', type=str, default='little', help='Rueda: little, european, american o lista de números')
+    parser.add_argument('--window', type=int, default=7, help='Tamaño de ventana para la persistencia de hotters')
+    parser.add_argument('--top', type=int, default=2, help='Cantidad de hotters por ventana')
+    parser.add_argument('--initial_wallet', type=int, default=None, help='Cartera inicial de cada sesión (opcional)')
+
+    args = parser.parse_args()
+    report = summarize(args.path, Wheel.from_setting(args.numbers), window=args.window, top=args.top,
+                       initial_wallet=args.initial_wallet)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'benchmarks.py'
+__description__ = '''Benchmarks deterministas de los caminos críticos con control de regresiones'''
+
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import time
+from collections.abc import Mapping
+from typing import NamedTuple
+
+from rng import RandomStreams
+from simulation import SessionConfig, create_machine, run_session
+
+# -- Ruedas de 13, 37 y 38 casillas
+WHEELS = ('little', 'european', 'american')
+STRATEGIES = ('TOP2', 'TOP3', 'TOP5', 'COMMONS')
+# -- Bloques de historial inicial (de `history_size` tiradas) para las sesiones completas
+HISTORY_BLOCKS = (1, 10, 100)
+
+# -- Llamadas por repetición de cada caso por llamada y sesiones por repetición
+CALLS = 2000
+SESSIONS = 5
+SESSION_ROUNDS = 200
+SEED = 12345
+
+# -- Caída máxima de ops/s frente a la línea base antes de fallar
+THRESHOLD = 0.25
+
+class Case(NamedTuple):
+    '''
+    Un benchmark: `setup` prepara el estado y retorna una función que hace
+    todo el trabajo de una repetición y devuelve (operaciones hechas, resultados).
+    Los resultados (calientes, apuestas, carteras finales...) se resumen en una
+    huella que debe repetirse entre repeticiones y frente a la línea base.
+    '''
+    name: str
+    setup: object
+    unit: str = 'ops'
+
+def _machine(wheel:str, blocks:int=10, seed:int=SEED):
+    '''
+    Máquina sin I/O con historial inicial fijo (misma semilla, mismo estado)
+    '''
+    config = SessionConfig(numbers=wheel, initial_history_blocks=blocks)
+    return create_machine(config, rng=RandomStreams(seed))
+
+def _hotters(wheel:str, calls:int):
+    crlm = _machine(wheel)
+    def run():
+        return calls, [crlm.get_hotters(3) for _ in range(calls)]
+    return run
+
+def _coolest(wheel:str, calls:int):
+    crlm = _machine(wheel)
+    def run():
+        return calls, [crlm.get_coolest(3) for _ in range(calls)]
+    return run
+
+def _neighbors(wheel:str, calls:int):
+    crlm = _machine(wheel)
+    numbers = crlm.wheel.numbers
+    size = len(numbers)
+    def run():
+        return calls, [crlm.get_neighbors(numbers[i % size], 2) for i in range(calls)]
+    return run
+
+def _unique_neighbors(wheel:str, calls:int):
+    crlm = _machine(wheel)
+    numbers = crlm.wheel.numbers
+    # -- Calientes contiguos en la rueda: sus vecinos se repiten y hay que sustituirlos
+    hotters = [numbers[0], numbers[1], numbers[3]]
+    neighbors = [n for h in hotters for n in crlm.get_neighbors(h, 1)]
+    def run():
+        return calls, [crlm.select_unique_neighbors(neighbors_list=neighbors, hotters=hotters) for _ in range(calls)]
+    return run
+
+def _settle(wheel:str, calls:int):
+    crlm = _machine(wheel)
+    crlm.put_bet(dict(SessionConfig(numbers=wheel).strategy().bets(crlm).bets))
+    numbers = crlm.wheel.numbers
+    size = len(numbers)
+    def run():
+        settled = [crlm.settle_bet(numbers[i % size]) for i in range(calls)]
+        return calls, (settled, crlm.total_amount)
+    return run
+
+def _bets(method:str, wheel:str, calls:int):
+    crlm = _machine(wheel)
+    strategy = SessionConfig(method=method, numbers=wheel).strategy()
+    def run():
+        return calls, [strategy.bets(crlm).bets for _ in range(calls)]
+    return run
+
+def _session(method:str, wheel:str, blocks:int, sessions:int):
+    # -- Sin salida por profit ni por saldo: todas las sesiones juegan SESSION_ROUNDS rondas
+    config = SessionConfig(method=method, numbers=wheel, initial_history_blocks=blocks,
+                           max_rounds=SESSION_ROUNDS, profit_out=10**9, rondas_soportadas=10**6)
+    streams = RandomStreams(SEED).split(sessions)
+    def run():
+        results = [run_session(config, seed=rng) for rng in streams]
+        return sum(r.rounds for r in results), [(r.rounds, r.final_wallet, r.exit_reason) for r in results]
+    return run
+
+def cases(calls:int=CALLS, sessions:int=SESSIONS) -> list:
+    '''
+    Todos los casos: por rueda, el costo por llamada de cada camino crítico y,
+    por estrategia, la construcción de apuestas y sesiones completas
+    '''
+    result = []
+    for wheel in WHEELS:
+        result.append(Case(f'hotters/{wheel}', lambda w=wheel: _hotters(w, calls)))
+        result.append(Case(f'coolest/{wheel}', lambda w=wheel: _coolest(w, calls)))
+        result.append(Case(f'neighbors/{wheel}', lambda w=wheel: _neighbors(w, calls)))
+        result.append(Case(f'unique_neighbors/{wheel}', lambda w=wheel: _unique_neighbors(w, calls)))
+        result.append(Case(f'settle/{wheel}', lambda w=wheel: _settle(w, calls)))
+        for method in STRATEGIES:
+            result.append(Case(f'bets/{method}/{wheel}', lambda m=method, w=wheel: _bets(m, w, calls)))
+        for method in STRATEGIES:
+            for blocks in HISTORY_BLOCKS:
+                result.append(Case(f'session/{method}/{wheel}/h{blocks}',
+                                   lambda m=method, w=wheel, b=blocks: _session(m, w, b, sessions), unit='rounds'))
+    return result
+
+def _plain(value):
+    # -- Apuestas de solo lectura como dict y enteros de NumPy como int
+    return dict(value) if isinstance(value, Mapping) else int(value)
+
+def fingerprint(outputs) -> str:
+    '''
+    Huella de los resultados de una repetición
+    '''
+    data = json.dumps(outputs, default=_plain, separators=(',', ':')).encode()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def measure(case:Case, repeat:int=5) -> dict:
+    '''
+    Mejor tasa de `repeat` repeticiones; cada una parte del mismo estado y debe
+    hacer el mismo trabajo con los mismos resultados (la huella no se mide)
+    '''
+    best = 0.0
+    ops = digest = None
+    for _ in range(repeat):
+        run = case.setup()
+        start = time.perf_counter()
+        done, outputs = run()
+        elapsed = time.perf_counter() - start
+        current = fingerprint(outputs)
+        if digest is not None and (done, current) != (ops, digest):
+            raise RuntimeError(f'{case.name}: los resultados no son deterministas ({done}/{current} != {ops}/{digest})')
+        ops, digest = done, current
+        best = max(best, done / elapsed)
+    return {'unit': case.unit, 'ops': ops, 'per_sec': best, 'usec': 1e6 / best, 'fingerprint': digest}
+
+def run_benchmarks(selected:list, repeat:int=5) -> dict:
+    results = {}
+    for case in selected:
+        results[case.name] = row = measure(case, repeat=repeat)
+        print(f"\t {case.name:<32} {row['per_sec']:>12,.0f} {row['unit']}/s {row['usec']:>10.2f} µs")
+    return results
+
+def environment() -> dict:
+    import numpy as np
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'platform': platform.platform(), 'machine': platform.machine()}
+
+def compare(results:dict, baseline:dict, threshold:float=THRESHOLD) -> list:
+    '''
+    Casos cuya tasa cayó más de `threshold` (fracción) frente a la línea base
+    o cuyos resultados ya no coinciden con los de la línea base
+    '''
+    regressions = []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        change = row['per_sec'] / base['per_sec'] - 1
+        differs = base.get('fingerprint', row['fingerprint']) != row['fingerprint']
+        mark = '⛔' if change < -threshold or differs else '✅'
+        note = ' resultados distintos' if differs else ''
+        print(f"\t {mark} {name:<32} {base['per_sec']:>12,.0f} -> {row['per_sec']:>12,.0f} {row['unit']}/s ({change:+.1%}){note}")
+        if change < -threshold or differs:
+            regressions.append(name)
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmarks de los caminos críticos de la Ruleta')
+
+    parser.add_argument('--filter', type=str, default=None, help='Solo los casos cuyo nombre contiene este texto (p. ej. bets/ o european)')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por caso (se toma la mejor)')
+    parser.add_argument('--calls', type=int, default=CALLS, help='Llamadas por repetición en los casos por llamada')
+    parser.add_argument('--sessions', type=int, default=SESSIONS, help='Sesiones por repetición en los casos de sesión completa')
+    parser.add_argument('--save', type=str, default=None, help='Archivo JSON donde guardar los resultados como línea base')
+    parser.add_argument('--compare', type=str, default=None, help='Línea base JSON contra la que comparar')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='Caída máxima permitida de ops/s (0.25 = 25%%)')
+
+    args = parser.parse_args()
+
+    selected = [case for case in cases(calls=args.calls, sessions=args.sessions)
+                if args.filter is None or args.filter in case.name]
+    results = run_benchmarks(selected, repeat=args.repeat)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+        print(f'Línea base guardada en {args.save}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, threshold=args.threshold)
+        if regressions:
+            print(f"⛔ {len(regressions)} casos por debajo de la línea base (umbral {args.threshold:.0%}) "
+                  f"o con resultados distintos: {', '.join(regressions)}")
+            sys.exit(1)
+        print('✅ Sin regresiones')
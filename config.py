@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'config.py'
+__description__ = '''Configuración del juego validada una sola vez (.env, variables de entorno y CLI)'''
+
+import os
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+from history import DEFAULT_CAPACITY
+from wheel import Wheel, LAYOUTS
+
+# -- .env junto al código (el mismo que encontraba `load_dotenv` desde roulette.py)
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+
+class ConfigError(ValueError):
+    '''
+    Uno o más valores de configuración inválidos (el mensaje los lista todos)
+    '''
+
+@dataclass(frozen=True)
+class Settings:
+    '''
+    Valores del .env ya convertidos y validados. Prioridad de mayor a menor:
+    CLI, variables de entorno, archivo .env y los valores por defecto.
+    '''
+    # -- Nombre de una rueda incorporada o tupla de números en orden de la rueda
+    numbers: object = 'little'
+    gale: tuple = (1, 2, 4)
+    payed_wins: int = 12
+    display_last: int = 7
+    initial_history_blocks: int = 5
+    animation_time: float = 1
+    pause_autorun_time: float = 1
+    counter_auto: int = 0
+    animation_fps: int = 30
+    history_capacity: int = DEFAULT_CAPACITY
+
+    @cached_property
+    def wheel(self) -> Wheel:
+        return Wheel.from_setting(self.numbers if isinstance(self.numbers, str) else list(self.numbers))
+
+def _int(minimum:int):
+    def parse(value) -> int:
+        # -- `int()` truncaría 4096.7 sin avisar y aceptaría True como 1
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError('debe ser un número entero')
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValueError('debe ser un número entero') from None
+        if number < minimum:
+            raise ValueError(f'debe ser un entero mayor o igual a {minimum}')
+        return number
+    return parse
+
+def _float(value) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError('debe ser un número') from None
+    if number < 0:
+        raise ValueError('no puede ser negativo')
+    return number
+
+def _gale(value) -> tuple:
+    if isinstance(value, str):
+        value = value.replace(' ', '').split(',')
+    try:
+        gale = tuple(int(x) for x in value)
+    except ValueError:
+        gale = ()
+    if not gale or any(x <= 0 for x in gale):
+        raise ValueError('debe ser una lista de enteros positivos separados por coma')
+    return gale
+
+def _numbers(value):
+    if isinstance(value, str) and value.strip().lower() in LAYOUTS:
+        return value.strip().lower()
+    try:
+        numbers = Wheel.from_setting(value).numbers
+    except ValueError as e:
+        raise ValueError(f'debe ser little, european, american o una lista de números separados por coma ({e})') from None
+    if len(numbers) < 2 or min(numbers) < 0:
+        raise ValueError('la rueda necesita al menos dos números no negativos')
+    return numbers
+
+# -- Conversión y validación de cada campo
+PARSERS = {
+    'numbers': _numbers,
+    'gale': _gale,
+    'payed_wins': _int(1),
+    'display_last': _int(1),
+    'initial_history_blocks': _int(0),
+    'animation_time': _float,
+    'pause_autorun_time': _float,
+    'counter_auto': _int(0),
+    'animation_fps': _int(1),
+    'history_capacity': _int(1),
+}
+
+def read_env_file(path:str) -> dict:
+    '''
+    Valores del archivo .env, sin modificar `os.environ` (python-dotenv se importa solo si existe el archivo)
+    '''
+    if not path or not os.path.exists(path):
+        return {}
+    from dotenv import dotenv_values
+    return {key.lower(): value for key, value in dotenv_values(path).items() if value is not None}
+
+def load_settings(overrides:dict=None, env_file:str=ENV_FILE, environ:dict=None) -> Settings:
+    '''
+    Combina el .env, las variables de entorno (`gale` o `GALE`) y `overrides`
+    (p. ej. `vars(args)` del CLI; se ignoran las claves ajenas y los None).
+    Lanza `ConfigError` con todos los valores inválidos.
+    '''
+    environ = os.environ if environ is None else environ
+    sources = [(env_file, read_env_file(env_file)),
+               ('variable de entorno', {name: environ.get(name, environ.get(name.upper())) for name in PARSERS}),
+               ('CLI', overrides or {})]
+
+    raw = {}
+    for source, values in sources:
+        for name in PARSERS:
+            if values.get(name) is not None:
+                raw[name] = (values[name], source)
+
+    values, errors = {}, []
+    for name, (value, source) in raw.items():
+        try:
+            values[name] = PARSERS[name](value)
+        except (ValueError, TypeError) as e:
+            errors.append(f"'{name}' = {value!r} ({source}): {e}")
+    if errors:
+        raise ConfigError('Configuración inválida:\n  ' + '\n  '.join(errors))
+
+    settings = Settings(**values)
+    if settings.history_capacity < settings.display_last:
+        raise ConfigError(f"Configuración inválida:\n  'history_capacity' ({settings.history_capacity}) "
+                          f"debe ser mayor o igual a 'display_last' ({settings.display_last})")
+    return settings
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    '''
+    Configuración del .env y del entorno, leída y validada una sola vez por proceso
+    '''
+    return load_settings()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'crn.py'
+__description__ = '''Comparación de variantes sobre las mismas tiradas (números aleatorios comunes)'''
+
+import argparse
+import json
+import math
+from dataclasses import asdict, fields
+from multiprocessing import Pool
+from statistics import NormalDist
+
+import numpy as np
+
+from rng import RandomStreams
+from simulation import SessionConfig, run_session, EXIT_BROKE, EXIT_INSUFFICIENT
+from sweep import expand_grid
+from wheel import Wheel
+
+# -- Motivos de salida que cuentan como ruina
+RUIN = (EXIT_BROKE, EXIT_INSUFFICIENT)
+
+# -- Ensayos por tarea del pool (motor escalar)
+CHUNK = 250
+
+def _run_trials(task:tuple) -> list:
+    '''
+    Juega cada ensayo con todas las variantes; cada variante recibe una copia de los
+    mismos flujos (tiradas, historial inicial y desempates) y su propia máquina.
+    Retorna por variante una lista de (cartera final, profit, ruina).
+    '''
+    variants, seeds = task
+    configs = [SessionConfig(**params) for params in variants]
+    rows = [[] for _ in configs]
+    for seed_sequence in seeds:
+        for row, config in zip(rows, configs):
+            result = run_session(config, seed=RandomStreams(seed_sequence))
+            row.append((result.final_wallet, result.profit, result.exit_reason in RUIN))
+    return rows
+
+def _scalar(configs:list, trials:int, seed:int, workers:int) -> list:
+    seeds = [streams.seed_sequence for streams in RandomStreams(seed).split(trials)]
+    variants = [asdict(config) for config in configs]
+    tasks = [(variants, seeds[start:start + CHUNK]) for start in range(0, trials, CHUNK)]
+    if workers == 1:
+        chunks = map(_run_trials, tasks)
+    else:
+        pool = Pool(processes=workers)
+        chunks = pool.imap(_run_trials, tasks)
+
+    columns = [[] for _ in configs]
+    try:
+        for chunk in chunks:
+            for column, rows in zip(columns, chunk):
+                column.extend(rows)
+    finally:
+        if workers != 1:
+            pool.close()
+            pool.join()
+    return [np.asarray(column, dtype=np.float64) for column in columns]
+
+def _vectorized(configs:list, trials:int, seed:int) -> list:
+    from vectorized import simulate
+
+    sizes = {Wheel.from_setting(config.numbers).size for config in configs}
+    if len(sizes) != 1:
+        raise ValueError('El motor vectorizado requiere que todas las variantes usen la misma rueda')
+    if any(config.max_rounds is None for config in configs):
+        raise ValueError('La simulación vectorizada requiere max_rounds')
+    rounds = max(config.max_rounds for config in configs)
+    # -- Una secuencia de tiradas por ensayo, compartida por todas las variantes
+    spins = RandomStreams(seed).spins.generator.integers(0, sizes.pop(), (trials, rounds), dtype=np.uint8)
+
+    columns = []
+    for config in configs:
+        sim = simulate(config, trials, seed=seed, spins=spins)
+        ruin = np.isin(sim.exit_reasons(), RUIN)
+        columns.append(np.column_stack((sim.wallet, sim.wallet - sim.initial_wallet, ruin)).astype(np.float64))
+    return columns
+
+def _paired(variant:np.ndarray, base:np.ndarray, z:float) -> dict:
+    '''
+    Diferencia media pareada (variante - base) con su intervalo de confianza, y
+    cuánto se reduce la varianza frente a comparar con simulaciones independientes
+    '''
+    n = len(variant)
+    diff = variant - base
+    mean = float(diff.mean())
+    stderr = float(diff.std(ddof=1) / math.sqrt(n)) if n > 1 else 0.0
+    independent = float(math.sqrt((variant.var(ddof=1) + base.var(ddof=1)) / n)) if n > 1 else 0.0
+    return {
+        'mean_diff': mean,
+        'stderr': stderr,
+        'ci_low': mean - z * stderr,
+        'ci_high': mean + z * stderr,
+        'variance_reduction': (independent / stderr) ** 2 if stderr else None,
+    }
+
+def label(config:SessionConfig, base:SessionConfig) -> str:
+    '''
+    Nombre corto de una variante: los campos que cambian respecto a la base
+    '''
+    base_values = asdict(base)
+    changed = [f'{name}={value}' for name, value in asdict(config).items() if base_values[name] != value]
+    return ', '.join(changed) or 'base'
+
+def compare(configs:list, trials:int=1000, seed:int=0, engine:str='scalar', confidence:float=0.95, workers:int=None) -> list:
+    '''
+    Juega `trials` ensayos; en cada uno todas las variantes ven las mismas tiradas.
+    La primera configuración es la base. Retorna por variante las medias y las
+    diferencias pareadas contra la base en cartera final, profit y tasa de ruina.
+    '''
+    if len(configs) < 2:
+        raise ValueError('Se necesitan al menos dos variantes para comparar')
+    if engine == 'vectorized':
+        columns = _vectorized(configs, trials, seed)
+    else:
+        columns = _scalar(configs, trials, seed, workers)
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    base = columns[0]
+    report = []
+    for config, column in zip(configs, columns):
+        row = {
+            'variant': label(config, configs[0]),
+            'config': asdict(config),
+            'trials': trials,
+            'mean_final_wallet': float(column[:, 0].mean()),
+            'mean_profit': float(column[:, 1].mean()),
+            'ruin_rate': float(column[:, 2].mean()),
+        }
+        if column is not base:
+            row['final_wallet'] = _paired(column[:, 0], base[:, 0], z)
+            row['profit'] = _paired(column[:, 1], base[:, 1], z)
+            row['ruin_rate_diff'] = _paired(column[:, 2], base[:, 2], z)
+        report.append(row)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Comparación de estrategias sobre las mismas tiradas')
+
+    parser.add_argument('--method', type=str, default='TOP2,TOP3,COMMONS', help='Estrategias separadas por coma; la primera es la base')
+    parser.add_argument('--gale', type=str, default='1,2,4', help='Secuencias de gale separadas por punto y coma (1,2,4;1,1,1)')
+    parser.add_argument('--configs', type=str, help='Archivo JSON con una lista de configuraciones (ignora --method y --gale)')
+    parser.add_argument('--max_rounds', type=int, default=100, help='Límite de rondas por sesión')
+    parser.add_argument('--trials', type=int, default=1000, help='Ensayos (secuencias de tiradas compartidas)')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla de las tiradas')
+    parser.add_argument('--engine', type=str, choices=['scalar', 'vectorized'], default='scalar', help='Motor de simulación')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Nivel de confianza de los intervalos')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos del pool (motor escalar)')
+    parser.add_argument('--output', type=str, default=None, help='Archivo JSON donde guardar el reporte (opcional)')
+
+    args = parser.parse_args()
+
+    if args.configs:
+        allowed = {f.name for f in fields(SessionConfig)}
+        with open(args.configs, encoding='utf-8') as f:
+            configs = [SessionConfig(**{k: v for k, v in item.items() if k in allowed}) for item in json.load(f)]
+    else:
+        configs = expand_grid({
+            'method': args.method.replace(' ', '').split(','),
+            'gale': [[int(x) for x in gale.split(',')] for gale in args.gale.replace(' ', '').split(';')],
+        }, base=SessionConfig(max_rounds=args.max_rounds))
+
+    report = compare(configs, trials=args.trials, seed=args.seed, engine=args.engine,
+                     confidence=args.confidence, workers=args.workers)
+    for row in report:
+        print(f"\n\t {row['variant']}: cartera {row['mean_final_wallet']:.1f} - ruina {row['ruin_rate']:.2%}")
+        if 'profit' in row:
+            profit, ruin = row['profit'], row['ruin_rate_diff']
+            print(f"\t   Δ profit {profit['mean_diff']:+.2f} [{profit['ci_low']:+.2f}, {profit['ci_high']:+.2f}]"
+                  f" - Δ ruina {ruin['mean_diff']:+.2%} [{ruin['ci_low']:+.2%}, {ruin['ci_high']:+.2%}]")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'frequency.py'
+__description__ = '''Índice incremental de frecuencias para hotters y coolest'''
+
+from collections import deque
+
+class FrequencyIndex:
+    '''
+    Frecuencia de cada número actualizada en O(1) por tirada.
+
+    - window=None, decay=None: todas las tiradas (igual que el historial completo)
+    - window=K: solo las últimas K tiradas
+    - decay=d (0 < d < 1): conteos con decaimiento exponencial, cada tirada pesa d veces la siguiente
+
+    Los números se guardan en orden de primera aparición, igual que un `Counter`
+    construido sobre el historial, para que la selección aleatoria ponderada
+    consuma el generador en el mismo orden.
+    '''
+
+    # -- Reescalar los pesos del decaimiento antes de perder precisión
+    RESCALE_AT = 1e100
+
+    def __init__(self, window:int=None, decay:float=None):
+        if window is not None and decay is not None:
+            raise ValueError('Indique una ventana o un decaimiento, no ambos')
+        if window is not None and window <= 0:
+            raise ValueError('La ventana debe ser mayor que cero')
+        if decay is not None and not 0 < decay < 1:
+            raise ValueError('El decaimiento debe estar entre 0 y 1')
+        self.window = window
+        self.decay = decay
+        self.counts = {}
+        self.recent = deque() if window is not None else None
+        self.scale = 1.0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self.scale = 1.0
+        if self.recent is not None:
+            self.recent.clear()
+
+    def add(self, number:int) -> None:
+        '''
+        Registra una tirada
+        '''
+        counts = self.counts
+
+        if self.decay is not None:
+            # -- En vez de multiplicar todos los conteos por `decay`, cada tirada nueva pesa más
+            self.scale /= self.decay
+            counts[number] = counts.get(number, 0.0) + self.scale
+            if self.scale > self.RESCALE_AT:
+                for n in counts:
+                    counts[n] /= self.scale
+                self.scale = 1.0
+            return
+
+        counts[number] = counts.get(number, 0) + 1
+        if self.recent is not None:
+            self.recent.append(number)
+            if len(self.recent) > self.window:
+                expired = self.recent.popleft()
+                if counts[expired] == 1:
+                    del counts[expired]
+                else:
+                    counts[expired] -= 1
+
+    def extend(self, numbers) -> None:
+        for n in numbers:
+            self.add(n)
+
+    def frequencies(self) -> dict:
+        '''
+        Conteos actuales (con decaimiento aplicado si corresponde)
+        '''
+        if self.decay is None:
+            return dict(self.counts)
+        return {n: c / self.scale for n, c in self.counts.items()}
+
+    def _select(self, top:int, weight, rng, numbers) -> list:
+        counts = self.frequencies() if self.decay is not None else self.counts
+        # -- Un lote de aleatorios por selección (equivale a un `rng.random()` por número)
+        keys = iter(rng.randoms(len(counts)))
+        ranked = sorted(counts, key=lambda x: weight(counts[x]) * next(keys), reverse=True)
+        result = ranked[:top]
+
+        # -- Rellenar con números distintos en el orden de la rueda si faltan
+        if len(result) < top:
+            seen = set(result)
+            restantes = [n for n in numbers if n not in seen]
+            result.extend(restantes[:top - len(result)])
+
+        return result
+
+    def hotters(self, top:int, rng, numbers) -> list:
+        '''
+        Los `top` más frecuentes, con aleatoriedad ponderada por la frecuencia
+        '''
+        return self._select(top, lambda c: c, rng, numbers)
+
+    def coolest(self, top:int, rng, numbers) -> list:
+        '''
+        Los `top` menos frecuentes, con aleatoriedad ponderada por la baja frecuencia
+        '''
+        return self._select(top, lambda c: 1 / (c + 1), rng, numbers)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'history.py'
+__description__ = '''Historial de tiradas en un buffer circular de capacidad fija'''
+
+from array import array
+
+# -- Tiradas que se conservan por defecto
+DEFAULT_CAPACITY = 4096
+
+class SpinHistory:
+    '''
+    Historial de números ganadores en un buffer circular de enteros pequeños.
+    La memoria es constante: al llenarse se descartan las tiradas más antiguas.
+
+    Las tiradas se agrupan en bloques de `block_size` contados desde la primera
+    tirada de la sesión, igual que las sublistas del historial original.
+    '''
+
+    def __init__(self, capacity:int=DEFAULT_CAPACITY, block_size:int=7, max_number:int=255):
+        if capacity <= 0:
+            raise ValueError('La capacidad del historial debe ser mayor que cero')
+        self.capacity = capacity
+        self.block_size = block_size
+        typecode = 'B' if max_number < 256 else 'H'
+        self.buffer = array(typecode, bytes(capacity * array(typecode).itemsize))
+        # -- Total de tiradas registradas (también las ya descartadas)
+        self.total = 0
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def __iter__(self):
+        return iter(self.last(len(self)))
+
+    def clear(self) -> None:
+        self.total = 0
+
+    def append(self, number:int) -> None:
+        self.buffer[self.total % self.capacity] = number
+        self.total += 1
+
+    def extend(self, numbers) -> None:
+        for n in numbers:
+            self.append(n)
+
+    def last(self, n:int) -> list:
+        '''
+        Las últimas `n` tiradas, de la más antigua a la más reciente
+        '''
+        n = min(n, len(self))
+        if n <= 0:
+            return []
+        end = self.total % self.capacity
+        start = end - n
+        if start >= 0:
+            return self.buffer[start:end].tolist()
+        return self.buffer[start:].tolist() + self.buffer[:end].tolist()
+
+    def blocks(self) -> list:
+        '''
+        Bloques conservados como (número de bloque desde 1, tiradas del bloque).
+        El primer bloque puede estar incompleto si sus tiradas ya se descartaron.
+        '''
+        retained = self.last(len(self))
+        first = self.total - len(retained)
+        result = []
+        block = first // self.block_size
+        i = 0
+        while i < len(retained):
+            end = (block + 1) * self.block_size - first
+            result.append((block + 1, retained[i:end]))
+            i = end
+            block += 1
+        return result
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'instrumentation.py'
+__description__ = '''Contadores e histogramas por fase de la ronda, con exportación JSON y Prometheus'''
+
+import cProfile
+import json
+import os
+import time
+from bisect import bisect_left
+from inspect import iscoroutinefunction
+
+# -- Límites superiores (segundos) de los buckets: de 1 µs a ~4 s en potencias de 4
+BUCKETS = tuple(1e-6 * 4 ** i for i in range(12))
+
+# -- Fases medidas: método -> nombre de la fase. Los tiempos son inclusivos
+# -- (p. ej. `strategy` incluye `hotters` y `neighbors`, `report` incluye `settle` y `title`)
+MACHINE_PHASES = {
+    'get_hotters': 'hotters',
+    'select_unique_neighbors': 'neighbors',
+    'put_bet': 'put_bet',
+    'confirm_bet': 'confirm_bet',
+    'rotate': 'rotate',
+    'rotate_async': 'rotate',
+    'settle_bet': 'settle',
+    'calculate_winning_amount': 'report',
+    'set_title': 'title',
+}
+RENDERER_PHASES = {'animate': 'render', 'animate_async': 'render'}
+STRATEGY_PHASES = {'bets': 'strategy'}
+
+# -- Contadores que se exportan aunque sigan en cero
+COUNTERS = ('rounds', 'wins', 'losses', 'gale_steps', 'gale_resets')
+
+class Histogram:
+    '''
+    Histograma de duraciones con buckets fijos (acumulables entre procesos)
+    '''
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds:float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q:float) -> float:
+        '''
+        Cota superior del cuantil `q` (límite del bucket donde cae)
+        '''
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+class Metrics:
+    '''
+    Métricas de una partida o de un barrido. `instrument` envuelve los métodos
+    de cada fase en la instancia de la máquina, su renderizador y la estrategia;
+    sin instrumentar el código del juego no cambia, así que apagado no cuesta nada.
+
+    - `prometheus`: archivo en formato de texto de Prometheus que se reescribe
+      cada `interval` segundos (se revisa al confirmar cada ronda)
+    - `profile`: archivo `.prof` de cProfile con las primeras `profile_rounds` rondas
+    '''
+
+    def __init__(self, prometheus:str=None, interval:float=10.0, profile:str=None, profile_rounds:int=100, prefix:str='roulette'):
+        self.prefix = prefix
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phases = {}
+        self.prometheus_path = prometheus
+        self.interval = interval
+        self.exported = time.monotonic()
+        self.profile_path = profile
+        self.profile_rounds = profile_rounds
+        self.profiler = None
+        self.profiled = 0
+
+    def count(self, name:str, n:int=1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def histogram(self, phase:str) -> Histogram:
+        try:
+            return self.phases[phase]
+        except KeyError:
+            self.phases[phase] = Histogram()
+            return self.phases[phase]
+
+    def timed(self, phase:str, func):
+        '''
+        Envuelve `func` (normal o async) para medir cada llamada en la fase indicada
+        '''
+        observe = self.histogram(phase).observe
+        clock = time.perf_counter
+        if iscoroutinefunction(func):
+            async def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(clock() - start)
+        else:
+            def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    observe(clock() - start)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _wrap(self, target, phases:dict) -> None:
+        for name, phase in phases.items():
+            func = getattr(target, name, None)
+            if func is not None:
+                setattr(target, name, self.timed(phase, func))
+
+    def instrument(self, crlm, strategy=None):
+        '''
+        Mide las fases de la máquina (y de su renderizador y la estrategia) y
+        cuenta rondas, aciertos, fallos y pasos del gale. Retorna la máquina.
+        '''
+        self._wrap(crlm, MACHINE_PHASES)
+        self._wrap(crlm.renderer, RENDERER_PHASES)
+        if strategy is not None:
+            self._wrap(strategy, STRATEGY_PHASES)
+
+        confirm_bet = crlm.confirm_bet
+        settle_bet = crlm.settle_bet
+        add_multiplier = crlm.add_multiplier
+        counters = self.counters
+
+        def counted_confirm_bet():
+            confirm_bet()
+            counters['rounds'] += 1
+            self.on_round()
+
+        def counted_settle_bet(winning_number:int) -> tuple:
+            status, monto = settle_bet(winning_number)
+            counters['wins' if status else 'losses'] += 1
+            return status, monto
+
+        def counted_add_multiplier():
+            add_multiplier()
+            counters['gale_steps' if crlm.INDEX else 'gale_resets'] += 1
+
+        crlm.confirm_bet = counted_confirm_bet
+        crlm.settle_bet = counted_settle_bet
+        crlm.add_multiplier = counted_add_multiplier
+        return crlm
+
+    def on_round(self) -> None:
+        '''
+        Perfilado de las primeras rondas y exportación periódica
+        '''
+        if self.profile_path is not None and self.profiled < self.profile_rounds:
+            if self.profiler is None:
+                self.profiler = cProfile.Profile()
+                self.profiler.enable()
+            self.profiled += 1
+            if self.profiled == self.profile_rounds:
+                self.stop_profile()
+        if self.prometheus_path is not None and time.monotonic() - self.exported >= self.interval:
+            self.export()
+
+    def stop_profile(self) -> None:
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_path)
+            self.profiler = None
+            # -- No volver a perfilar
+            self.profiled = self.profile_rounds
+
+    def snapshot(self) -> dict:
+        '''
+        Estado acumulable (p. ej. para enviarlo desde un proceso del pool)
+        '''
+        return {
+            'counters': dict(self.counters),
+            'phases': {name: {'counts': h.counts, 'count': h.count, 'sum': h.sum, 'max': h.max}
+                       for name, h in self.phases.items()},
+        }
+
+    def merge(self, snapshot:dict) -> None:
+        '''
+        Suma un `snapshot` de otras métricas
+        '''
+        for name, n in snapshot['counters'].items():
+            self.count(name, n)
+        for name, data in snapshot['phases'].items():
+            h = self.histogram(name)
+            h.counts = [a + b for a, b in zip(h.counts, data['counts'])]
+            h.count += data['count']
+            h.sum += data['sum']
+            h.max = max(h.max, data['max'])
+        if self.prometheus_path is not None and time.monotonic() - self.exported >= self.interval:
+            self.export()
+
+    def summary(self) -> dict:
+        '''
+        Resumen JSON: contadores y, por fase, llamadas, tiempo total, media y cuantiles (segundos)
+        '''
+        return {
+            'counters': dict(self.counters),
+            'phases': {
+                name: {
+                    'calls': h.count,
+                    'total': h.sum,
+                    'mean': h.sum / h.count if h.count else 0.0,
+                    'p50': h.quantile(0.5),
+                    'p99': h.quantile(0.99),
+                    'max': h.max,
+                }
+                for name, h in sorted(self.phases.items())
+            },
+        }
+
+    def write_summary(self, path:str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def prometheus(self) -> str:
+        '''
+        Métricas en el formato de texto de Prometheus
+        '''
+        prefix = self.prefix
+        lines = []
+        for name, value in self.counters.items():
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        metric = f'{prefix}_phase_seconds'
+        lines.append(f'# TYPE {metric} histogram')
+        for phase, h in sorted(self.phases.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, h.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{phase="{phase}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{phase="{phase}",le="+Inf"}} {h.count}')
+            lines.append(f'{metric}_sum{{phase="{phase}"}} {h.sum:.9f}')
+            lines.append(f'{metric}_count{{phase="{phase}"}} {h.count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self) -> None:
+        '''
+        Reescribe el archivo de Prometheus de forma atómica (el lector nunca ve un archivo a medias)
+        '''
+        self.exported = time.monotonic()
+        temp = f'{self.prometheus_path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(temp, self.prometheus_path)
+
+    def close(self, summary:str=None) -> None:
+        '''
+        Fin de la partida: cierra el perfilado, exporta por última vez y guarda el resumen JSON
+        '''
+        self.stop_profile()
+        if self.prometheus_path is not None:
+            self.export()
+        if summary is not None:
+            self.write_summary(summary)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'keyboard.py'
+__description__ = '''Lectura asíncrona de teclas (termios en POSIX, msvcrt en Windows)'''
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+ENTER = b'\r'
+ESCAPE = b'\x1b'
+
+def skip_escape_sequence(data:bytes, start:int) -> int:
+    '''
+    Posición siguiente al final de la secuencia de escape que empieza en `start`:
+    CSI (ESC [ parámetros final), SS3 (ESC O tecla) o ESC seguido de una tecla
+    '''
+    i = start + 1
+    if i >= len(data):
+        return i
+    if data[i] == ord('['):
+        i += 1
+        # -- Parámetros e intermedios (0x20-0x3F) hasta el byte final (0x40-0x7E)
+        while i < len(data) and 0x20 <= data[i] <= 0x3F:
+            i += 1
+        return i + 1
+    if data[i] == ord('O'):
+        return i + 2
+    return i + 1
+
+class KeyReader:
+    '''
+    Lector de teclas para asyncio, sin espera activa.
+
+    - POSIX: la terminal pasa a modo cbreak y el loop avisa cuando stdin tiene datos.
+    - Windows: `msvcrt.getch` bloquea en un hilo aparte, sin consumir CPU.
+
+    Usar como `async with KeyReader() as keys: key = await keys.get()`.
+    ENTER se normaliza a b'\\r' en todas las plataformas.
+    '''
+
+    def __init__(self):
+        self.loop = None
+        self.queue = None
+        self.fd = None
+        self.saved_attrs = None
+        self.executor = None
+
+    async def __aenter__(self) -> 'KeyReader':
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        if os.name == 'nt':
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='keyboard')
+        else:
+            import termios
+            import tty
+
+            self.fd = sys.stdin.fileno()
+            if os.isatty(self.fd):
+                self.saved_attrs = termios.tcgetattr(self.fd)
+                tty.setcbreak(self.fd)
+            self.loop.add_reader(self.fd, self._on_input)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            return
+        self.loop.remove_reader(self.fd)
+        if self.saved_attrs is not None:
+            import termios
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved_attrs)
+
+    def _on_input(self) -> None:
+        data = os.read(self.fd, 32)
+        if not data:
+            # -- stdin cerrado: se trata como ESC para terminar el juego
+            self.loop.remove_reader(self.fd)
+            data = ESCAPE
+        if data == ESCAPE:
+            # -- Solo un ESC suelto en la lectura es la tecla ESC
+            self.queue.put_nowait(ESCAPE)
+            return
+        i = 0
+        while i < len(data):
+            if data[i] == ESCAPE[0]:
+                # -- Secuencia de escape (flechas, teclas de función, Alt+tecla): se descarta
+                i = skip_escape_sequence(data, i)
+                continue
+            key = data[i:i + 1]
+            self.queue.put_nowait(ENTER if key == b'\n' else key)
+            i += 1
+
+    async def get(self) -> bytes:
+        '''
+        Espera la siguiente tecla
+        '''
+        if self.executor is not None:
+            import msvcrt
+            return await self.loop.run_in_executor(self.executor, msvcrt.getch)
+        return await self.queue.get()
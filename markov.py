@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'markov.py'
+__description__ = '''Evaluación exacta de una estrategia como cadena de Markov (cartera x índice del gale)'''
+
+import argparse
+import itertools
+import json
+import math
+from collections import Counter, deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from rng import RandomStreams
+from simulation import (SessionConfig, create_machine, EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT,
+                        EXIT_MAX_ROUNDS)
+
+# -- Conjuntos de hotters que se enumeran; por encima se toma una muestra uniforme de este tamaño
+MAX_HOTTER_SETS = 20000
+
+# -- Masa de probabilidad activa con la que se da por terminada la iteración sin límite de rondas
+TOLERANCE = 1e-13
+MAX_STEPS = 1000000
+
+@dataclass
+class MarkovResult:
+    '''
+    Resultado de una sesión desde la cartera inicial. Es exacto salvo con
+    `approximate`: el plan depende de dónde caen los hotters y se supuso que son
+    un conjunto uniforme de números distintos (ver `plan_distribution`).
+    '''
+    initial_wallet: int
+    states: int
+    expected_rounds: float
+    # -- Probabilidad de cada motivo de salida
+    exit_probability: dict
+    # -- Distribución de la cartera final: {cartera: probabilidad}
+    final_wallet: dict
+    # -- Probabilidad de quedar activa (solo si la iteración no llegó a la tolerancia)
+    active: float = 0.0
+    by_reason: dict = field(default_factory=dict)
+    approximate: bool = False
+
+    @property
+    def ruin_probability(self) -> float:
+        return self.exit_probability[EXIT_BROKE] + self.exit_probability[EXIT_INSUFFICIENT]
+
+    @property
+    def profit_probability(self) -> float:
+        return self.exit_probability[EXIT_PROFIT]
+
+    @property
+    def expected_final_wallet(self) -> float:
+        return sum(w * p for w, p in self.final_wallet.items())
+
+    @property
+    def expected_profit(self) -> float:
+        return self.expected_final_wallet - self.initial_wallet
+
+    def summary(self) -> dict:
+        return {
+            'initial_wallet': self.initial_wallet,
+            'states': self.states,
+            'expected_rounds': self.expected_rounds,
+            'expected_final_wallet': self.expected_final_wallet,
+            'expected_profit': self.expected_profit,
+            'ruin_probability': self.ruin_probability,
+            **{f'{reason}_probability': p for reason, p in self.exit_probability.items()},
+            'active': self.active,
+            'approximate': self.approximate,
+        }
+
+def plan_distribution(config:SessionConfig, max_hotter_sets:int=MAX_HOTTER_SETS, seed:int=0) -> list:
+    '''
+    Planes de apuesta de la estrategia como [(probabilidad, total base, montos por casilla)].
+    `montos por casilla` es una tupla ordenada con el monto base de cada casilla jugada
+    (un monto 0 también cuenta como acierto, igual que en la máquina) y None si no se juega.
+
+    Las tiradas no dependen del historial, así que solo importa qué montos hay en la mesa.
+    Para las estrategias que usan `get_hotters`/`get_coolest` se supone que devuelven un
+    conjunto uniforme de números distintos: se enumeran todos (o una muestra si son muchos).
+    Si el plan es el mismo para cualquier conjunto (TOPk con montos fijos) el resultado
+    es exacto; si cambia según dónde caen los hotters (COMMONS en ruedas grandes, o
+    `neight_amounts`, donde el monto de cada vecino depende de su distancia y de los
+    vecinos sustituidos) hay más de un plan y el resultado es una aproximación.
+    '''
+    strategy = config.strategy()
+    crlm = create_machine(config, rng=RandomStreams(seed))
+    wheel = crlm.wheel
+
+    requested = []
+    def probe(top:int) -> list:
+        requested.append(top)
+        return list(wheel.numbers[:top])
+    crlm.get_hotters = crlm.get_coolest = probe
+    strategy.plan(crlm)
+
+    if not requested:
+        hotter_sets = [()]
+    else:
+        top = max(requested)
+        if math.comb(wheel.size, top) <= max_hotter_sets:
+            hotter_sets = list(itertools.combinations(wheel.numbers, top))
+        else:
+            sampler = RandomStreams(seed).history
+            hotter_sets = [tuple(sampler.sample(wheel.numbers, top)) for _ in range(max_hotter_sets)]
+
+    plans = Counter()
+    for hotters in hotter_sets:
+        crlm.get_hotters = crlm.get_coolest = lambda top, hotters=hotters: list(hotters[:top])
+        base = strategy.amounts(strategy.plan(crlm), wheel)
+        slots = tuple(sorted((base.get(n) for n in wheel), key=lambda a: -1 if a is None else a))
+        plans[(sum(base.values()), slots)] += 1
+
+    return [(count / len(hotter_sets), total, slots) for (total, slots), count in plans.items()]
+
+def _transitions(config:SessionConfig, plans:list, initial_wallet:int):
+    '''
+    Recorre los estados alcanzables (cartera, índice del gale) desde el inicial.
+    Retorna los estados, las transiciones entre estados activos, las transiciones a
+    salidas (motivo, cartera final) y la probabilidad de jugar la ronda en cada estado.
+    '''
+    gale = list(config.gale)
+    size = len(plans[0][2])
+    # -- Cada plan como (probabilidad, total base, [(probabilidad, premio base o None)])
+    outcomes = []
+    for probability, total, slots in plans:
+        counts = Counter(slots)
+        outcomes.append((probability, total, [(c / size, amount) for amount, c in counts.items()]))
+
+    def next_index(index:int, hit:bool) -> int:
+        if not config.use_antigala:
+            return 0
+        if not hit:
+            return index
+        return index + 1 if index < len(gale) - 1 else 0
+
+    start = (initial_wallet, 0)
+    states = {start: 0}
+    exits = {}
+    transient = ([], [], [])
+    absorbing = ([], [], [])
+    played = []
+    queue = deque([start])
+    while queue:
+        wallet, index = queue.popleft()
+        source = states[(wallet, index)]
+        multiplier = gale[index]
+        played_probability = 0.0
+        for probability, total, slot_outcomes in outcomes:
+            total_bet = total * multiplier
+            if total_bet > wallet:
+                key = (EXIT_INSUFFICIENT, wallet)
+                target = exits.setdefault(key, len(exits))
+                absorbing[0].append(source)
+                absorbing[1].append(target)
+                absorbing[2].append(probability)
+                continue
+            played_probability += probability
+            for slot_probability, amount in slot_outcomes:
+                hit = amount is not None
+                # -- La apuesta se descuenta al confirmar y, si falla, otra vez al liquidar
+                if hit:
+                    new_wallet = wallet - total_bet + amount * multiplier * config.pay_for
+                else:
+                    new_wallet = wallet - 2 * total_bet
+                profit = round(100 * (new_wallet - initial_wallet) / initial_wallet, 2)
+                if profit >= config.profit_out:
+                    reason = EXIT_PROFIT
+                elif new_wallet <= 0:
+                    reason = EXIT_BROKE
+                else:
+                    reason = None
+
+                if reason is not None:
+                    target = exits.setdefault((reason, new_wallet), len(exits))
+                    absorbing[0].append(source)
+                    absorbing[1].append(target)
+                    absorbing[2].append(probability * slot_probability)
+                    continue
+                state = (new_wallet, next_index(index, hit))
+                if state not in states:
+                    states[state] = len(states)
+                    queue.append(state)
+                transient[0].append(source)
+                transient[1].append(states[state])
+                transient[2].append(probability * slot_probability)
+        played.append(played_probability)
+
+    def arrays(edges):
+        return (np.asarray(edges[0], dtype=np.int64), np.asarray(edges[1], dtype=np.int64),
+                np.asarray(edges[2], dtype=np.float64))
+
+    return states, arrays(transient), exits, arrays(absorbing), np.asarray(played)
+
+def _solve_sparse(n:int, transient, absorbing, exits_count:int, played:np.ndarray):
+    '''
+    Sin límite de rondas: visitas esperadas x = e_inicio (I - Q)^-1 con SciPy
+    '''
+    from scipy import sparse
+    from scipy.sparse.linalg import spsolve
+
+    q = sparse.csr_matrix((transient[2], (transient[0], transient[1])), shape=(n, n))
+    r = sparse.csr_matrix((absorbing[2], (absorbing[0], absorbing[1])), shape=(n, exits_count))
+    start = np.zeros(n)
+    start[0] = 1.0
+    visits = spsolve((sparse.identity(n, format='csc') - q).T.tocsc(), start)
+    return r.T @ visits, float(visits @ played), 0.0
+
+def _iterate(n:int, transient, absorbing, exits_count:int, played:np.ndarray, max_rounds:int=None):
+    '''
+    Propaga la distribución ronda a ronda (programación dinámica). Con `max_rounds` es
+    exacta en ese número de pasos; sin límite, itera hasta que la masa activa es despreciable.
+    '''
+    mass = np.zeros(n)
+    mass[0] = 1.0
+    absorbed = np.zeros(exits_count)
+    expected_rounds = 0.0
+    steps = max_rounds if max_rounds is not None else MAX_STEPS
+    for _ in range(steps):
+        expected_rounds += float(mass @ played)
+        absorbed += np.bincount(absorbing[1], weights=mass[absorbing[0]] * absorbing[2], minlength=exits_count)
+        mass = np.bincount(transient[1], weights=mass[transient[0]] * transient[2], minlength=n)
+        if max_rounds is None and mass.sum() < TOLERANCE:
+            break
+    return absorbed, expected_rounds, mass
+
+def evaluate(config:SessionConfig, max_hotter_sets:int=MAX_HOTTER_SETS, seed:int=0) -> MarkovResult:
+    '''
+    Probabilidades exactas de profit, ruina y límite de rondas, rondas esperadas y
+    distribución de la cartera final de una sesión, con las mismas reglas que `run_session`
+    (doble descuento al fallar, ANTIMARTIGALA y orden de las salidas).
+    Sin `max_rounds` se resuelve el sistema lineal con SciPy si está instalado.
+    '''
+    initial_wallet = config.initial_wallet
+    plans = plan_distribution(config, max_hotter_sets=max_hotter_sets, seed=seed)
+    states, transient, exits, absorbing, played = _transitions(config, plans, initial_wallet)
+    n = len(states)
+
+    active_states = None
+    if config.max_rounds is None:
+        try:
+            absorbed, expected_rounds, active = _solve_sparse(n, transient, absorbing, len(exits), played)
+        except ImportError:
+            absorbed, expected_rounds, mass = _iterate(n, transient, absorbing, len(exits), played)
+            active = float(mass.sum())
+    else:
+        absorbed, expected_rounds, active_states = _iterate(n, transient, absorbing, len(exits), played,
+                                                            max_rounds=config.max_rounds)
+        active = 0.0
+
+    exit_probability = {reason: 0.0 for reason in (EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT, EXIT_MAX_ROUNDS)}
+    final_wallet = Counter()
+    by_reason = {reason: Counter() for reason in exit_probability}
+    for (reason, wallet), target in exits.items():
+        p = float(absorbed[target])
+        exit_probability[reason] += p
+        final_wallet[wallet] += p
+        by_reason[reason][wallet] += p
+
+    if active_states is not None:
+        # -- La masa que sigue activa al llegar a `max_rounds` sale por límite de rondas
+        for (wallet, _), index in states.items():
+            p = float(active_states[index])
+            if p:
+                exit_probability[EXIT_MAX_ROUNDS] += p
+                final_wallet[wallet] += p
+                by_reason[EXIT_MAX_ROUNDS][wallet] += p
+
+    return MarkovResult(initial_wallet=initial_wallet,
+                        states=n,
+                        expected_rounds=expected_rounds,
+                        exit_probability=exit_probability,
+                        final_wallet=dict(sorted(final_wallet.items())),
+                        active=active,
+                        by_reason={reason: dict(sorted(w.items())) for reason, w in by_reason.items()},
+                        approximate=len(plans) > 1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Evaluación exacta de una estrategia (cadena de Markov)')
+
+    parser.add_argument('--method', type=str, default='TOP2', help='Estrategia (TOP2, TOP3, TOPk, COMMONS o modulo:Clase)')
+    parser.add_argument('--hot_amount', type=int, default=40, help='Monto por número caliente')
+    parser.add_argument('--neight_amount', type=int, default=20, help='Monto por vecino')
+    parser.add_argument('--other_amount', type=int, default=10, help='Monto por número restante')
+    parser.add_argument('--radius', type=int, default=1, help='Vecinos a cada lado de los números calientes')
+    parser.add_argument('--rondas_soportadas', type=int, default=20, help='Rondas que soporta la cartera inicial')
+    parser.add_argument('--profit_out', type=int, default=33, help='Porcentaje de profit para retirarse')
+    parser.add_argument('--use_antigala', type=int, choices=[0, 1], default=0, help='Habilita (1) el sistema Antimartingala')
+    parser.add_argument('--gale', type=str, default='1,2,4', help='Multiplicadores del gale separados por coma')
+    parser.add_argument('--max_rounds', type=int, default=100, help='Límite de rondas (0 = sin límite)')
+    parser.add_argument('--numbers', type=str, default='little', help='Rueda: little, european, american o lista de números')
+    parser.add_argument('--pay_for', type=int, default=12, help='Pago por acierto')
+    parser.add_argument('--distribution', action='store_true', help='Incluir la distribución de la cartera final')
+
+    args = parser.parse_args()
+
+    config = SessionConfig(method=args.method, hot_amount=args.hot_amount, neight_amount=args.neight_amount,
+                           other_amount=args.other_amount, radius=args.radius,
+                           rondas_soportadas=args.rondas_soportadas, profit_out=args.profit_out,
+                           use_antigala=bool(args.use_antigala),
+                           gale=[int(x) for x in args.gale.replace(' ', '').split(',')],
+                           max_rounds=args.max_rounds or None, numbers=args.numbers, pay_for=args.pay_for)
+    result = evaluate(config)
+    report = result.summary()
+    if args.distribution:
+        report['final_wallet'] = {str(w): p for w, p in result.final_wallet.items()}
+    print(json.dumps(report, indent=2))
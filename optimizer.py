@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'optimizer.py'
+__description__ = '''Búsqueda evolutiva de montos por rol y secuencias de gale'''
+
+import argparse
+import json
+import os
+from dataclasses import asdict, replace
+from multiprocessing import Pool
+
+import numpy as np
+
+from rng import RandomStream
+from simulation import SessionConfig, EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT
+from sweep import config_key, task_seed
+
+# -- Espacio de búsqueda
+AMOUNTS = tuple(range(0, 101, 5))
+MULTIPLIERS = (1, 2, 3, 4, 6, 8)
+TOPS = (1, 2, 3, 4)
+RADII = (1, 2, 3)
+MAX_GALE = 4
+
+# -- Objetivos: valor a maximizar a partir del resumen de un lote
+OBJECTIVES = {
+    'profit_rate': lambda s: s['profit_rate'],
+    'mean_profit': lambda s: s['mean_profit'],
+    'ruin': lambda s: -s['ruin_rate'],
+}
+
+def score_config(task:tuple) -> dict:
+    '''
+    Simula un lote con el motor vectorizado y resume el resultado
+    (se llama dentro del proceso del pool)
+    '''
+    from vectorized import simulate
+
+    key, params, sessions, seed = task
+    sim = simulate(SessionConfig(**params), sessions, seed=seed)
+    reasons = sim.exit_reasons()
+    return {
+        'key': key,
+        'sessions': sessions,
+        'seed': seed,
+        'profit_rate': float((reasons == EXIT_PROFIT).mean()),
+        'ruin_rate': float(np.isin(reasons, (EXIT_BROKE, EXIT_INSUFFICIENT)).mean()),
+        'mean_profit': float((sim.wallet - sim.initial_wallet).mean()),
+        'mean_rounds': float(sim.rounds.mean()),
+    }
+
+class Optimizer:
+    '''
+    Búsqueda evolutiva sobre los montos por rol (caliente, vecino por distancia,
+    resto y cero), la estrategia TOPk, el radio y el gale con ANTIMARTIGALA.
+
+    Cada generación se evalúa con successive halving: todos los candidatos juegan
+    pocas sesiones, solo el mejor tercio pasa a la siguiente etapa con el triple de
+    sesiones, y así hasta `max_sessions`. Todas las evaluaciones de una etapa usan la
+    misma semilla (mismas tiradas para todos) y se guardan en caché por configuración.
+    '''
+
+    def __init__(self, base:SessionConfig, objective:str='profit_rate', population:int=24, elite:int=6,
+                 min_sessions:int=500, max_sessions:int=13500, eta:int=3, seed:int=0,
+                 workers:int=None, cache:str=None):
+        if objective not in OBJECTIVES:
+            raise ValueError(f'Objetivo desconocido: {objective}')
+        self.base = base
+        self.objective = objective
+        self.population = population
+        self.elite = elite
+        self.eta = eta
+        self.seed = seed
+        self.workers = workers
+        self.rng = RandomStream(np.random.SeedSequence(seed))
+        self.rungs = [min_sessions]
+        while self.rungs[-1] * eta <= max_sessions:
+            self.rungs.append(self.rungs[-1] * eta)
+        # -- (clave, sesiones, semilla) -> resumen; opcionalmente persistida en JSON lines
+        self.scores = {}
+        self.cache = cache
+        if cache and os.path.exists(cache):
+            with open(cache, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                        self.scores[(row['key'], row['sessions'], row['seed'])] = row
+                    except (ValueError, KeyError):
+                        continue
+        self.best = {}
+
+    # -- Genoma ------------------------------------------------------------
+
+    def normalize(self, config:SessionConfig) -> SessionConfig:
+        '''
+        Forma canónica de un candidato: sin ANTIMARTIGALA solo cuenta el primer multiplicador
+        '''
+        gale = list(config.gale) if config.use_antigala else [config.gale[0]]
+        return replace(config, gale=gale, neight_amount=config.neight_amounts[0])
+
+    def random_candidate(self) -> SessionConfig:
+        radius = self.rng.choice(RADII)
+        antigala = self.rng.random() < 0.5
+        gale = [self.rng.choice(MULTIPLIERS) for _ in range(self.rng.randint(1, MAX_GALE))]
+        return self.normalize(replace(self.base,
+                                      method=f'TOP{self.rng.choice(TOPS)}',
+                                      radius=radius,
+                                      hot_amount=self.rng.choice(AMOUNTS),
+                                      neight_amounts=[self.rng.choice(AMOUNTS) for _ in range(radius)],
+                                      other_amount=self.rng.choice(AMOUNTS),
+                                      zero_amount=self.rng.choice(AMOUNTS),
+                                      use_antigala=antigala,
+                                      gale=gale))
+
+    def _step(self, value:int, choices:tuple) -> int:
+        index = choices.index(value) if value in choices else 0
+        index = min(max(index + self.rng.choice((-2, -1, 1, 2)), 0), len(choices) - 1)
+        return choices[index]
+
+    def mutate(self, config:SessionConfig) -> SessionConfig:
+        '''
+        Cambia un gen al azar
+        '''
+        gene = self.rng.below(7)
+        if gene == 0:
+            top = self._step(int(config.method[3:]), TOPS)
+            return self.normalize(replace(config, method=f'TOP{top}'))
+        if gene == 1:
+            radius = self._step(config.radius, RADII)
+            amounts = (list(config.neight_amounts) + [config.neight_amounts[-1]] * radius)[:radius]
+            return self.normalize(replace(config, radius=radius, neight_amounts=amounts))
+        if gene == 2:
+            amounts = list(config.neight_amounts)
+            d = self.rng.below(len(amounts))
+            amounts[d] = self._step(amounts[d], AMOUNTS)
+            return self.normalize(replace(config, neight_amounts=amounts))
+        if gene == 3:
+            field = ('hot_amount', 'other_amount', 'zero_amount')[self.rng.below(3)]
+            return self.normalize(replace(config, **{field: self._step(getattr(config, field), AMOUNTS)}))
+        if gene == 4:
+            return self.normalize(replace(config, use_antigala=not config.use_antigala))
+        gale = list(config.gale)
+        if gene == 5 and len(gale) < MAX_GALE:
+            gale.insert(self.rng.below(len(gale) + 1), self.rng.choice(MULTIPLIERS))
+        elif gene == 5 and len(gale) > 1:
+            gale.pop(self.rng.below(len(gale)))
+        else:
+            i = self.rng.below(len(gale))
+            gale[i] = self._step(gale[i], MULTIPLIERS)
+        return self.normalize(replace(config, gale=gale))
+
+    def crossover(self, a:SessionConfig, b:SessionConfig) -> SessionConfig:
+        '''
+        Cada grupo de genes viene de uno de los dos padres
+        '''
+        pick = lambda: a if self.rng.random() < 0.5 else b
+        roles = pick()
+        gale = pick()
+        return self.normalize(replace(pick(), radius=roles.radius, neight_amounts=list(roles.neight_amounts),
+                                      use_antigala=gale.use_antigala, gale=list(gale.gale)))
+
+    # -- Evaluación --------------------------------------------------------
+
+    def _rung_seed(self, rung:int) -> int:
+        return task_seed(self.seed, f'rung:{rung}')
+
+    def _evaluate(self, configs:list, rung:int, pool) -> dict:
+        '''
+        Puntúa los candidatos en una etapa, usando la caché cuando ya se evaluaron
+        '''
+        sessions = self.rungs[rung]
+        seed = self._rung_seed(rung)
+        results = {}
+        tasks = {}
+        for config in configs:
+            key = config_key(config)
+            cached = self.scores.get((key, sessions, seed))
+            if cached is not None:
+                results[key] = cached
+            elif key not in tasks:
+                tasks[key] = (key, asdict(config), sessions, seed)
+        tasks = list(tasks.values())
+
+        rows = pool.imap_unordered(score_config, tasks) if pool is not None else map(score_config, tasks)
+        new_rows = []
+        for row in rows:
+            self.scores[(row['key'], sessions, seed)] = row
+            results[row['key']] = row
+            new_rows.append(row)
+        if self.cache and new_rows:
+            with open(self.cache, 'a', encoding='utf-8') as f:
+                for row in new_rows:
+                    f.write(json.dumps(row) + '\n')
+        return results
+
+    def halving(self, configs:list, pool) -> list:
+        '''
+        Successive halving: retorna [(etapa alcanzada, puntaje, config, resumen)] de mejor a peor
+        '''
+        score = OBJECTIVES[self.objective]
+        ranked = []
+        survivors = configs
+        for rung in range(len(self.rungs)):
+            results = self._evaluate(survivors, rung, pool)
+            order = sorted(survivors, key=lambda c: score(results[config_key(c)]), reverse=True)
+            keep = max(1, len(order) // self.eta) if rung < len(self.rungs) - 1 else len(order)
+            for config in order[keep:]:
+                ranked.append((rung, score(results[config_key(config)]), config, results[config_key(config)]))
+            survivors = order[:keep]
+            if rung == len(self.rungs) - 1:
+                for config in survivors:
+                    summary = results[config_key(config)]
+                    ranked.append((rung, score(summary), config, summary))
+                    # -- Solo los puntajes de la última etapa son comparables entre generaciones
+                    self.best[config_key(config)] = (score(summary), config, summary)
+        ranked.sort(key=lambda r: (r[0], r[1]), reverse=True)
+        return ranked
+
+    def run(self, generations:int=10, verbose:bool=True) -> list:
+        '''
+        Evoluciona la población y retorna los mejores [(puntaje, config, resumen)]
+        '''
+        pool = Pool(processes=self.workers) if self.workers != 1 else None
+        try:
+            population = self._unique([self.random_candidate() for _ in range(self.population)])
+            for generation in range(generations):
+                ranked = self.halving(population, pool)
+                top = self.top(self.elite)
+                if verbose and top:
+                    best_score, best, summary = top[0]
+                    print(f'\t [{generation + 1}/{generations}] {self.objective} {best_score:.4f}'
+                          f' - {best.method} radio {best.radius} gale {best.gale} ({len(self.scores)} evaluaciones)')
+                parents = [config for _, config, _ in top] or [r[2] for r in ranked[:self.elite]]
+                children = list(parents)
+                while len(children) < self.population:
+                    if len(parents) > 1 and self.rng.random() < 0.3:
+                        a, b = self.rng.sample(parents, 2)
+                        child = self.crossover(a, b)
+                    else:
+                        child = self.mutate(self.rng.choice(parents))
+                    children.append(child)
+                population = self._unique(children)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return self.top(self.elite)
+
+    def top(self, n:int) -> list:
+        return sorted(self.best.values(), key=lambda r: r[0], reverse=True)[:n]
+
+    def _unique(self, configs:list) -> list:
+        seen = {}
+        for config in configs:
+            seen.setdefault(config_key(config), config)
+        return list(seen.values())
+
+def cli_command(config:SessionConfig, autorun:int=0, max_repeat:int=100) -> str:
+    '''
+    Comando listo para ejecutar `roulette.py` con la configuración
+    '''
+    parts = ['python roulette.py',
+             f'--method {config.method}',
+             f'--hot_amount {config.hot_amount}',
+             f'--neight_amount {config.neight_amount}',
+             f'--other_amount {config.other_amount}',
+             f'--rondas_soportadas {config.rondas_soportadas}',
+             f'--profit_out {config.profit_out}',
+             f'--use_antigala {int(config.use_antigala)}',
+             f'--autorun {autorun}',
+             f'--max_repeat {max_repeat}',
+             f'--radius {config.radius}']
+    if config.neight_amounts is not None:
+        parts.append(f'--neight_amounts {",".join(str(a) for a in config.neight_amounts)}')
+    if config.zero_amount is not None:
+        parts.append(f'--zero_amount {config.zero_amount}')
+    return ' '.join(parts)
+
+def env_settings(config:SessionConfig) -> str:
+    '''
+    Líneas del `.env` que dependen de la configuración
+    '''
+    numbers = config.numbers if isinstance(config.numbers, str) else ', '.join(str(n) for n in config.numbers)
+    return '\n'.join([f'numbers={numbers}',
+                      f'gale={",".join(str(m) for m in config.gale)}',
+                      f'payed_wins={config.pay_for}'])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Optimizador de montos por rol y gale')
+
+    parser.add_argument('--objective', type=str, choices=list(OBJECTIVES), default='profit_rate', help='Criterio a maximizar')
+    parser.add_argument('--generations', type=int, default=10, help='Generaciones de la búsqueda')
+    parser.add_argument('--population', type=int, default=24, help='Candidatos por generación')
+    parser.add_argument('--elite', type=int, default=6, help='Mejores candidatos que pasan a la siguiente generación')
+    parser.add_argument('--min_sessions', type=int, default=500, help='Sesiones de la primera etapa del successive halving')
+    parser.add_argument('--max_sessions', type=int, default=13500, help='Sesiones máximas de la última etapa')
+    parser.add_argument('--rondas_soportadas', type=int, default=20, help='Rondas que soporta la cartera inicial')
+    parser.add_argument('--profit_out', type=int, default=33, help='Porcentaje de profit para retirarse')
+    parser.add_argument('--max_rounds', type=int, default=100, help='Límite de rondas por sesión')
+    parser.add_argument('--numbers', type=str, default='little', help='Rueda: little, european, american o lista de números')
+    parser.add_argument('--pay_for', type=int, default=12, help='Pago por acierto')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla de la búsqueda y de las tiradas')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos del pool (por defecto todos los núcleos)')
+    parser.add_argument('--cache', type=str, default=None, help='Archivo JSON lines con puntajes ya evaluados (opcional)')
+    parser.add_argument('--output', type=str, default=None, help='Archivo JSON con los mejores candidatos (opcional)')
+
+    args = parser.parse_args()
+
+    base = SessionConfig(rondas_soportadas=args.rondas_soportadas, profit_out=args.profit_out,
+                         max_rounds=args.max_rounds, numbers=args.numbers, pay_for=args.pay_for)
+    optimizer = Optimizer(base, objective=args.objective, population=args.population, elite=args.elite,
+                          min_sessions=args.min_sessions, max_sessions=args.max_sessions, seed=args.seed,
+                          workers=args.workers, cache=args.cache)
+    best = optimizer.run(generations=args.generations)
+
+    for position, (score, config, summary) in enumerate(best, 1):
+        print(f"\n#{position} {args.objective} {score:.4f} - profit {summary['profit_rate']:.2%}"
+              f" - ruina {summary['ruin_rate']:.2%} - profit medio {summary['mean_profit']:.1f}"
+              f" ({summary['sessions']} sesiones)")
+        print(cli_command(config))
+        print(env_settings(config))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([{'score': score, 'config': asdict(config), 'summary': summary,
+                        'command': cli_command(config), 'env': env_settings(config)}
+                       for score, config, summary in best], f, indent=2)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'output.py'
+__description__ = '''Salida por niveles con escritura en bloques y título de la terminal'''
+
+import sys
+
+# -- Niveles de detalle
+QUIET = 0      # -- nada
+SUMMARY = 1    # -- inicio, un resumen cada N rondas y el final
+ROUND = 2      # -- resultado de cada ronda
+FULL = 3       # -- además el detalle de la rotación y de la apuesta
+
+LEVELS = {'quiet': QUIET, 'summary': SUMMARY, 'round': ROUND, 'full': FULL}
+
+# -- Caracteres acumulados antes de escribir en el stream
+BUFFER_SIZE = 8192
+
+# -- Secuencia OSC para cambiar el título de la ventana de la terminal
+TITLE = '\x1b]0;{}\x07'
+
+class Output:
+    '''
+    Salida del juego por niveles. Lo que supera el nivel elegido no se formatea
+    ni se escribe; lo demás se acumula y se escribe en bloques (al llenarse el
+    buffer, al pedir una tecla o al terminar).
+    '''
+
+    def __init__(self, level:int=FULL, stream=None, summary_every:int=10, buffer_size:int=BUFFER_SIZE):
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        self.stream = stream or sys.stdout
+        self.summary_every = summary_every
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.current_title = None
+        # -- El título solo tiene sentido en una terminal
+        self.has_title = self.level > QUIET and getattr(self.stream, 'isatty', lambda: False)()
+
+    def enabled(self, level:int) -> bool:
+        '''
+        Si se muestra lo del nivel indicado (para no formatear mensajes que no se verán)
+        '''
+        return level <= self.level
+
+    def write(self, text:str, level:int=ROUND) -> None:
+        if level > self.level:
+            return
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def line(self, text:str='', level:int=ROUND) -> None:
+        self.write(text + '\n', level)
+
+    def prompt(self, text:str, level:int=ROUND) -> None:
+        '''
+        Mensaje que espera una acción del usuario: se escribe de inmediato
+        '''
+        self.write(text, level)
+        self.flush()
+
+    def summary(self, crlm) -> None:
+        '''
+        Una línea de resumen cada `summary_every` rondas (solo en el nivel SUMMARY)
+        '''
+        if self.level == SUMMARY and crlm.ROUND_NUMBER % self.summary_every == 0:
+            self.line(f'\t 💥 Ronda {crlm.ROUND_NUMBER} - 💼 {crlm.total_amount} DOP - Profit {crlm.profit} %', SUMMARY)
+            self.flush()
+
+    def title(self, text:str) -> None:
+        '''
+        Título de la ventana; solo se escribe si cambió
+        '''
+        if self.has_title and text != self.current_title:
+            self.current_title = text
+            self.write(TITLE.format(text), QUIET)
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.stream.write(''.join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
+            self.stream.flush()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'renderer.py'
+__description__ = '''Renderizado de la animación con cuadros precalculados'''
+
+import os
+import sys
+import time
+
+# -- Secuencias ANSI: cursor al inicio y borrar hasta el final de la pantalla
+CURSOR_HOME = '\x1b[H'
+ERASE_DOWN = '\x1b[J'
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+
+class NullRenderer:
+    '''
+    Renderizador vacío para simulaciones sin terminal: no dibuja ni espera
+    '''
+
+    title = ''
+
+    def clear(self) -> None:
+        pass
+
+    def draw(self, number:int) -> None:
+        pass
+
+    def animate(self, numbers:list, seconds:float) -> None:
+        pass
+
+    async def animate_async(self, numbers:list, seconds:float) -> None:
+        pass
+
+class TerminalRenderer(NullRenderer):
+    '''
+    Renderiza con `cfonts` el título y el número de cada casilla una sola vez.
+    Cada cuadro se dibuja con una única escritura (cursor al inicio + borrar + cuadro)
+    y la animación respeta un máximo de cuadros por segundo.
+    '''
+
+    def __init__(self, wheel, fps:int=30, stream=None):
+        import cfonts
+
+        self.wheel = wheel
+        self.fps = fps
+        self.stream = stream or sys.stdout
+        self.title = cfonts.render('ROULETTE', colors=['red', 'yellow'], align='center')
+        self.frames = {}
+        for number in wheel:
+            if wheel.is_zero(number):
+                color = ['green']
+            elif wheel.is_red(number):
+                color = ['red']
+            else:
+                color = ['cyan']
+            output = cfonts.render(wheel.label(number), colors=color, align='center')
+            self.frames[number] = f'{CURSOR_HOME}{self.title}\n{output}\n{ERASE_DOWN}'
+
+        if os.name == 'nt':
+            # -- Activa el procesamiento de secuencias ANSI en la consola de Windows
+            os.system('')
+
+    def clear(self) -> None:
+        self.stream.write(CLEAR_SCREEN)
+        self.stream.flush()
+
+    def draw(self, number:int) -> None:
+        self.stream.write(self.frames[number])
+        self.stream.flush()
+
+    def schedule(self, numbers:list, seconds:float) -> list:
+        '''
+        Cuadros a dibujar como (segundo, número, es el último) recorriendo los números
+        en `seconds` segundos, sin superar el máximo de FPS. El último siempre se dibuja.
+        '''
+        if not numbers:
+            return []
+        step = seconds / len(numbers)
+        min_gap = 1 / self.fps if self.fps else 0
+        frames = []
+        last = None
+        for i, number in enumerate(numbers):
+            due = i * step
+            is_last = i == len(numbers) - 1
+            if is_last or last is None or due - last >= min_gap:
+                frames.append((due, number, is_last))
+                last = due
+        return frames
+
+    def animate(self, numbers:list, seconds:float) -> None:
+        '''
+        Dibuja la animación contra el reloj (sin acumular retrasos); los cuadros que
+        llegan tarde se omiten
+        '''
+        start = time.perf_counter()
+        for due, number, is_last in self.schedule(numbers, seconds):
+            wait = start + due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            elif -wait > 1 / (self.fps or 1) and not is_last:
+                continue
+            self.draw(number)
+
+        remaining = start + seconds - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    async def animate_async(self, numbers:list, seconds:float) -> None:
+        '''
+        Igual que `animate`, con esperas programadas en el loop de asyncio
+        '''
+        # -- asyncio se importa al usarse, así importar el módulo es inmediato
+        import asyncio
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for due, number, is_last in self.schedule(numbers, seconds):
+            wait = start + due - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elif -wait > 1 / (self.fps or 1) and not is_last:
+                continue
+            self.draw(number)
+
+        remaining = start + seconds - loop.time()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'rng.py'
+__description__ = '''Fuentes de aleatoriedad reproducibles con flujos independientes'''
+
+from itertools import chain
+
+# -- Tamaño inicial y máximo de los lotes pregenerados (el lote se duplica en cada recarga)
+MIN_BATCH = 64
+MAX_BATCH = 1 << 16
+
+class RandomStream:
+    '''
+    Flujo de números aleatorios sobre NumPy PCG64. Los valores se generan en
+    lotes y se sirven con un iterador de C, así cada tirada cuesta un `next`.
+    Ofrece la misma interfaz que usa la máquina de `random.Random`.
+    '''
+
+    def __init__(self, seed_sequence, max_batch:int=MAX_BATCH):
+        # -- NumPy se importa al crear el primer flujo, no al importar el módulo
+        import numpy as np
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self.max_batch = max_batch
+        # -- Buffer de flotantes compartido por `random` y `randoms`
+        self.floats = []
+        self.float_pos = 0
+        self.float_batch = MIN_BATCH
+        # -- Un iterador de enteros por cada rango pedido: n -> siguiente entero en [0, n)
+        self.ints = {}
+
+    def _batches(self, draw, *args):
+        '''
+        Lotes pregenerados, cada uno el doble del anterior hasta `max_batch`
+        '''
+        batch = MIN_BATCH
+        while True:
+            yield draw(*args, batch).tolist()
+            batch = min(batch * 2, self.max_batch)
+
+    def randoms(self, n:int) -> list:
+        '''
+        `n` flotantes uniformes en [0, 1) de una vez (los mismos que darían `n` llamadas a `random`)
+        '''
+        end = self.float_pos + n
+        if end > len(self.floats):
+            self.floats = self.floats[self.float_pos:] + self.generator.random(max(self.float_batch, n)).tolist()
+            self.float_pos, end = 0, n
+            self.float_batch = min(self.float_batch * 2, self.max_batch)
+        values = self.floats[self.float_pos:end]
+        self.float_pos = end
+        return values
+
+    def random(self) -> float:
+        '''
+        Flotante uniforme en [0, 1)
+        '''
+        return self.randoms(1)[0]
+
+    def below(self, n:int) -> int:
+        '''
+        Entero uniforme en [0, n)
+        '''
+        try:
+            return self.ints[n]()
+        except KeyError:
+            self.ints[n] = chain.from_iterable(self._batches(self.generator.integers, 0, n)).__next__
+            return self.ints[n]()
+
+    def randint(self, a:int, b:int) -> int:
+        '''
+        Entero uniforme en [a, b] (ambos incluidos)
+        '''
+        return a + self.below(b - a + 1)
+
+    def choice(self, seq):
+        try:
+            return seq[self.ints[len(seq)]()]
+        except KeyError:
+            return seq[self.below(len(seq))]
+
+    def sample(self, seq, k:int) -> list:
+        '''
+        `k` elementos distintos de `seq` (Fisher-Yates parcial)
+        '''
+        pool = list(seq)
+        n = len(pool)
+        for i in range(k):
+            j = i + int(self.random() * (n - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+class RandomStreams:
+    '''
+    Proveedor de aleatoriedad de una máquina: un flujo independiente para las
+    tiradas, otro para los desempates de hotters/coolest, otro para el historial
+    inicial y otro para la animación. Todos derivan de una sola semilla, por lo que
+    una sesión se repite exactamente a partir de ella, y cambiar la animación o la
+    estrategia no altera la secuencia de números ganadores.
+    '''
+
+    # -- Índice de cada flujo entre los hijos de la semilla; `split` usa los siguientes
+    STREAMS = ('spins', 'ties', 'history', 'animation')
+
+    def __init__(self, seed=None, max_batch:int=MAX_BATCH):
+        import numpy as np
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.max_batch = max_batch
+        self.spawned = len(self.STREAMS)
+
+    def _child(self, index:int):
+        # -- Igual que `SeedSequence.spawn`, pero con índice explícito (los flujos se crean al usarse)
+        parent = self.seed_sequence
+        return type(parent)(parent.entropy, spawn_key=parent.spawn_key + (index,), pool_size=parent.pool_size)
+
+    def __getattr__(self, name:str) -> RandomStream:
+        '''
+        Crea cada flujo (`spins`, `ties`, `history`, `animation`) la primera vez que se usa;
+        luego queda como atributo normal
+        '''
+        if name not in self.STREAMS:
+            raise AttributeError(name)
+        stream = RandomStream(self._child(self.STREAMS.index(name)), self.max_batch)
+        setattr(self, name, stream)
+        return stream
+
+    @property
+    def seed(self) -> int:
+        '''
+        Entropía de la semilla (con ella se repite la sesión)
+        '''
+        return self.seed_sequence.entropy
+
+    def split(self, n:int) -> list:
+        '''
+        `n` proveedores independientes entre sí, p. ej. uno por proceso o por sesión
+        '''
+        children = [self._child(i) for i in range(self.spawned, self.spawned + n)]
+        self.spawned += n
+        return [RandomStreams(child, self.max_batch) for child in children]
@@ -6,16 +6,17 @@ __date__ = '15/Junio/2025'
 __proyect__ = 'roulette.py'
 __description__ = '''Herramienta de Ruleta'''
 
-import argparse
-import msvcrt
-import random
-from itertools import chain
-from collections import Counter
-import os, sys
-import cfonts
-import time
-from dotenv import load_dotenv
-load_dotenv()
+from contextlib import nullcontext
+from frequency import FrequencyIndex
+from history import SpinHistory, DEFAULT_CAPACITY
+from rng import RandomStreams
+from wheel import Wheel, FreeSlots
+from strategies import get_strategy
+from renderer import NullRenderer
+from output import Output, LEVELS, SUMMARY, ROUND, FULL
+
+# -- `number` de un registro sin tirada (mismo valor que spinlog.NO_SPIN)
+NO_SPIN = 255
 
 def singleton(cls):
     instances = {}
@@ -24,7 +25,9 @@ def singleton(cls):
         if cls not in instances:
             instances[cls] = cls(*args, **kwargs)
         return instances[cls]
-    
+
+    # -- Permite crear instancias independientes (simulaciones sin I/O)
+    get_instance.__wrapped__ = cls
     return get_instance
 
 @singleton
@@ -35,12 +38,19 @@ class CircleRouletteLittleMachine(list):
 
     PROFIT_OUT = 33
 
-    def __init__(self, numbers:list=[x for x in range(0, 13)], pay_for:int=12, history_size:int=7, total_amount:int=300):
+    def __init__(self, numbers:list=[x for x in range(0, 13)], pay_for:int=12, history_size:int=7, total_amount:int=300, gale:list=None, rng:RandomStreams=None,
+                 frequency_window:int=None, frequency_decay:float=None, renderer=None, history_capacity:int=DEFAULT_CAPACITY,
+                 output:Output=None):
         super().__init__()
-        self.extend(numbers)
-        self.ordered = sorted(numbers)
+        # -- Topología de la rueda: posiciones y vecinos precalculados
+        self.wheel = Wheel.from_setting(numbers)
+        self.extend(self.wheel.numbers)
+        self.ordered = sorted(self.wheel.numbers)
         self.pay_for = pay_for
-        self.history = []
+        # -- Historial acotado: solo se conservan las últimas `history_capacity` tiradas
+        self.history = SpinHistory(capacity=history_capacity, block_size=history_size, max_number=max(self.wheel.numbers))
+        # -- Frecuencias del historial actualizadas en cada tirada
+        self.frequency = FrequencyIndex(window=frequency_window, decay=frequency_decay)
         self.total_amount = total_amount
         self.played_numbers = {}
         self.history_size = history_size
@@ -50,8 +60,19 @@ class CircleRouletteLittleMachine(list):
         # -- Recordar el monto inicial y la ronda actual
         self.ROUND_NUMBER = 0
         self.INITIAL_WALLET = 0
-        self.MULTIPLICADOR = [int(x) for x in os.getenv('gale').replace(' ','').split(',')]
+        # -- Sin gale se juega sin progresión; el del .env lo pasa quien crea la máquina
+        self.MULTIPLICADOR = list(gale) if gale is not None else [1]
+        if not self.MULTIPLICADOR:
+            raise ValueError('La secuencia de gale no puede estar vacía')
         self.INDEX = 0
+        # -- Flujos de aleatoriedad independientes (tiradas, desempates, historial y animación)
+        self.rng = rng if rng is not None else RandomStreams()
+        # -- Mostrar advertencias (las simulaciones sin I/O lo desactivan)
+        self.verbose = True
+        # -- Animación en la terminal (NullRenderer no dibuja nada)
+        self.renderer = renderer or NullRenderer()
+        # -- Mensajes del juego por niveles (por defecto todo, como antes)
+        self.output = output or Output()
         
     def add_multiplier(self) -> int:
         '''
@@ -73,7 +94,8 @@ class CircleRouletteLittleMachine(list):
         Calcula la probabilidad de ganar
         '''
 
-        print(f'\t Jugando a un {(len(self.played_numbers)/len(self))*100:.2f}%')
+        if self.output.enabled(FULL):
+            self.output.line(f'\t Jugando a un {(len(self.played_numbers)/len(self))*100:.2f}%', FULL)
 
     def select_unique_neighbors(self, neighbors_list: list, hotters: list = []) -> list:
         '''
@@ -83,98 +105,48 @@ class CircleRouletteLittleMachine(list):
         Nunca selecciona como vecino a un número presente en `hotters`.
         '''
         unique_neighbors = []
-        used = set()
+        slots = FreeSlots(len(self.wheel), taken=(self.wheel.position(n) for n in hotters))
 
         for neigh in neighbors_list:
-            if neigh not in used and neigh not in hotters:
-                unique_neighbors.append(neigh)
-                used.add(neigh)
-            else:
-                index = self.index(neigh)
-                found = False
-                offset = 1
-
-                # Buscar hacia la izquierda hasta volver al mismo número
-                while offset < len(self):
-                    left_index = (index - offset) % len(self)
-                    candidate = self[left_index]
-
-                    if candidate == neigh:
-                        break  # Hemos dado la vuelta completa sin encontrar uno libre
-
-                    if candidate not in used and candidate not in hotters:
-                        unique_neighbors.append(candidate)
-                        used.add(candidate)
-                        found = True
-                        break
-
-                    offset += 1
-
-                if not found:
-                    print(f"[⚠️] Vecino repetido '{neigh}' no pudo ser sustituido.")
+            # -- Primera casilla libre en el vecino o a su izquierda
+            position = slots.find(self.wheel.position(neigh))
+            if position is None:
+                if self.verbose:
+                    self.output.line(f"[⚠️] Vecino repetido '{neigh}' no pudo ser sustituido.", FULL)
+                continue
+            slots.take(position)
+            unique_neighbors.append(self.wheel.numbers[position])
 
         return unique_neighbors
 
-    def get_neighbors(self, numero:int) -> tuple:
+    def get_neighbors(self, numero:int, radius:int=1) -> tuple:
         '''
-        Obtiene los vecinos del numero indicado
+        Obtiene los vecinos del numero indicado (izquierda y derecha hasta `radius`)
         '''
-        index = self.index(numero)
-        left = self[(index - 1) % len(self)]
-        right = self[(index + 1) % len(self)]
-        return left, right
-    
+        return self.wheel.neighbors(numero, radius)
+
     def get_hotters(self, top:int) -> list:
         '''
         Devuelve los `top` números distintos más frecuentes de las últimas N salidas,
         con un toque de aleatoriedad ponderada por la frecuencia.
         '''
-        flat = list(chain.from_iterable(self.history))
-        counter = Counter(flat)
-
-        # Aleatoriza con peso: números más frecuentes tienen más chance de salir arriba
-        top_randomized = sorted(counter.keys(), key=lambda x: counter[x] * random.random(), reverse=True)
-
-        result = top_randomized[:top]
-        seen = set(result)
-
-        # Rellenar con números aleatorios distintos si faltan
-        if len(result) < top:
-            restantes = [n for n in self if n not in seen]
-            result.extend(restantes[:top - len(result)])
-
-        return result
+        return self.frequency.hotters(top, self.rng.ties, self)
 
     def get_coolest(self, top:int) -> list:
         '''
         Devuelve los `top` números distintos menos frecuentes de las últimas N salidas,
         con un toque de aleatoriedad ponderada por la baja frecuencia.
         '''
-        flat = list(chain.from_iterable(self.history))
-        counter = Counter(flat)
-
-        # Aleatoriza con peso inverso: números menos frecuentes tienen más chance de salir arriba
-        top_randomized = sorted(counter.keys(), key=lambda x: (1 / (counter[x] + 1)) * random.random(), reverse=True)
-
-        result = top_randomized[:top]
-        seen = set(result)
-
-        # Rellenar con números aleatorios distintos si faltan
-        if len(result) < top:
-            restantes = [n for n in self if n not in seen]
-            result.extend(restantes[:top - len(result)])
-
-        return result
+        return self.frequency.coolest(top, self.rng.ties, self)
 
     def get_history(self) -> list:
         '''
         Muestra los ultimos numeros del historico
         '''
         if not self.history:
-            print("No hay historial aún para predecir.")
+            self.output.line("No hay historial aún para predecir.")
             return []
-        flat = list(chain.from_iterable(self.history))
-        return flat
+        return self.history.last(len(self.history))
 
     def calculate_profit(self) -> None:
         '''
@@ -182,34 +154,51 @@ class CircleRouletteLittleMachine(list):
         '''
         self.profit = round(100*(self.total_amount - self.INITIAL_WALLET)/self.INITIAL_WALLET,2)
 
-    def calculate_winning_amount(self, winning_number:int) -> bool:
+    def settle_bet(self, winning_number:int) -> tuple:
         '''
-        Calcula el nuevo monto disponible luego de la jugada.
-        Returna True si acierta, False si falla
+        Aplica el resultado de la jugada a la cartera sin mostrar nada.
+        Retorna (acierto, monto ganado o perdido)
         '''
-        status = False
-        if winning_number in self.played_numbers.keys():
+        if winning_number in self.played_numbers:
             ganancia = self.played_numbers[winning_number] * self.pay_for
             self.total_amount += ganancia
-            print(f'\t 💵 ¡Acertó {ganancia} DOP!')
-            status = True
+            status, monto = True, ganancia
         else:
             perdida = sum(self.played_numbers.values())
             self.total_amount -= perdida
-            print(f'\t ❌ Falló {perdida} DOP.')
-            status = False
+            status, monto = False, perdida
         self.calculate_profit()
-        print(f'\t 💼 Cartera : {self.total_amount} DOP')
-        if self.profit < 0:
-            print(f"\t 😩 Profit -> {self.profit} %")
-        else:
-            print(f"\t 🤑 Profit -> {self.profit} %")
-        print('\n🕹️ >>> EJECUTAR DE NUEVO (ENTER): ', end='', flush=True)
-        flat = self.get_history()
-        os.system(f'title {flat[-1*self.history_size:]} - {self.INITIAL_WALLET}')
+        return status, monto
+
+    def calculate_winning_amount(self, winning_number:int) -> bool:
+        '''
+        Calcula el nuevo monto disponible luego de la jugada.
+        Returna True si acierta, False si falla
+        '''
+        status, monto = self.settle_bet(winning_number)
+        output = self.output
+        if output.enabled(ROUND):
+            if status:
+                output.line(f'\t 💵 ¡Acertó {monto} DOP!')
+            else:
+                output.line(f'\t ❌ Falló {monto} DOP.')
+            output.line(f'\t 💼 Cartera : {self.total_amount} DOP')
+            if self.profit < 0:
+                output.line(f"\t 😩 Profit -> {self.profit} %")
+            else:
+                output.line(f"\t 🤑 Profit -> {self.profit} %")
+            self.set_title(f'{self.history.last(self.history_size)} - {self.INITIAL_WALLET}')
+            output.prompt('\n🕹️ >>> EJECUTAR DE NUEVO (ENTER): ')
+        output.summary(self)
 
         return status
 
+    def set_title(self, text:str) -> None:
+        '''
+        Título de la ventana de la terminal (secuencia de escape, solo si cambió)
+        '''
+        self.output.title(text)
+
     def put_bet(self, plays: dict) -> None:
         '''
         Asigna las apuestas sin descontar el saldo.
@@ -227,19 +216,7 @@ class CircleRouletteLittleMachine(list):
         self.total_amount -= total_bet
 
     def display_number(self, number:int):
-        os.system('cls' if os.name == 'nt' else 'clear')
-        output_title = cfonts.render('ROULETTE', colors=['red', 'yellow'], align='center')
-
-        if number == 0:
-            color = ['green']
-        elif number % 2 == 0:
-            color = ['cyan']
-        else:
-            color = ['red']
-
-        output = cfonts.render(str(number), colors=color, align='center')
-        print(output_title)
-        print(output)
+        self.renderer.draw(number)
 
     def config_secret(self) -> tuple:
         '''
@@ -247,15 +224,34 @@ class CircleRouletteLittleMachine(list):
         - start_from: índice inicial
         - extra_steps: pasos extra luego de 1 vuelta completa
         '''
-        start_from = random.randint(0, len(self) - 1)
-        extra_steps = random.randint(2, 4)
+        start_from = self.rng.animation.randint(0, len(self) - 1)
+        extra_steps = self.rng.animation.randint(2, 4)
         return start_from, extra_steps
     
-    def rotate(self, secs_animation:int=3) -> int:
+    def spin(self) -> int:
+        '''
+        Obtiene el número ganador y lo registra en el historial, sin animación
+        '''
+        winning_number = self.rng.spins.choice(self)
+        self.add_to_history(winning_number)
+        return winning_number
+
+    def add_to_history(self, winning_number:int) -> None:
+        '''
+        Agrega el número ganador al último bloque del historial
+        '''
+        self.frequency.add(winning_number)
+        self.history.append(winning_number)
+
+    def prepare_rotation(self) -> tuple:
+        '''
+        Elige el número ganador y el recorrido de la animación.
+        Retorna (número ganador, inicio, total de pasos, números del recorrido)
+        '''
         size = len(self)
 
-        winning_number = random.choice(self)
-        winning_index = self.index(winning_number)
+        winning_number = self.rng.spins.choice(self)
+        winning_index = self.wheel.position(winning_number)
 
         # Usamos config_secret para obtener el inicio y las vueltas extras
         start_from, vueltas_extras = self.config_secret()
@@ -264,35 +260,44 @@ class CircleRouletteLittleMachine(list):
 
         total_steps = vueltas_extras * size + diff + 1
 
-        path = [(start_from + i) % size for i in range(total_steps)]
-
-        SEGUNDOS = secs_animation
-        delay = SEGUNDOS / len(path)
+        path = [self[(start_from + i) % size] for i in range(total_steps)]
+        return winning_number, start_from, total_steps, path
 
-        for i in path:
-            number = self[i]
-            self.display_number(number)
-            time.sleep(delay)
+    def finish_rotation(self, winning_number:int, start_from:int, total_steps:int) -> int:
+        '''
+        Muestra el resultado de la rotación y lo registra en el historial
+        '''
+        output = self.output
+        if output.enabled(FULL):
+            apuestas_ordenadas = dict(sorted(self.played_numbers.items()))
+            output.line(f'\t 🔄 Secrete -> Desde {start_from} con total pasos {total_steps}', FULL)
+            output.line(f"\t ❓ RNG -> {winning_number}", FULL)
+            output.line(f"\t 🔥 Hotters -> {self.hotter_numbers}", FULL)
+            output.line(f"\t 🎟️ Apuestas -> {apuestas_ordenadas}", FULL)
+        if output.enabled(ROUND):
+            output.line(f"\t 🎯 Número Ganador -> {winning_number}")
+            output.line(f"\t 💥 Ronda -> {self.ROUND_NUMBER}")
 
-        apuestas_ordenadas = dict(sorted(self.played_numbers.items()))
-        print(f'\t 🔄 Secrete -> Desde {start_from} con total pasos {total_steps}')
-        print(f"\t ❓ RNG -> {winning_number}")
-        print(f"\t 🔥 Hotters -> {self.hotter_numbers}")
-        print(f"\t 🎟️ Apuestas -> {apuestas_ordenadas}")
-        print(f"\t 🎯 Número Ganador -> {winning_number}")
-        print(f"\t 💥 Ronda -> {self.ROUND_NUMBER}")
-        
-        if not self.history:
-            self.history.append([winning_number])
-        else:
-            ultima_sublista = self.history[-1]
-            if len(ultima_sublista) < self.history_size:
-                ultima_sublista.append(winning_number)
-            else:
-                self.history.append([winning_number])
+        self.add_to_history(winning_number)
 
         return winning_number
 
+    def rotate(self, secs_animation:int=3) -> int:
+        winning_number, start_from, total_steps, path = self.prepare_rotation()
+        # -- Lo acumulado se muestra antes de que el renderizador dibuje
+        self.output.flush()
+        self.renderer.animate(path, secs_animation)
+        return self.finish_rotation(winning_number, start_from, total_steps)
+
+    async def rotate_async(self, secs_animation:int=3) -> int:
+        '''
+        Igual que `rotate`, pero la animación no bloquea el loop de asyncio
+        '''
+        winning_number, start_from, total_steps, path = self.prepare_rotation()
+        self.output.flush()
+        await self.renderer.animate_async(path, secs_animation)
+        return self.finish_rotation(winning_number, start_from, total_steps)
+
     def has_reach_profit(self) -> bool:
         '''
         Verifica si llegamos al profit requerido
@@ -304,12 +309,14 @@ class CircleRouletteLittleMachine(list):
         Inicializa el historial con 2 sublistas aleatorias, 
         cada una con hasta self.history_size elementos únicos.
         '''
-        self.history = []
+        self.history.clear()
+        self.frequency.clear()
 
         for _ in range(INITIAL_HISTORY_BLOCKS):
             # -- Tomar números aleatorios únicos sin repetición
-            sublist = random.sample(self, min(self.history_size, len(self)))
-            self.history.append(sublist)
+            sublist = self.rng.history.sample(self, min(self.history_size, len(self)))
+            self.history.extend(sublist)
+            self.frequency.extend(sublist)
 
     def start(self, secs_animation:int=3) -> int:
         '''
@@ -320,21 +327,45 @@ class CircleRouletteLittleMachine(list):
         self.ROUND_NUMBER += 1
 
         return self.rotate(secs_animation=secs_animation)
+
+    async def start_async(self, secs_animation:int=3) -> int:
+        '''
+        Ejecuta la ruleta sin bloquear el loop de asyncio
+        '''
+        self.calculate_percent()
+        self.confirm_bet()
+        self.ROUND_NUMBER += 1
+
+        return await self.rotate_async(secs_animation=secs_animation)
     
     def show_history(self):
         '''
         Muestra el historial de jugadas
         '''
-        print("\n\t📝 Historial de jugadas")
-        for ronda, sublista in enumerate(self.history, 1):
-            print(f"\t ✅Ronda {ronda}: {sublista}")
+        if not self.output.enabled(ROUND):
+            return
+        self.output.line("\n\t📝 Historial de jugadas")
+        for ronda, sublista in self.history.blocks():
+            self.output.line(f"\t ✅Ronda {ronda}: {sublista}")
+        self.output.flush()
 
 def main(crlm:CircleRouletteLittleMachine) -> None:
     '''
     Función de inicialización
     '''
-     
+    import asyncio
+    asyncio.run(main_async(crlm))
+
+async def main_async(crlm:CircleRouletteLittleMachine) -> None:
+    '''
+    Loop del juego sobre asyncio: las pausas del autorun, la animación y la
+    espera de teclas no bloquean ni consumen CPU
+    '''
+    import asyncio
+    from keyboard import KeyReader
+
     global TOP_METHOD
+    global STRATEGY
     global HOT_AMOUNT
     global NEIGHT_AMOUNT
     global OTHER_AMOUNT
@@ -347,165 +378,99 @@ def main(crlm:CircleRouletteLittleMachine) -> None:
     global COUNTER_AUTO
     global INITIAL_HISTORY_BLOCKS
     global PAUSE_AUTORUN
+    global RADIUS
+    global SPIN_LOG
 
+    output = crlm.output
     ronda_actual = INITIAL_HISTORY_BLOCKS - 1
-    while True:
-        # Si AUTORUN es True y ya se pasó el límite de repeticiones, termina el juego
-        if AUTORUN and COUNTER_AUTO >= MAX_REPEAT:
-            print(f"Se completaron {MAX_REPEAT} rondas automáticas. Fin del juego.")
-            crlm.show_history()
-            break
-
-        if AUTORUN:
-            # Simula ENTER
-            key = b'\r'
-            COUNTER_AUTO += 1
-            time.sleep(PAUSE_AUTORUN)
-        else:
-            # Espera tecla real
-            if not msvcrt.kbhit():
-                continue
-            key = msvcrt.getch()
-
-        if key == b'\r':
-            ronda_actual += 1
-            print(f"\n✅Ronda {ronda_actual}")
+    async with (nullcontext() if AUTORUN else KeyReader()) as keys:
+        while True:
+            # Si AUTORUN es True y ya se pasó el límite de repeticiones, termina el juego
+            if AUTORUN and COUNTER_AUTO >= MAX_REPEAT:
+                output.line(f"Se completaron {MAX_REPEAT} rondas automáticas. Fin del juego.", SUMMARY)
+                crlm.show_history()
+                break
 
-            # -- Validar si hay historial suficiente para predecir
-            if not crlm.history:
-                print("Primera ronda sin historial. Jugada sin predicción.")
-                winning_number = crlm.start()
-                crlm.calculate_winning_amount(winning_number=winning_number)
-                continue
+            if AUTORUN:
+                # Simula ENTER
+                key = b'\r'
+                COUNTER_AUTO += 1
+                await asyncio.sleep(PAUSE_AUTORUN)
+            else:
+                # Espera tecla real
+                key = await keys.get()
 
-            if TOP_METHOD == 'TOP2':
-                a_num, b_num = crlm.get_hotters(top=2)
-                a_neigh_1, a_neigh_2 = crlm.get_neighbors(a_num)
-                b_neigh_1, b_neigh_2 = crlm.get_neighbors(b_num)
+            if key == b'\r':
+                ronda_actual += 1
+                output.line(f"\n✅Ronda {ronda_actual}")
 
-                neighbors = [a_neigh_1, a_neigh_2, b_neigh_1, b_neigh_2]
-                crlm.selected_neighs = crlm.select_unique_neighbors(neighbors_list=neighbors, hotters=[a_num, b_num])
+                # -- Validar si hay historial suficiente para predecir
+                if not crlm.history:
+                    output.line("Primera ronda sin historial. Jugada sin predicción.")
+                    winning_number = await crlm.start_async()
+                    crlm.calculate_winning_amount(winning_number=winning_number)
+                    continue
 
-                print(f"🔥 Hotters seleccionados: {a_num}, {b_num}")
-                crlm.hotter_numbers = [a_num, b_num]
                 try:
-                    bets = {
-                        a_num: HOT_AMOUNT*crlm.get_multiplier(),
-                        b_num: HOT_AMOUNT*crlm.get_multiplier(),
-                        **{n: NEIGHT_AMOUNT*crlm.get_multiplier() for n in crlm.selected_neighs}
-                    }
-                    for n in crlm:
-                        if n not in bets:
-                            bets[n] = OTHER_AMOUNT*crlm.get_multiplier()
-                    crlm.put_bet(bets)
+                    plan = STRATEGY.bets(crlm)
+                    if output.enabled(FULL):
+                        output.line(f"🔥 Hotters seleccionados: {', '.join(str(n) for n in crlm.hotter_numbers)}", FULL)
+                    crlm.put_bet(plan.bets)
                 except ValueError as e:
-                    print(f"🚧 ADVERTENCIA : {e}")
-                    print(f'Te retiras con {crlm.total_amount} DOP')
+                    if SPIN_LOG is not None:
+                        # -- Registro sin tirada, igual que `run_session`: 3 = saldo insuficiente
+                        SPIN_LOG.append(0, crlm.ROUND_NUMBER, NO_SPIN, 0, crlm.total_amount, crlm.INDEX, 3)
+                    output.line(f"🚧 ADVERTENCIA : {e}", SUMMARY)
+                    output.line(f'Te retiras con {crlm.total_amount} DOP', SUMMARY)
                     crlm.show_history()
                     break
 
-            elif TOP_METHOD == 'TOP3':
-                a_num, b_num, c_num = crlm.get_hotters(top=3)
-                a_neigh_1, a_neigh_2 = crlm.get_neighbors(a_num)
-                b_neigh_1, b_neigh_2 = crlm.get_neighbors(b_num)
-                c_neigh_1, c_neigh_2 = crlm.get_neighbors(c_num)
-
-                neighbors = [
-                    a_neigh_1, a_neigh_2,
-                    b_neigh_1, b_neigh_2,
-                    c_neigh_1, c_neigh_2
-                ]
-
-                crlm.selected_neighs = crlm.select_unique_neighbors(neighbors_list=neighbors, hotters=[a_num, b_num, c_num])
-
-                print(f"🔥 Hotters seleccionados: {a_num}, {b_num}, {c_num}")
-                crlm.hotter_numbers = [a_num, b_num, c_num]
-                try:
-                    bets = {
-                        a_num: HOT_AMOUNT*crlm.get_multiplier(),
-                        b_num: HOT_AMOUNT*crlm.get_multiplier(),
-                        c_num: HOT_AMOUNT*crlm.get_multiplier(),
-                        **{n: NEIGHT_AMOUNT*crlm.get_multiplier() for n in crlm.selected_neighs}
-                    }
-                    for n in crlm:
-                        if n not in bets:
-                            bets[n] = OTHER_AMOUNT*crlm.get_multiplier()
-                    crlm.put_bet(bets)
-                except ValueError as e:
-                    print(f"🚧 ADVERTENCIA : {e}")
-                    print(f'Te retiras con {crlm.total_amount} DOP')
+                total_bet = sum(crlm.played_numbers.values())
+                winning_number = await crlm.start_async(secs_animation=ANIMATION_TIME_SECS)
+                status = crlm.calculate_winning_amount(winning_number=winning_number)
+
+                # -- ANTIMARTIGALA
+                # -- Aumenta el multiplicador si acierta
+                if USE_ANTIGALA:
+                    if status:
+                        crlm.add_multiplier()
+                else:
+                    crlm.INDEX = 0
+
+                if SPIN_LOG is not None:
+                    # -- Mismos códigos que simulation.EXIT_FLAGS: 1 = profit, 2 = sin saldo, 3 = saldo insuficiente, 5 = ESC
+                    exit_flag = 1 if crlm.has_reach_profit() else 2 if crlm.total_amount <= 0 else 0
+                    SPIN_LOG.append(0, crlm.ROUND_NUMBER, winning_number, total_bet, crlm.total_amount, crlm.INDEX, exit_flag)
+
+                # -- Profit alcanzado
+                if crlm.has_reach_profit():
+                    output.line(f'Te retiras con {crlm.total_amount} DOP', SUMMARY)
                     crlm.show_history()
                     break
-            # -- CREA  AQUI TU PROPIA ESTRATEGIA PARA TESTEAR
-            elif TOP_METHOD == 'COMMONS':
-                # -- Selecciona media ruleta y el cero, si los calientes están fuera de la mitad también los selecciona
-                a_num, b_num = crlm.get_hotters(top=2)
-                crlm.hotter_numbers = [a_num, b_num]
-                print(f"🔥 Hotters seleccionados: {a_num}, {b_num}")
-                
-                try:
-                    bets = {
-                        0:HOT_AMOUNT*crlm.get_multiplier(),
-                        1:0*crlm.get_multiplier(),
-                        2:HOT_AMOUNT*crlm.get_multiplier(),
-                        3:0*crlm.get_multiplier(),
-                        4:HOT_AMOUNT*crlm.get_multiplier(),
-                        5:0*crlm.get_multiplier(),
-                        6:HOT_AMOUNT*crlm.get_multiplier(),
-                        7:HOT_AMOUNT*crlm.get_multiplier(),
-                        8:0*crlm.get_multiplier(),
-                        9:HOT_AMOUNT*crlm.get_multiplier(),
-                        10:0*crlm.get_multiplier(),
-                        11:HOT_AMOUNT*crlm.get_multiplier(),
-                        12:0*crlm.get_multiplier(),
-                    }
-                    for n in crlm.hotter_numbers:
-                        if n not in bets:
-                            bets[n] = HOT_AMOUNT*crlm.get_multiplier()
-
-                    crlm.put_bet(bets)
-                except ValueError as e:
-                    print(f"[Error en la apuesta]: {e}")
-                    print(f'Te retiras con {crlm.total_amount} DOP')
+
+                # Verifica si el saldo se ha agotado
+                if crlm.total_amount <= 0:
+                    output.line("Saldo insuficiente. El juego ha terminado.", SUMMARY)
                     crlm.show_history()
                     break
-            else:
-                pass
 
-            winning_number = crlm.start(secs_animation=ANIMATION_TIME_SECS)
-            status = crlm.calculate_winning_amount(winning_number=winning_number)
-
-            # -- ANTIMARTIGALA
-            # -- Aumenta el multiplicador si acierta
-            if USE_ANTIGALA:
-                if status:
-                    crlm.add_multiplier()
-            else:
-                crlm.INDEX = 0
-            
-            # -- Profit alcanzado
-            if crlm.has_reach_profit():
-                print(f'Te retiras con {crlm.total_amount} DOP')
-                crlm.show_history()
-                break
-
-            # Verifica si el saldo se ha agotado
-            if crlm.total_amount <= 0:
-                print("Saldo insuficiente. El juego ha terminado.")
+            # ESCAPE Key para salir
+            if key == b'\x1b':
+                if SPIN_LOG is not None:
+                    SPIN_LOG.append(0, crlm.ROUND_NUMBER, NO_SPIN, 0, crlm.total_amount, crlm.INDEX, 5)
+                output.line(f'Te retiras con {crlm.total_amount} DOP', SUMMARY)
                 crlm.show_history()
                 break
 
-        # ESCAPE Key para salir
-        if key == b'\x1b':
-            print(f'Te retiras con {crlm.total_amount} DOP')
-            crlm.show_history()
-            break
-
 if __name__ == "__main__":
+    import argparse
+    from config import load_settings, ConfigError
+    from renderer import TerminalRenderer
+
     # -- Configurar ARGPARSE para manejar los argumentos desde la línea de comandos
     parser = argparse.ArgumentParser(description='Simulación de Ruleta')
 
-    parser.add_argument('--method', type=str, required=True, help='Estrategia de selección de números calientes (TOP2 o TOP3)')
+    parser.add_argument('--method', type=str, required=True, help='Estrategia de selección de números calientes (TOP2, TOP3, TOPk, COMMONS o modulo:Clase)')
     parser.add_argument('--hot_amount', type=int, required=True, help='Monto a apostar por cada número caliente')
     parser.add_argument('--neight_amount', type=int, required=True, help='Monto a apostar por los vecinos de los números calientes')
     parser.add_argument('--other_amount', type=int, required=True, help='Monto a apostar por los números restantes')
@@ -514,13 +479,45 @@ if __name__ == "__main__":
     parser.add_argument('--use_antigala', type=int, choices=[0, 1], required=True, help='Habilita (1) o deshabilita (0) el sistema Antimartingala')
     parser.add_argument('--autorun', type=int, choices=[0, 1], required=True, help='Ejecutar automáticamente (1) o manualmente (0)')
     parser.add_argument('--max_repeat', type=int, required=True, help='Maximo numero de jugadas en automático')
+    parser.add_argument('--radius', type=int, default=1, help='Vecinos a cada lado de los números calientes (TOPk)')
+    parser.add_argument('--neight_amounts', type=str, default=None, help='Montos por distancia del vecino separados por coma, uno por radio (opcional)')
+    parser.add_argument('--zero_amount', type=int, default=None, help='Monto para los ceros que no sean calientes ni vecinos (opcional)')
+    parser.add_argument('--log', type=str, default=None, help='Archivo binario donde registrar cada ronda (opcional)')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla para repetir exactamente una partida (opcional)')
+    parser.add_argument('--metrics', type=str, default=None, help='Archivo JSON con los tiempos por fase y contadores al terminar (opcional)')
+    parser.add_argument('--prometheus', type=str, default=None, help='Archivo de métricas en formato Prometheus, actualizado periódicamente (opcional)')
+    parser.add_argument('--metrics_interval', type=float, default=10, help='Segundos entre actualizaciones del archivo Prometheus')
+    parser.add_argument('--profile', type=str, default=None, help='Archivo .prof de cProfile con las primeras rondas (opcional)')
+    parser.add_argument('--profile_rounds', type=int, default=100, help='Rondas a perfilar con --profile')
+    parser.add_argument('--verbosity', type=str, choices=list(LEVELS), default='full', help='Detalle de la salida: quiet, summary (cada N rondas), round o full')
+    parser.add_argument('--summary_every', type=int, default=10, help='Rondas entre resúmenes con --verbosity summary')
+    # -- Valores del .env: si se indican, tienen prioridad sobre el .env y las variables de entorno
+    parser.add_argument('--numbers', type=str, default=None, help='Rueda: little, european, american o lista de números (opcional)')
+    parser.add_argument('--gale', type=str, default=None, help='Secuencia de multiplicadores separada por coma (opcional)')
+    parser.add_argument('--payed_wins', type=int, default=None, help='Pago por acierto (opcional)')
+    parser.add_argument('--display_last', type=int, default=None, help='Tiradas por bloque del historial (opcional)')
+    parser.add_argument('--initial_history_blocks', type=int, default=None, help='Bloques de historial simulados al iniciar (opcional)')
+    parser.add_argument('--animation_time', type=float, default=None, help='Segundos de la animación (opcional)')
+    parser.add_argument('--pause_autorun_time', type=float, default=None, help='Segundos entre rondas automáticas (opcional)')
+    parser.add_argument('--animation_fps', type=int, default=None, help='Cuadros por segundo de la animación (opcional)')
+    parser.add_argument('--history_capacity', type=int, default=None, help='Tiradas que conserva el historial (opcional)')
 
     args = parser.parse_args()
 
-    os.system('cls')
-
-    output = cfonts.render('ROULETTE', colors=['red', 'yellow'], align='center')
-    print(output)
+    try:
+        SETTINGS = load_settings(vars(args))
+    except ConfigError as e:
+        parser.error(str(e))
+
+    OUTPUT = Output(level=args.verbosity, summary_every=args.summary_every)
+    WHEEL = SETTINGS.wheel
+    # -- Sin salida por ronda no se anima (ni se precalculan los cuadros)
+    if OUTPUT.enabled(ROUND):
+        renderer = TerminalRenderer(WHEEL, fps=SETTINGS.animation_fps)
+        renderer.clear()
+        OUTPUT.line(renderer.title, SUMMARY)
+    else:
+        renderer = NullRenderer()
 
     TOP_METHOD = args.method
     HOT_AMOUNT = args.hot_amount
@@ -531,38 +528,64 @@ if __name__ == "__main__":
     USE_ANTIGALA = bool(args.use_antigala)
     AUTORUN = bool(args.autorun)
     MAX_REPEAT = args.max_repeat
+    RADIUS = args.radius
+    SPIN_LOG = None
+    if args.log:
+        from spinlog import SpinLogWriter
+        SPIN_LOG = SpinLogWriter(args.log)
 
     # -- Tiempo de visualizacion de animacion
-    ANIMATION_TIME_SECS = int(os.getenv('animation_time'))
+    ANIMATION_TIME_SECS = SETTINGS.animation_time
     # -- Control de autoincremento
-    COUNTER_AUTO = int(os.getenv('counter_auto'))
+    COUNTER_AUTO = SETTINGS.counter_auto
     # -- Simular N rondas de historial para iniciar
-    INITIAL_HISTORY_BLOCKS = int(os.getenv('initial_history_blocks'))
+    INITIAL_HISTORY_BLOCKS = SETTINGS.initial_history_blocks
     # -- Pausa entre automatizacion de autorun
-    PAUSE_AUTORUN = int(os.getenv('pause_autorun_time'))
-
-    if TOP_METHOD == 'TOP2':
-        total_amount = 160 * RONDAS_SOPORTADAS
-    elif TOP_METHOD == 'TOP3':
-        total_amount = 240 * RONDAS_SOPORTADAS
-    elif TOP_METHOD == 'COMMONS':
-        total_amount = 290 * RONDAS_SOPORTADAS
-    else:
-        raise ValueError('El top indicado no es valido')
-
-    crlm = CircleRouletteLittleMachine(numbers=[int(x) for x in os.getenv('numbers').replace(' ','').split(',')],
-                                       pay_for=int(os.getenv('payed_wins')),
-                                       history_size=int(os.getenv('display_last')),
-                                       total_amount=total_amount)
+    PAUSE_AUTORUN = SETTINGS.pause_autorun_time
+
+    NEIGHT_AMOUNTS = [int(x) for x in args.neight_amounts.replace(' ', '').split(',')] if args.neight_amounts else None
+    STRATEGY = get_strategy(TOP_METHOD, HOT_AMOUNT, NEIGHT_AMOUNT, OTHER_AMOUNT, radius=RADIUS,
+                            neight_amounts=NEIGHT_AMOUNTS, zero_amount=args.zero_amount)
+    total_amount = STRATEGY.required_wallet(RONDAS_SOPORTADAS)
+
+    RNG = RandomStreams(args.seed)
+
+    crlm = CircleRouletteLittleMachine(numbers=WHEEL,
+                                       pay_for=SETTINGS.payed_wins,
+                                       history_size=SETTINGS.display_last,
+                                       total_amount=total_amount,
+                                       gale=list(SETTINGS.gale),
+                                       renderer=renderer,
+                                       output=OUTPUT,
+                                       rng=RNG,
+                                       history_capacity=SETTINGS.history_capacity)
     crlm.INITIAL_WALLET = total_amount
     CircleRouletteLittleMachine.PROFIT_OUT = PROFIT_OUT
     crlm.initialize_history(INITIAL_HISTORY_BLOCKS=INITIAL_HISTORY_BLOCKS)
+
+    METRICS = None
+    if args.metrics or args.prometheus or args.profile:
+        from instrumentation import Metrics
+        METRICS = Metrics(prometheus=args.prometheus, interval=args.metrics_interval,
+                          profile=args.profile, profile_rounds=args.profile_rounds)
+        METRICS.instrument(crlm, STRATEGY)
     
-    print(f"💼 Cartera Requerida: {crlm.total_amount} DOP")
-    print("🎉 ¡Prepárate para girar la ruleta! 🎉")
-    print("⭐ Apuesta sabiamente y alcanza el máximo profit. ⭐")
-    print("💼 Revisa tu saldo y ajusta tus apuestas. 💰")
-    print("⚙️ Configura tus estrategias para maximizar las ganancias. 🎯")
-    input(f"\n🎰 Presiona ENTER para iniciar 🎰")
-
-    main(crlm)
\ No newline at end of file
+    OUTPUT.line(f"💼 Cartera Requerida: {crlm.total_amount} DOP", SUMMARY)
+    OUTPUT.line(f"🎲 Semilla: {RNG.seed}", SUMMARY)
+    OUTPUT.line("🎉 ¡Prepárate para girar la ruleta! 🎉", SUMMARY)
+    OUTPUT.line("⭐ Apuesta sabiamente y alcanza el máximo profit. ⭐", SUMMARY)
+    OUTPUT.line("💼 Revisa tu saldo y ajusta tus apuestas. 💰", SUMMARY)
+    OUTPUT.line("⚙️ Configura tus estrategias para maximizar las ganancias. 🎯", SUMMARY)
+    # -- En modo silencioso no se espera la tecla de inicio
+    if OUTPUT.enabled(SUMMARY):
+        OUTPUT.prompt(f"\n🎰 Presiona ENTER para iniciar 🎰", SUMMARY)
+        input()
+
+    try:
+        main(crlm)
+    finally:
+        if SPIN_LOG is not None:
+            SPIN_LOG.close()
+        if METRICS is not None:
+            METRICS.close(summary=args.metrics)
+        OUTPUT.flush()
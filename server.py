@@ -0,0 +1,666 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'server.py'
+__description__ = '''Servidor de varias mesas en un solo proceso con API HTTP/WebSocket local'''
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import sys
+import traceback
+from collections import deque
+from dataclasses import asdict, fields
+
+from rng import RandomStreams
+from strategies import top_size
+from wheel import Wheel
+from simulation import SessionConfig, create_machine, EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT, EXIT_MAX_ROUNDS
+
+# -- Segundos entre ticks: todas las tiradas pedidas se resuelven juntas en cada tick
+TICK = 0.01
+
+# -- Mesas que se juegan seguidas antes de ceder el loop a las conexiones
+SLICE = 64
+
+# -- Mensajes pendientes por suscriptor; si se llena se descartan los más viejos
+STREAM_BUFFER = 1024
+
+# -- Tamaño máximo del payload de un frame WebSocket recibido (el cliente solo envía control)
+MAX_FRAME = 1 << 16
+
+# -- Duraciones de tick que se conservan para las estadísticas
+TICK_SAMPLES = 1000
+
+# -- Campos de la configuración que acepta la creación de una mesa
+CONFIG_FIELDS = {f.name for f in fields(SessionConfig)}
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           409: 'Conflict', 500: 'Internal Server Error'}
+
+# -- Fin de la sesión de una mesa cuya ronda falló (no vuelve a jugar sola)
+EXIT_ERROR = 'error'
+
+class TableClosed(Exception):
+    '''
+    La sesión de la mesa terminó y no acepta apuestas ni tiradas
+    '''
+
+class TableNotFound(LookupError):
+    '''
+    No existe una mesa con ese id
+    '''
+
+def _integer(minimum:int, optional:bool=False):
+    def check(value) -> None:
+        if value is None and optional:
+            return
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError('debe ser un número entero')
+        if value < minimum:
+            raise ValueError(f'debe ser un entero mayor o igual a {minimum}')
+    return check
+
+def _integers(minimum:int, optional:bool=False):
+    number = _integer(minimum)
+    def check(value) -> None:
+        if value is None and optional:
+            return
+        if not isinstance(value, list) or not value:
+            raise ValueError('debe ser una lista no vacía de enteros')
+        for x in value:
+            number(x)
+    return check
+
+def _number(value) -> None:
+    if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+        raise ValueError('debe ser un número')
+
+def _type(*types):
+    def check(value) -> None:
+        if not isinstance(value, types):
+            raise ValueError(f"debe ser de tipo {' o '.join(t.__name__ for t in types)}")
+    return check
+
+# -- Validación de cada campo de la configuración recibida por la API (tipos y rangos;
+# -- las reglas de la rueda y de la frecuencia las valida la propia máquina al crear la mesa)
+CONFIG_CHECKS = {
+    'method': _type(str),
+    'hot_amount': _integer(0),
+    'neight_amount': _integer(0),
+    'other_amount': _integer(0),
+    'radius': _integer(1),
+    'neight_amounts': _integers(0, optional=True),
+    'zero_amount': _integer(0, optional=True),
+    'rondas_soportadas': _integer(1),
+    'profit_out': _integer(1),
+    'use_antigala': _type(bool),
+    'max_rounds': _integer(1, optional=True),
+    'gale': _integers(1),
+    'numbers': _type(str, list),
+    'pay_for': _integer(1),
+    'history_size': _integer(1),
+    'initial_history_blocks': _integer(0),
+    'frequency_window': _integer(1, optional=True),
+    'frequency_decay': _number,
+    'history_capacity': _integer(1),
+}
+
+def parse_config(data:dict) -> SessionConfig:
+    '''
+    Configuración de una mesa desde el cuerpo de la petición. Lanza ValueError
+    con todos los campos inválidos.
+    '''
+    errors = []
+    for name, value in data.items():
+        if name in CONFIG_CHECKS:
+            try:
+                CONFIG_CHECKS[name](value)
+            except ValueError as e:
+                errors.append(f"'{name}' = {value!r}: {e}")
+    if errors:
+        raise ValueError('Configuración inválida: ' + '; '.join(errors))
+    config = SessionConfig(**{k: v for k, v in data.items() if k in CONFIG_CHECKS})
+    top = top_size(config.method)
+    if top is not None:
+        size = len(Wheel.from_setting(config.numbers))
+        if top > size:
+            raise ValueError(f"Configuración inválida: 'method' = {config.method!r}: la rueda solo tiene {size} casillas")
+    return config
+
+class Table:
+    '''
+    Una mesa: su propia máquina (fuera del singleton), su estrategia, sus
+    flujos de aleatoriedad y sus suscriptores. Ninguna mesa comparte estado.
+    '''
+
+    def __init__(self, table_id:str, config:SessionConfig, rng:RandomStreams, auto:bool=False):
+        self.id = table_id
+        self.config = config
+        self.strategy = config.strategy()
+        self.auto = auto
+        # -- Cada sesión de la mesa usa un proveedor derivado de `rng`
+        self.rng = rng
+        self.session = 0
+        self.machine = None
+        self.exit_reason = None
+        self.pending = False
+        self.waiters = []
+        self.subscribers = set()
+        self.reset()
+
+    def reset(self) -> None:
+        '''
+        Empieza una sesión nueva con la cartera inicial de la configuración
+        '''
+        self.session += 1
+        self.machine = create_machine(self.config, rng=self.rng.split(1)[0])
+        self.machine.played_numbers = {}
+        self.exit_reason = None
+
+    def place_bet(self, bets:dict=None) -> None:
+        '''
+        Apuesta los montos indicados ({número: monto}) o, sin montos, el plan de la estrategia
+        '''
+        if self.exit_reason is not None:
+            raise TableClosed(f'La sesión terminó ({self.exit_reason})')
+        if bets is None:
+            bets = self.strategy.bets(self.machine).bets
+        elif not isinstance(bets, dict):
+            raise ValueError(f"'bets' = {bets!r}: debe ser un objeto {{número: monto}}")
+        else:
+            bets = {int(number): int(amount) for number, amount in bets.items()}
+            for number, amount in bets.items():
+                if number not in self.machine.wheel.numbers:
+                    raise ValueError(f'El número {number} no está en la rueda')
+                if amount < 0:
+                    raise ValueError(f'Monto inválido para {number}: {amount}')
+        self.machine.put_bet(bets)
+
+    def play(self) -> dict:
+        '''
+        Juega una ronda con las mismas reglas que `run_session`; sin apuestas
+        previas se juega el plan de la estrategia. Retorna el resultado.
+        '''
+        crlm = self.machine
+        config = self.config
+        if not crlm.played_numbers:
+            try:
+                self.place_bet()
+            except ValueError:
+                self.exit_reason = EXIT_INSUFFICIENT
+                return self.result(None, False, 0, 0)
+
+        total_bet = sum(crlm.played_numbers.values())
+        crlm.confirm_bet()
+        crlm.ROUND_NUMBER += 1
+        winning_number = crlm.spin()
+        status, amount = crlm.settle_bet(winning_number)
+        crlm.played_numbers = {}
+
+        # -- ANTIMARTIGALA
+        if config.use_antigala:
+            if status:
+                crlm.add_multiplier()
+        else:
+            crlm.INDEX = 0
+
+        if crlm.profit >= config.profit_out:
+            self.exit_reason = EXIT_PROFIT
+        elif crlm.total_amount <= 0:
+            self.exit_reason = EXIT_BROKE
+        elif config.max_rounds is not None and crlm.ROUND_NUMBER >= config.max_rounds:
+            self.exit_reason = EXIT_MAX_ROUNDS
+        return self.result(winning_number, status, amount, total_bet)
+
+    def result(self, winning_number:int, status:bool, amount:int, total_bet:int) -> dict:
+        crlm = self.machine
+        return {
+            'table': self.id,
+            'session': self.session,
+            'round': crlm.ROUND_NUMBER,
+            'number': winning_number,
+            'hit': status,
+            'amount': amount,
+            'total_bet': total_bet,
+            'wallet': crlm.total_amount,
+            'profit': crlm.profit,
+            'index': crlm.INDEX,
+            'exit_reason': self.exit_reason,
+        }
+
+    def state(self) -> dict:
+        crlm = self.machine
+        return {
+            'table': self.id,
+            'session': self.session,
+            'round': crlm.ROUND_NUMBER,
+            'wallet': crlm.total_amount,
+            'initial_wallet': crlm.INITIAL_WALLET,
+            'profit': crlm.profit,
+            'index': crlm.INDEX,
+            'multiplier': crlm.get_multiplier(),
+            'bets': {str(number): amount for number, amount in sorted(crlm.played_numbers.items())},
+            'history': crlm.history.last(crlm.history_size),
+            'exit_reason': self.exit_reason,
+            'auto': self.auto,
+            'config': asdict(self.config),
+        }
+
+class TableManager:
+    '''
+    Administra las mesas y el loop de ticks. Las tiradas pedidas (y las de las
+    mesas automáticas) se acumulan y se resuelven todas en el siguiente tick;
+    cada suscriptor recibe los resultados del tick en una sola escritura.
+    '''
+
+    def __init__(self, seed=None, tick:float=TICK):
+        self.rng = RandomStreams(seed)
+        self.tick = tick
+        self.tables = {}
+        self.next_id = 1
+        # -- Mesas con tirada pedida para el próximo tick
+        self.pending = []
+        # -- Suscriptores de todas las mesas
+        self.subscribers = set()
+        self.spins = 0
+        self.ticks = 0
+        self.durations = deque(maxlen=TICK_SAMPLES)
+        self.started = None
+
+    def create(self, config:SessionConfig, auto:bool=False, seed=None) -> Table:
+        '''
+        Crea una mesa; con `seed` sus sesiones se repiten exactamente. La mesa
+        solo se registra si su máquina, su estrategia y su estado se construyen
+        sin errores (una configuración inválida lanza ValueError).
+        '''
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+            raise ValueError(f"'seed' = {seed!r}: debe ser un número entero")
+        rng = RandomStreams(seed) if seed is not None else self.rng.split(1)[0]
+        try:
+            table = Table(str(self.next_id), config, rng, auto=auto)
+            if table.machine.INITIAL_WALLET <= 0:
+                raise ValueError('la cartera inicial debe ser positiva (revise los montos)')
+            table.state()
+        except Exception as e:
+            raise ValueError(f'Configuración inválida: {e}') from e
+        self.next_id += 1
+        self.tables[table.id] = table
+        return table
+
+    def get(self, table_id:str) -> Table:
+        try:
+            return self.tables[table_id]
+        except KeyError:
+            raise TableNotFound(f'No existe la mesa {table_id}') from None
+
+    def close(self, table_id:str) -> None:
+        table = self.tables.pop(table_id, None)
+        if table is None:
+            raise TableNotFound(f'No existe la mesa {table_id}')
+        for waiter in table.waiters:
+            if not waiter.done():
+                waiter.set_exception(TableClosed('La mesa fue cerrada'))
+        table.waiters.clear()
+
+    def request_spin(self, table:Table) -> asyncio.Future:
+        '''
+        Pide una tirada para el próximo tick. Las peticiones de una misma mesa
+        dentro del mismo tick comparten el resultado.
+        '''
+        if table.exit_reason is not None and not table.auto:
+            raise TableClosed(f'La sesión terminó ({table.exit_reason})')
+        waiter = asyncio.get_running_loop().create_future()
+        table.waiters.append(waiter)
+        if not table.pending:
+            table.pending = True
+            self.pending.append(table)
+        return waiter
+
+    def collect(self) -> list:
+        '''
+        Mesas que juegan en este tick: las que pidieron tirada y las automáticas
+        '''
+        pending, self.pending = self.pending, []
+        auto = [table for table in self.tables.values() if table.auto and not table.pending]
+        for table in pending:
+            table.pending = False
+        return pending + auto
+
+    def play(self, tables:list) -> list:
+        '''
+        Juega una ronda en cada mesa, responde a quienes esperaban la tirada y
+        publica cada resultado a los suscriptores de la mesa. Si la ronda de una
+        mesa falla se registra el error, la mesa deja de jugar y el tick sigue
+        con las demás.
+        '''
+        results = []
+        for table in tables:
+            if table.id not in self.tables:
+                continue
+            try:
+                if table.exit_reason is not None:
+                    table.reset()
+                result = table.play()
+            except Exception as e:
+                print(f'Error en la mesa {table.id}: {e!r}', file=sys.stderr)
+                traceback.print_exc()
+                table.auto = False
+                table.exit_reason = EXIT_ERROR
+                for waiter in table.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(RuntimeError(f'Error en la mesa {table.id}: {e}'))
+                table.waiters.clear()
+                continue
+            if result['number'] is not None:
+                self.spins += 1
+            results.append(result)
+            for waiter in table.waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+            table.waiters.clear()
+            if table.subscribers:
+                message = json.dumps(result)
+                for queue in table.subscribers:
+                    publish(queue, message)
+        return results
+
+    def broadcast(self, results:list) -> None:
+        '''
+        Publica los resultados del tick, en un solo mensaje, a los suscriptores de todas las mesas
+        '''
+        if results and self.subscribers:
+            message = json.dumps(results)
+            for queue in self.subscribers:
+                publish(queue, message)
+        self.ticks += 1
+
+    def step(self) -> list:
+        '''
+        Resuelve un tick completo de una vez
+        '''
+        results = self.play(self.collect())
+        self.broadcast(results)
+        return results
+
+    async def run(self) -> None:
+        '''
+        Loop de ticks a intervalo fijo; si un tick se atrasa no se acumulan ticks perdidos.
+        Las mesas se juegan en tramos de `SLICE` y entre tramos se atienden las
+        peticiones, así un tick con muchas mesas no retrasa a las demás conexiones.
+        '''
+        loop = asyncio.get_running_loop()
+        self.started = loop.time()
+        next_tick = self.started
+        while True:
+            next_tick += self.tick
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_tick = loop.time()
+            begin = loop.time()
+            tables = self.collect()
+            results = []
+            for start in range(0, len(tables), SLICE):
+                if start:
+                    await asyncio.sleep(0)
+                results.extend(self.play(tables[start:start + SLICE]))
+            self.broadcast(results)
+            self.durations.append(loop.time() - begin)
+
+    def stats(self) -> dict:
+        durations = sorted(self.durations)
+        elapsed = asyncio.get_running_loop().time() - self.started if self.started is not None else 0
+        return {
+            'tables': len(self.tables),
+            'spins': self.spins,
+            'ticks': self.ticks,
+            'spins_per_sec': self.spins / elapsed if elapsed else 0.0,
+            'tick_ms_p50': 1000 * durations[len(durations) // 2] if durations else 0.0,
+            'tick_ms_p99': 1000 * durations[int(len(durations) * 0.99)] if durations else 0.0,
+            'tick_ms_max': 1000 * durations[-1] if durations else 0.0,
+        }
+
+def publish(queue:asyncio.Queue, message:str) -> None:
+    '''
+    Encola un mensaje sin bloquear el tick; un suscriptor lento pierde los más viejos
+    '''
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+def websocket_frame(payload:bytes, opcode:int=0x1) -> bytes:
+    '''
+    Frame WebSocket del servidor (final, sin máscara)
+    '''
+    size = len(payload)
+    if size < 126:
+        header = bytes((0x80 | opcode, size))
+    elif size < 1 << 16:
+        header = bytes((0x80 | opcode, 126)) + size.to_bytes(2, 'big')
+    else:
+        header = bytes((0x80 | opcode, 127)) + size.to_bytes(8, 'big')
+    return header + payload
+
+async def read_frame(reader:asyncio.StreamReader) -> tuple:
+    '''
+    Lee un frame del cliente (siempre enmascarado). Retorna (opcode, payload).
+    Lanza ValueError si el payload supera `MAX_FRAME`.
+    '''
+    first, second = await reader.readexactly(2)
+    size = second & 0x7f
+    if size == 126:
+        size = int.from_bytes(await reader.readexactly(2), 'big')
+    elif size == 127:
+        size = int.from_bytes(await reader.readexactly(8), 'big')
+    if size > MAX_FRAME:
+        raise ValueError(f'Frame de {size} bytes (máximo {MAX_FRAME})')
+    mask = await reader.readexactly(4) if second & 0x80 else b'\x00' * 4
+    data = await reader.readexactly(size)
+    # -- Desenmascarar de una vez con enteros en lugar de byte a byte
+    key = int.from_bytes((mask * (size // 4 + 1))[:size], 'big')
+    payload = (int.from_bytes(data, 'big') ^ key).to_bytes(size, 'big')
+    return first & 0x0f, payload
+
+class RouletteServer:
+    '''
+    API HTTP/1.1 y WebSocket sobre asyncio (solo biblioteca estándar):
+
+    - GET    /stats                  estadísticas del servidor
+    - GET    /tables                 estado de todas las mesas
+    - POST   /tables                 crea una mesa (campos de SessionConfig, `auto` y `seed`)
+    - GET    /tables/{id}            estado de una mesa
+    - DELETE /tables/{id}            cierra una mesa
+    - POST   /tables/{id}/bets       apuesta {"bets": {número: monto}} o, sin cuerpo, el plan de la estrategia
+    - POST   /tables/{id}/spin       espera al próximo tick y retorna el resultado
+    - POST   /tables/{id}/reset      empieza una sesión nueva en la mesa
+    - GET    /tables/{id}/stream     WebSocket con cada resultado de la mesa
+    - GET    /stream                 WebSocket con los resultados de cada tick de todas las mesas
+    '''
+
+    def __init__(self, manager:TableManager):
+        self.manager = manager
+
+    async def handle(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        '''
+        Atiende una conexión; mantiene la conexión abierta entre peticiones (keep-alive)
+        '''
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, _ = line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                path = target.split('?', 1)[0].strip('/').split('/')
+
+                if headers.get('upgrade', '').lower() == 'websocket':
+                    await self.stream(path, headers, reader, writer)
+                    break
+
+                status, payload = await self.dispatch(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(b'HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n'
+                             % (status, REASONS[status].encode(), len(data)) + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method:str, path:list, body:bytes) -> tuple:
+        '''
+        Ejecuta una petición. Retorna (código HTTP, cuerpo JSON)
+        '''
+        manager = self.manager
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError('El cuerpo debe ser un objeto JSON')
+            if path == ['stats'] and method == 'GET':
+                return 200, manager.stats()
+            if path[0] != 'tables':
+                return 404, {'error': 'Ruta desconocida'}
+            if len(path) == 1:
+                if method == 'GET':
+                    return 200, [table.state() for table in manager.tables.values()]
+                if method == 'POST':
+                    unknown = set(data) - CONFIG_FIELDS - {'auto', 'seed'}
+                    if unknown:
+                        raise ValueError(f'Campos desconocidos: {", ".join(sorted(unknown))}')
+                    config = parse_config(data)
+                    table = manager.create(config, auto=bool(data.get('auto', False)), seed=data.get('seed'))
+                    return 201, table.state()
+                return 405, {'error': 'Método no permitido'}
+
+            table = manager.get(path[1])
+            action = path[2] if len(path) > 2 else None
+            if action is None and method == 'GET':
+                return 200, table.state()
+            if action is None and method == 'DELETE':
+                manager.close(table.id)
+                return 200, {'table': table.id, 'closed': True}
+            if action == 'bets' and method == 'POST':
+                table.place_bet(data.get('bets'))
+                return 200, table.state()
+            if action == 'reset' and method == 'POST':
+                table.reset()
+                return 200, table.state()
+            if action == 'spin' and method == 'POST':
+                return 200, await manager.request_spin(table)
+            return 405, {'error': 'Método no permitido'}
+        except TableNotFound as e:
+            return 404, {'error': str(e)}
+        except TableClosed as e:
+            return 409, {'error': str(e)}
+        except (ValueError, TypeError) as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            traceback.print_exc()
+            return 500, {'error': f'Error interno: {e}'}
+
+    async def stream(self, path:list, headers:dict, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        '''
+        Handshake WebSocket y envío de resultados hasta que el cliente cierre
+        '''
+        if path == ['stream']:
+            targets = self.manager.subscribers
+        elif len(path) == 3 and path[0] == 'tables' and path[2] == 'stream' and path[1] in self.manager.tables:
+            targets = self.manager.tables[path[1]].subscribers
+        else:
+            writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n')
+            await writer.drain()
+            return
+        if not headers.get('sec-websocket-key'):
+            writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+            await writer.drain()
+            return
+
+        accept = base64.b64encode(hashlib.sha1((headers['sec-websocket-key'] + WEBSOCKET_GUID).encode()).digest())
+        writer.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                     b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        await writer.drain()
+
+        queue = asyncio.Queue(maxsize=STREAM_BUFFER)
+        targets.add(queue)
+        sender = asyncio.create_task(self.send(queue, writer))
+        try:
+            while True:
+                try:
+                    opcode, payload = await read_frame(reader)
+                except ValueError:
+                    # -- 1009: mensaje demasiado grande
+                    writer.write(websocket_frame((1009).to_bytes(2, 'big'), 0x8))
+                    break
+                if opcode == 0x8:
+                    writer.write(websocket_frame(payload[:2], 0x8))
+                    break
+                if opcode == 0x9:
+                    writer.write(websocket_frame(payload, 0xa))
+        finally:
+            targets.discard(queue)
+            sender.cancel()
+
+    async def send(self, queue:asyncio.Queue, writer:asyncio.StreamWriter) -> None:
+        '''
+        Escribe los mensajes encolados; los de un mismo tick salen en una sola escritura
+        '''
+        while True:
+            frames = [websocket_frame((await queue.get()).encode())]
+            while not queue.empty():
+                frames.append(websocket_frame(queue.get_nowait().encode()))
+            writer.write(b''.join(frames))
+            await writer.drain()
+
+async def serve(host:str, port:int, manager:TableManager, report:float=0) -> None:
+    server = await asyncio.start_server(RouletteServer(manager).handle, host, port)
+    ticker = asyncio.create_task(manager.run())
+    print(f'🎰 Servidor en http://{host}:{port} - {len(manager.tables)} mesas - tick {manager.tick * 1000:.0f} ms')
+    try:
+        async with server:
+            while report:
+                await asyncio.sleep(report)
+                stats = manager.stats()
+                print(f"\t {stats['spins_per_sec']:.0f} tiradas/s - tick p99 {stats['tick_ms_p99']:.2f} ms"
+                      f" - max {stats['tick_ms_max']:.2f} ms - {stats['tables']} mesas")
+            await server.serve_forever()
+    finally:
+        ticker.cancel()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Servidor local de varias mesas de ruleta')
+
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Dirección donde escuchar')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto donde escuchar')
+    parser.add_argument('--tick', type=float, default=TICK, help='Segundos entre ticks')
+    parser.add_argument('--seed', type=int, default=None, help='Semilla de las mesas (opcional)')
+    parser.add_argument('--tables', type=int, default=0, help='Mesas automáticas a crear al iniciar')
+    parser.add_argument('--method', type=str, default='TOP2', help='Estrategia de las mesas automáticas')
+    parser.add_argument('--report', type=float, default=0, help='Segundos entre reportes de rendimiento (0 = sin reporte)')
+
+    args = parser.parse_args()
+
+    manager = TableManager(seed=args.seed, tick=args.tick)
+    for _ in range(args.tables):
+        manager.create(SessionConfig(method=args.method), auto=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, manager, report=args.report))
+    except KeyboardInterrupt:
+        pass
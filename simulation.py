@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'simulation.py'
+__description__ = '''Simulación de sesiones completas sin animación, pausas ni teclado'''
+
+from dataclasses import dataclass, field
+
+from history import DEFAULT_CAPACITY
+from rng import RandomStreams
+from roulette import CircleRouletteLittleMachine
+from strategies import get_strategy, Strategy
+from wheel import Wheel
+
+# -- `number` de un registro sin tirada (mismo valor que spinlog.NO_SPIN)
+NO_SPIN = 255
+
+# -- Motivos de salida de una sesión
+EXIT_PROFIT = 'profit'
+EXIT_BROKE = 'broke'
+EXIT_INSUFFICIENT = 'insufficient'
+EXIT_MAX_ROUNDS = 'max_rounds'
+# -- Solo en el juego interactivo: el jugador salió con ESC
+EXIT_QUIT = 'quit'
+
+# -- Código numérico de cada motivo (0 = la sesión sigue), usado en arreglos y registros binarios
+EXIT_FLAGS = {EXIT_PROFIT: 1, EXIT_BROKE: 2, EXIT_INSUFFICIENT: 3, EXIT_MAX_ROUNDS: 4, EXIT_QUIT: 5}
+
+@dataclass
+class SessionConfig:
+    '''
+    Configuración de una sesión (equivalente a los argumentos del CLI y al .env)
+    '''
+    method: str = 'TOP2'
+    hot_amount: int = 40
+    neight_amount: int = 20
+    other_amount: int = 10
+    radius: int = 1
+    # -- Monto por distancia del vecino (1..radius) y monto de los ceros sin otro rol (opcionales)
+    neight_amounts: list = None
+    zero_amount: int = None
+    rondas_soportadas: int = 20
+    profit_out: int = 33
+    use_antigala: bool = False
+    max_rounds: int = 100
+    gale: list = field(default_factory=lambda: [1, 2, 4])
+    # -- Lista de números en orden de la rueda o nombre de una rueda incorporada (little, european, american)
+    numbers: list = field(default_factory=lambda: [0, 5, 12, 3, 10, 1, 8, 9, 2, 7, 6, 11, 4])
+    pay_for: int = 12
+    history_size: int = 7
+    initial_history_blocks: int = 5
+    frequency_window: int = None
+    frequency_decay: float = None
+    # -- Tiradas que conserva el historial de la máquina (memoria constante)
+    history_capacity: int = DEFAULT_CAPACITY
+
+    def strategy(self) -> Strategy:
+        return get_strategy(self.method, self.hot_amount, self.neight_amount, self.other_amount, radius=self.radius,
+                            neight_amounts=self.neight_amounts, zero_amount=self.zero_amount)
+
+    @property
+    def initial_wallet(self) -> int:
+        return self.strategy().required_wallet(self.rondas_soportadas)
+
+@dataclass
+class SessionResult:
+    '''
+    Resultado de una sesión simulada
+    '''
+    rounds: int
+    final_wallet: int
+    initial_wallet: int
+    max_drawdown: int
+    exit_reason: str
+
+    @property
+    def profit(self) -> int:
+        return self.final_wallet - self.initial_wallet
+
+def create_machine(config:SessionConfig, rng:RandomStreams=None) -> CircleRouletteLittleMachine:
+    '''
+    Crea una máquina independiente (fuera del singleton) lista para jugar
+    '''
+    machine_cls = CircleRouletteLittleMachine.__wrapped__
+    initial_wallet = config.initial_wallet
+    crlm = machine_cls(numbers=Wheel.from_setting(config.numbers),
+                       pay_for=config.pay_for,
+                       history_size=config.history_size,
+                       total_amount=initial_wallet,
+                       gale=list(config.gale),
+                       frequency_window=config.frequency_window,
+                       frequency_decay=config.frequency_decay,
+                       history_capacity=config.history_capacity,
+                       rng=rng if rng is not None else RandomStreams())
+    crlm.INITIAL_WALLET = initial_wallet
+    crlm.verbose = False
+    crlm.initialize_history(INITIAL_HISTORY_BLOCKS=config.initial_history_blocks)
+    return crlm
+
+def run_session(config:SessionConfig, seed=None, log=None, session_id:int=0, metrics=None) -> SessionResult:
+    '''
+    Juega una sesión completa sin I/O, con las mismas salidas que `main`:
+    profit alcanzado, saldo agotado, saldo insuficiente o límite de rondas.
+    Si se indica `log` (un `SpinLogWriter`), registra cada ronda.
+    Si se indica `metrics` (un `instrumentation.Metrics`), mide cada fase.
+    `seed` puede ser un entero, una `SeedSequence` o un `RandomStreams`.
+    '''
+    rng = seed if isinstance(seed, RandomStreams) else RandomStreams(seed)
+    crlm = create_machine(config, rng=rng)
+    strategy = config.strategy()
+    if metrics is not None:
+        metrics.instrument(crlm, strategy)
+    peak = crlm.total_amount
+    max_drawdown = 0
+    exit_reason = None
+
+    while exit_reason is None:
+        if config.max_rounds is not None and crlm.ROUND_NUMBER >= config.max_rounds:
+            exit_reason = EXIT_MAX_ROUNDS
+            break
+
+        try:
+            crlm.put_bet(strategy.bets(crlm).bets)
+        except ValueError:
+            exit_reason = EXIT_INSUFFICIENT
+            if log is not None:
+                log.append(session_id, crlm.ROUND_NUMBER, NO_SPIN, 0, crlm.total_amount, crlm.INDEX, EXIT_FLAGS[exit_reason])
+            break
+
+        total_bet = sum(crlm.played_numbers.values())
+        crlm.confirm_bet()
+        crlm.ROUND_NUMBER += 1
+        winning_number = crlm.spin()
+        status, _ = crlm.settle_bet(winning_number)
+
+        # -- ANTIMARTIGALA
+        if config.use_antigala:
+            if status:
+                crlm.add_multiplier()
+        else:
+            crlm.INDEX = 0
+
+        if crlm.total_amount > peak:
+            peak = crlm.total_amount
+        elif peak - crlm.total_amount > max_drawdown:
+            max_drawdown = peak - crlm.total_amount
+
+        if crlm.profit >= config.profit_out:
+            exit_reason = EXIT_PROFIT
+        elif crlm.total_amount <= 0:
+            exit_reason = EXIT_BROKE
+        elif config.max_rounds is not None and crlm.ROUND_NUMBER >= config.max_rounds:
+            exit_reason = EXIT_MAX_ROUNDS
+
+        if log is not None:
+            log.append(session_id, crlm.ROUND_NUMBER, winning_number, total_bet, crlm.total_amount,
+                       crlm.INDEX, EXIT_FLAGS.get(exit_reason, 0))
+
+    return SessionResult(rounds=crlm.ROUND_NUMBER,
+                         final_wallet=crlm.total_amount,
+                         initial_wallet=crlm.INITIAL_WALLET,
+                         max_drawdown=max_drawdown,
+                         exit_reason=exit_reason)
+
+def run_sessions(config:SessionConfig, sessions:int, seed:int=None, log=None, metrics=None) -> list:
+    '''
+    Juega `sessions` sesiones seguidas, cada una con flujos independientes derivados de `seed`
+    '''
+    streams = RandomStreams(seed).split(sessions)
+    return [run_session(config, seed=rng, log=log, session_id=i, metrics=metrics) for i, rng in enumerate(streams)]
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'spinlog.py'
+__description__ = '''Registro binario de tiradas (solo agregar) con lector en memoria mapeada'''
+
+import os
+import struct
+
+import numpy as np
+
+# -- Cabecera: firma, versión y tamaño del registro
+MAGIC = b'RLOG'
+VERSION = 1
+HEADER = struct.Struct('<4sHH8x')
+
+# -- Registro de ancho fijo (27 bytes, sin relleno)
+RECORD = struct.Struct('<IIqqBBB')
+RECORD_DTYPE = np.dtype([
+    ('session', '<u4'),
+    ('round', '<u4'),
+    ('total_bet', '<i8'),
+    ('wallet', '<i8'),
+    ('number', 'u1'),
+    ('index', 'u1'),
+    ('exit', 'u1'),
+])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+# -- `number` de un registro sin tirada (la sesión terminó por saldo insuficiente)
+NO_SPIN = 255
+
+# -- Registros acumulados antes de escribir un bloque al archivo
+BLOCK_RECORDS = 1 << 16
+
+class SpinLogWriter:
+    '''
+    Escribe un registro por ronda en un archivo binario de solo agregar.
+    Los registros se acumulan en memoria y se escriben en bloques grandes.
+    '''
+
+    def __init__(self, path:str, block_records:int=BLOCK_RECORDS):
+        self.path = path
+        self.block_bytes = block_records * RECORD.size
+        self.buffer = bytearray()
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size:
+            _check_header(path)
+            # -- Un registro a medias (proceso interrumpido al escribir) desalinearía todo lo
+            # -- que se agregue después: se descarta
+            partial = (size - HEADER.size) % RECORD.size
+            if partial:
+                os.truncate(path, size - partial)
+        self.file = open(path, 'ab')
+        if not size:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def append(self, session:int, round_number:int, number:int, total_bet:int, wallet:int, index:int, exit_flag:int=0) -> None:
+        self.buffer += RECORD.pack(session, round_number, total_bet, wallet, number, index, exit_flag)
+        if len(self.buffer) >= self.block_bytes:
+            self.flush()
+
+    def extend(self, session, round_number, number, total_bet, wallet, index, exit_flag) -> None:
+        '''
+        Agrega muchos registros de una vez a partir de columnas (arreglos NumPy)
+        '''
+        records = np.empty(len(session), dtype=RECORD_DTYPE)
+        records['session'] = session
+        records['round'] = round_number
+        records['number'] = number
+        records['total_bet'] = total_bet
+        records['wallet'] = wallet
+        records['index'] = index
+        records['exit'] = exit_flag
+        self.buffer += records.tobytes()
+        if len(self.buffer) >= self.block_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self) -> 'SpinLogWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def _check_header(path:str) -> None:
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f'{path} no es un registro de tiradas compatible')
+    magic, version, size = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or size != RECORD.size:
+        raise ValueError(f'{path} no es un registro de tiradas compatible')
+
+class SpinLog:
+    '''
+    Lector del registro: mapea el archivo en memoria y expone cada columna como
+    un arreglo NumPy sin copia. Solo se cargan las páginas que se leen.
+    '''
+
+    def __init__(self, path:str):
+        _check_header(path)
+        self.path = path
+        # -- Un registro incompleto al final (escritura interrumpida) se ignora
+        count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, column:str) -> np.ndarray:
+        return self.records[column]
+
+    @property
+    def columns(self) -> tuple:
+        return RECORD_DTYPE.names
+
+    def spins(self) -> np.ndarray:
+        '''
+        Registros con tirada (sin los de salida por saldo insuficiente)
+        '''
+        return self.records[self.records['number'] != NO_SPIN]
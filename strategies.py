@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'strategies.py'
+__description__ = '''Registro de estrategias y compilador de planes de apuesta con caché'''
+
+import importlib
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
+
+# -- Estrategias registradas por nombre
+STRATEGIES = {}
+
+# -- Planes compilados que se guardan por estrategia
+PLAN_CACHE_SIZE = 4096
+
+def register(cls):
+    '''
+    Registra una estrategia con su atributo `name`
+    '''
+    STRATEGIES[cls.name] = cls
+    return cls
+
+class BetPlan(NamedTuple):
+    '''
+    Plan compacto de una ronda: los números de cada rol
+    '''
+    hot: frozenset = frozenset()
+    neighbors: frozenset = frozenset()
+
+class CompiledPlan(NamedTuple):
+    '''
+    Plan listo para `put_bet`: apuestas por número, vector por casilla (orden de la rueda) y total
+    '''
+    bets: MappingProxyType
+    amounts: tuple
+    total: int
+
+class Strategy:
+    '''
+    Estrategia base. Cada ronda `plan` decide los roles a partir del estado de la
+    máquina y `bets` devuelve el plan compilado, servido desde una caché LRU
+    por (plan, índice del multiplicador).
+
+    Para crear una estrategia propia basta con heredar, definir `name`, implementar
+    `plan` y, si hace falta, `amounts`.
+
+    `neight_amounts` asigna un monto por distancia al número caliente más cercano
+    (1, 2, ... hasta `radius`) y `zero_amount` un monto propio a los ceros que no
+    tengan otro rol; sin ellos se usan NEIGHT_AMOUNT y OTHER_AMOUNT.
+    '''
+
+    name = None
+    # -- Cartera requerida por cada ronda soportada
+    wallet_per_round = 0
+    # -- Apostar OTHER_AMOUNT en todas las casillas que no tengan otro rol
+    fill_others = True
+
+    def __init__(self, hot_amount:int, neight_amount:int, other_amount:int, radius:int=1,
+                 neight_amounts:list=None, zero_amount:int=None):
+        self.hot_amount = hot_amount
+        self.neight_amount = neight_amount
+        self.other_amount = other_amount
+        self.radius = radius
+        if neight_amounts is not None and len(neight_amounts) != radius:
+            raise ValueError('Se requiere un monto de vecino por cada distancia hasta el radio')
+        self.neight_amounts = tuple(neight_amounts) if neight_amounts is not None else None
+        self.zero_amount = zero_amount
+        self._compile = lru_cache(maxsize=PLAN_CACHE_SIZE)(self._build)
+        self._wheel = None
+
+    def required_wallet(self, rondas_soportadas:int) -> int:
+        '''
+        Calcula la cartera inicial requerida para la estrategia
+        '''
+        return self.wallet_per_round * rondas_soportadas
+
+    def plan(self, crlm) -> BetPlan:
+        raise NotImplementedError
+
+    def amounts(self, plan:BetPlan, wheel) -> dict:
+        '''
+        Montos base (sin multiplicador) por número jugado
+        '''
+        bets = {n: self.hot_amount for n in plan.hot}
+        if self.neight_amounts is None:
+            bets.update({n: self.neight_amount for n in plan.neighbors if n not in bets})
+        else:
+            for n in plan.neighbors:
+                if n not in bets:
+                    bets[n] = self.neight_amounts[self._distance(n, plan.hot, wheel) - 1]
+        if self.fill_others:
+            for n in wheel:
+                if n not in bets:
+                    if self.zero_amount is not None and wheel.is_zero(n):
+                        bets[n] = self.zero_amount
+                    else:
+                        bets[n] = self.other_amount
+        return bets
+
+    def _distance(self, number:int, hot:frozenset, wheel) -> int:
+        '''
+        Distancia en la rueda al número caliente más cercano (hasta `radius`; los
+        vecinos sustituidos pueden quedar más lejos y toman el monto del último)
+        '''
+        position = wheel.position(number)
+        steps = ((position - wheel.position(h)) % wheel.size for h in hot)
+        distance = min(min(d, wheel.size - d) for d in steps)
+        return max(1, min(distance, self.radius))
+
+    def _build(self, plan:BetPlan, multiplier:int) -> CompiledPlan:
+        base = self.amounts(plan, self._wheel)
+        bets = {n: amount*multiplier for n, amount in base.items()}
+        amounts = tuple(bets.get(n, 0) for n in self._wheel)
+        return CompiledPlan(MappingProxyType(bets), amounts, sum(amounts))
+
+    def compile(self, plan:BetPlan, wheel, multiplier:int) -> CompiledPlan:
+        if wheel is not self._wheel:
+            # -- Los planes compilados dependen de la rueda
+            self._compile.cache_clear()
+            self._wheel = wheel
+        return self._compile(plan, multiplier)
+
+    def bets(self, crlm) -> CompiledPlan:
+        '''
+        Plan compilado de la ronda para la máquina indicada
+        '''
+        return self.compile(self.plan(crlm), crlm.wheel, crlm.get_multiplier())
+
+    def cache_info(self):
+        return self._compile.cache_info()
+
+class TopKStrategy(Strategy):
+    '''
+    Los `top` números más calientes y sus vecinos hasta `radius`; el resto a OTHER_AMOUNT
+    '''
+
+    # -- En TOPk se requieren 80 por cada número caliente (TOP2 = 160, TOP3 = 240)
+    wallet_per_hotter = 80
+    top = None
+
+    def __init__(self, hot_amount:int, neight_amount:int, other_amount:int, radius:int=1, top:int=None,
+                 neight_amounts:list=None, zero_amount:int=None):
+        super().__init__(hot_amount, neight_amount, other_amount, radius=radius,
+                         neight_amounts=neight_amounts, zero_amount=zero_amount)
+        if top is not None:
+            self.top = top
+        if not self.top or self.top <= 0:
+            raise ValueError('El top indicado no es valido')
+        self.name = f'TOP{self.top}'
+        self.wallet_per_round = self.wallet_per_hotter * self.top
+
+    def plan(self, crlm) -> BetPlan:
+        hotters = crlm.get_hotters(top=self.top)
+        neighbors = []
+        for n in hotters:
+            neighbors.extend(crlm.get_neighbors(n, self.radius))
+        crlm.selected_neighs = crlm.select_unique_neighbors(neighbors_list=neighbors, hotters=hotters)
+        crlm.hotter_numbers = hotters
+        return BetPlan(hot=frozenset(hotters), neighbors=frozenset(crlm.selected_neighs))
+
+@register
+class Top2Strategy(TopKStrategy):
+    name = 'TOP2'
+    top = 2
+
+@register
+class Top3Strategy(TopKStrategy):
+    name = 'TOP3'
+    top = 3
+
+# -- CREA  AQUI TU PROPIA ESTRATEGIA PARA TESTEAR
+@register
+class CommonsStrategy(Strategy):
+    '''
+    Selecciona media ruleta y el cero, si los calientes están fuera de la mitad también los selecciona
+    '''
+
+    name = 'COMMONS'
+    wallet_per_round = 290
+    fill_others = False
+    # -- Mesa fija: se juegan del 0 al 12, con HOT_AMOUNT solo en estos
+    NUMBERS = (0, 2, 4, 6, 7, 9, 11)
+    TABLE = range(0, 13)
+
+    def plan(self, crlm) -> BetPlan:
+        crlm.hotter_numbers = crlm.get_hotters(top=2)
+        return BetPlan(hot=frozenset(n for n in crlm.hotter_numbers if n not in self.TABLE))
+
+    def amounts(self, plan:BetPlan, wheel) -> dict:
+        bets = {n: (self.hot_amount if n in self.NUMBERS else 0) for n in self.TABLE if n in wheel}
+        bets.update({n: self.hot_amount for n in plan.hot})
+        return bets
+
+def load_strategy(path:str):
+    '''
+    Carga una clase de estrategia desde `modulo:Clase` (o `modulo.Clase`)
+    '''
+    module_name, _, attr = path.rpartition(':') if ':' in path else path.rpartition('.')
+    if not module_name:
+        raise ValueError(f'Ruta de estrategia invalida: {path}')
+    cls = getattr(importlib.import_module(module_name), attr)
+    if not (isinstance(cls, type) and issubclass(cls, Strategy)):
+        raise ValueError(f'{path} no es una estrategia')
+    return cls
+
+def get_strategy(method:str, hot_amount:int, neight_amount:int, other_amount:int, radius:int=1,
+                 neight_amounts:list=None, zero_amount:int=None) -> Strategy:
+    '''
+    Crea la estrategia indicada: un nombre registrado, TOPk o una ruta `modulo:Clase`.
+    La estrategia debe requerir cartera (`wallet_per_round` positivo); sin ella
+    no hay cartera inicial sobre la que calcular el profit.
+    '''
+    amounts = dict(hot_amount=hot_amount, neight_amount=neight_amount, other_amount=other_amount, radius=radius)
+    if neight_amounts is not None:
+        amounts['neight_amounts'] = neight_amounts
+    if zero_amount is not None:
+        amounts['zero_amount'] = zero_amount
+    if method in STRATEGIES:
+        strategy = STRATEGIES[method](**amounts)
+    elif method.startswith('TOP') and method[3:].isdigit():
+        strategy = TopKStrategy(top=int(method[3:]), **amounts)
+    elif ':' in method or '.' in method:
+        strategy = load_strategy(method)(**amounts)
+    else:
+        raise ValueError('El top indicado no es valido')
+    if strategy.required_wallet(1) <= 0:
+        raise ValueError(f'La estrategia {method} no requiere cartera: defina `wallet_per_round` con un valor positivo')
+    return strategy
+
+def top_size(method:str) -> int:
+    '''
+    Cantidad de hotters de una estrategia TOPk (TOP2 -> 2, TOP10 -> 10); None si no es TOPk
+    '''
+    if method.startswith('TOP') and method[3:].isdigit() and int(method[3:]) > 0:
+        return int(method[3:])
+    return None
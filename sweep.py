@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'sweep.py'
+__description__ = '''Barrido de parámetros en paralelo con reanudación'''
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+from dataclasses import asdict, fields
+from multiprocessing import Pool
+
+from simulation import SessionConfig, run_sessions, EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT, EXIT_MAX_ROUNDS
+
+def expand_grid(grid:dict, base:SessionConfig=None) -> list:
+    '''
+    Producto cartesiano de los valores del grid sobre una configuración base
+    '''
+    base = asdict(base or SessionConfig())
+    names = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        configs.append(SessionConfig(**{**base, **dict(zip(names, values))}))
+    return configs
+
+def config_key(config:SessionConfig) -> str:
+    '''
+    Clave estable de una configuración, usada para reanudar y derivar semillas
+    '''
+    return json.dumps(asdict(config), sort_keys=True, separators=(',', ':'))
+
+def task_seed(seed:int, key:str) -> int:
+    '''
+    Semilla independiente y reproducible para una combinación, sin depender del orden
+    '''
+    digest = hashlib.sha256(f'{seed}:{key}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+def summarize(results:list) -> dict:
+    '''
+    Resume un lote de `SessionResult`
+    '''
+    total = len(results)
+    summary = {'sessions': total}
+    for reason in (EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT, EXIT_MAX_ROUNDS):
+        summary[f'{reason}_rate'] = sum(r.exit_reason == reason for r in results) / total
+    summary['mean_profit'] = sum(r.profit for r in results) / total
+    summary['mean_final_wallet'] = sum(r.final_wallet for r in results) / total
+    summary['mean_rounds'] = sum(r.rounds for r in results) / total
+    summary['mean_max_drawdown'] = sum(r.max_drawdown for r in results) / total
+    return summary
+
+def run_task(task:tuple) -> dict:
+    '''
+    Ejecuta las sesiones de una combinación (se llama dentro del proceso del pool)
+    '''
+    key, params, sessions, seed, engine, measure = task
+    config = SessionConfig(**params)
+    metrics = None
+    if engine == 'vectorized':
+        from vectorized import simulate
+        results = simulate(config, sessions, seed=seed).results()
+    else:
+        if measure:
+            from instrumentation import Metrics
+            metrics = Metrics()
+        results = run_sessions(config, sessions, seed=seed, metrics=metrics)
+    row = {'key': key, 'seed': seed, 'engine': engine, 'config': params, **summarize(results)}
+    if metrics is not None:
+        row['metrics'] = metrics.snapshot()
+    return row
+
+def resume_key(key:str, sessions:int, seed:int, engine:str) -> tuple:
+    '''
+    Identifica un resultado: la configuración, las sesiones, la semilla de la
+    combinación y el motor (con otros valores los resultados no son comparables)
+    '''
+    return key, sessions, seed, engine
+
+def completed_keys(output:str) -> set:
+    '''
+    Resultados ya registrados en el archivo (claves de `resume_key`, para reanudar)
+    '''
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, encoding='utf-8') as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                done.add(resume_key(row['key'], row['sessions'], row['seed'], row.get('engine')))
+            except (ValueError, KeyError):
+                # -- Línea truncada por una interrupción: se vuelve a ejecutar
+                continue
+    return done
+
+def sweep(configs:list, output:str, sessions:int=1000, seed:int=0, workers:int=None, engine:str='scalar', metrics=None) -> int:
+    '''
+    Reparte las combinaciones en un pool de procesos y escribe cada resultado
+    en `output` (JSON lines) a medida que termina. Retorna cuántas se ejecutaron.
+    Solo se saltan las combinaciones registradas con las mismas `sessions`,
+    `seed` y `engine`.
+    Con `metrics` (un `instrumentation.Metrics`, solo motor escalar) se acumulan
+    las métricas de cada combinación a medida que terminan.
+    '''
+    done = completed_keys(output)
+    tasks = []
+    skipped = 0
+    for config in configs:
+        key = config_key(config)
+        combination_seed = task_seed(seed, key)
+        resume = resume_key(key, sessions, combination_seed, engine)
+        if resume in done:
+            skipped += 1
+            continue
+        done.add(resume)
+        tasks.append((key, asdict(config), sessions, combination_seed, engine, metrics is not None))
+
+    if skipped:
+        print(f'Se saltan {skipped} combinaciones ya registradas en {output}')
+    if not tasks:
+        return 0
+
+    with Pool(processes=workers) as pool, open(output, 'a', encoding='utf-8') as f:
+        for count, row in enumerate(pool.imap_unordered(run_task, tasks), 1):
+            snapshot = row.pop('metrics', None)
+            if snapshot is not None:
+                metrics.merge(snapshot)
+            f.write(json.dumps(row) + '\n')
+            f.flush()
+            print(f'\t [{count}/{len(tasks)}] profit {row["profit_rate"]:.2%} - {row["config"]["method"]}')
+    return len(tasks)
+
+def _int_list(value:str) -> list:
+    return [int(x) for x in value.replace(' ', '').split(',')]
+
+def _gale_list(value:str) -> list:
+    return [_int_list(x) for x in value.split(';')]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Barrido de parámetros de la Ruleta')
+
+    parser.add_argument('--method', type=str, default='TOP2', help='Estrategias separadas por coma (TOP2,TOP3,COMMONS)')
+    parser.add_argument('--hot_amount', type=str, default='40', help='Montos por número caliente separados por coma')
+    parser.add_argument('--neight_amount', type=str, default='20', help='Montos por vecino separados por coma')
+    parser.add_argument('--other_amount', type=str, default='10', help='Montos por número restante separados por coma')
+    parser.add_argument('--rondas_soportadas', type=str, default='20', help='Rondas soportadas separadas por coma')
+    parser.add_argument('--profit_out', type=str, default='33', help='Porcentajes de profit separados por coma')
+    parser.add_argument('--use_antigala', type=str, default='0', help='Valores 0/1 separados por coma')
+    parser.add_argument('--gale', type=str, default='1,2,4', help='Secuencias de gale separadas por punto y coma (1,2,4;1,1,1)')
+    parser.add_argument('--max_rounds', type=str, default='100', help='Límites de rondas separados por coma')
+    parser.add_argument('--configs', type=str, help='Archivo JSON con una lista de configuraciones (ignora el grid)')
+    parser.add_argument('--sessions', type=int, default=1000, help='Sesiones por combinación')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla base del barrido')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos del pool (por defecto todos los núcleos)')
+    parser.add_argument('--engine', type=str, choices=['scalar', 'vectorized'], default='scalar', help='Motor de simulación')
+    parser.add_argument('--output', type=str, default='sweep.jsonl', help='Archivo de resultados (JSON lines)')
+    parser.add_argument('--metrics', type=str, default=None, help='Archivo JSON con los tiempos por fase y contadores (opcional, motor escalar)')
+    parser.add_argument('--prometheus', type=str, default=None, help='Archivo de métricas en formato Prometheus, actualizado periódicamente (opcional)')
+    parser.add_argument('--metrics_interval', type=float, default=10, help='Segundos entre actualizaciones del archivo Prometheus')
+
+    args = parser.parse_args()
+
+    if args.configs:
+        allowed = {f.name for f in fields(SessionConfig)}
+        with open(args.configs, encoding='utf-8') as f:
+            configs = [SessionConfig(**{k: v for k, v in item.items() if k in allowed}) for item in json.load(f)]
+    else:
+        configs = expand_grid({
+            'method': args.method.replace(' ', '').split(','),
+            'hot_amount': _int_list(args.hot_amount),
+            'neight_amount': _int_list(args.neight_amount),
+            'other_amount': _int_list(args.other_amount),
+            'rondas_soportadas': _int_list(args.rondas_soportadas),
+            'profit_out': _int_list(args.profit_out),
+            'use_antigala': [bool(x) for x in _int_list(args.use_antigala)],
+            'gale': _gale_list(args.gale),
+            'max_rounds': _int_list(args.max_rounds),
+        })
+
+    metrics = None
+    if args.metrics or args.prometheus:
+        from instrumentation import Metrics
+        metrics = Metrics(prometheus=args.prometheus, interval=args.metrics_interval)
+
+    executed = sweep(configs, args.output, sessions=args.sessions, seed=args.seed, workers=args.workers,
+                     engine=args.engine, metrics=metrics)
+    if metrics is not None:
+        metrics.close(summary=args.metrics)
+    print(f'Se ejecutaron {executed} de {len(configs)} combinaciones. Resultados en {args.output}')
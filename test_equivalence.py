@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'test_equivalence.py'
+__description__ = '''Equivalencia de las versiones optimizadas con implementaciones directas (pytest)'''
+
+import os
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from analytics import streaks_and_gaps, hot_persistence
+from frequency import FrequencyIndex
+from markov import evaluate
+from rng import RandomStreams
+from simulation import SessionConfig, create_machine
+from spinlog import SpinLog, SpinLogWriter, NO_SPIN
+from vectorized import simulate
+from wheel import Wheel, FreeSlots, LAYOUTS
+
+def left_walk_unique_neighbors(wheel:list, neighbors_list:list, hotters:list) -> list:
+    '''
+    `select_unique_neighbors` original: sustituye cada repetido por el primer libre hacia la izquierda
+    '''
+    unique_neighbors = []
+    used = set()
+    for neigh in neighbors_list:
+        if neigh not in used and neigh not in hotters:
+            unique_neighbors.append(neigh)
+            used.add(neigh)
+            continue
+        index = wheel.index(neigh)
+        for offset in range(1, len(wheel)):
+            candidate = wheel[(index - offset) % len(wheel)]
+            if candidate not in used and candidate not in hotters:
+                unique_neighbors.append(candidate)
+                used.add(candidate)
+                break
+    return unique_neighbors
+
+@pytest.mark.parametrize('name', sorted(LAYOUTS))
+def test_free_slots_matches_left_walk(name):
+    wheel = Wheel.from_setting(name)
+    rng = random.Random(7)
+    for _ in range(200):
+        taken = set(rng.sample(range(wheel.size), rng.randrange(wheel.size)))
+        slots = FreeSlots(wheel.size, taken=taken)
+        for position in rng.sample(range(wheel.size), 5):
+            expected = next(((position - offset) % wheel.size for offset in range(wheel.size)
+                             if (position - offset) % wheel.size not in taken), None)
+            assert slots.find(position) == expected
+            if expected is not None:
+                slots.take(expected)
+                taken.add(expected)
+
+@pytest.mark.parametrize('name', sorted(LAYOUTS))
+def test_unique_neighbors_matches_left_walk(name):
+    crlm = create_machine(SessionConfig(numbers=name), rng=RandomStreams(1))
+    numbers = list(crlm.wheel.numbers)
+    rng = random.Random(3)
+    for _ in range(300):
+        hotters = rng.sample(numbers, rng.randint(1, 5))
+        radius = rng.randint(1, 3)
+        neighbors = [n for h in hotters for n in crlm.get_neighbors(h, radius)]
+        assert crlm.select_unique_neighbors(neighbors_list=neighbors, hotters=hotters) == \
+            left_walk_unique_neighbors(numbers, neighbors, hotters)
+
+@pytest.mark.parametrize('window', [1, 5, 37])
+def test_frequency_window_matches_counter(window):
+    rng = random.Random(window)
+    index = FrequencyIndex(window=window)
+    spins = []
+    for _ in range(500):
+        spins.append(rng.randrange(37))
+        index.add(spins[-1])
+        assert index.frequencies() == Counter(spins[-window:])
+
+@pytest.mark.parametrize('decay', [0.5, 0.9, 0.99])
+def test_frequency_decay_matches_weighted_counter(decay):
+    rng = random.Random(int(decay * 100))
+    index = FrequencyIndex(decay=decay)
+    spins = []
+    # -- Suficientes tiradas para pasar por el reescalado (RESCALE_AT)
+    for _ in range(1200):
+        spins.append(rng.randrange(13))
+        index.add(spins[-1])
+    expected = Counter()
+    for age, number in enumerate(reversed(spins)):
+        expected[number] += decay ** age
+    frequencies = index.frequencies()
+    assert frequencies.keys() == expected.keys()
+    for number, weight in expected.items():
+        assert frequencies[number] == pytest.approx(weight, rel=1e-9, abs=1e-12)
+
+@pytest.mark.parametrize('config', [
+    SessionConfig(method='TOP2', max_rounds=30),
+    SessionConfig(method='TOP3', max_rounds=40, use_antigala=True, profit_out=20),
+])
+def test_markov_matches_simulation(config):
+    sessions = 100_000
+    exact = evaluate(config)
+    results = simulate(config, sessions, seed=11).results()
+    reasons = Counter(r.exit_reason for r in results)
+    for reason, p in exact.exit_probability.items():
+        # -- Cinco desviaciones estándar de una proporción binomial
+        tolerance = 5 * np.sqrt(max(p * (1 - p), 1e-6) / sessions)
+        assert reasons[reason] / sessions == pytest.approx(p, abs=tolerance)
+    rounds = np.array([r.rounds for r in results])
+    assert rounds.mean() == pytest.approx(exact.expected_rounds, abs=5 * rounds.std() / np.sqrt(sessions))
+
+def naive_streaks_and_gaps(sequences:list) -> tuple:
+    streaks, gaps = Counter(), Counter()
+    for sequence in sequences:
+        length = 0
+        for i, number in enumerate(sequence):
+            length += 1
+            if i + 1 == len(sequence) or sequence[i + 1] != number:
+                streaks[length] += 1
+                length = 0
+        last = {}
+        for i, number in enumerate(sequence):
+            if number in last:
+                gaps[i - last[number] - 1] += 1
+            last[number] = i
+    return dict(streaks), dict(gaps)
+
+def naive_persistence(wheel:Wheel, sequences:list, window:int, top:int) -> tuple:
+    repeated = hits = pairs = 0
+    for sequence in sequences:
+        windows = [sequence[i:i + window] for i in range(0, len(sequence) - window + 1, window)]
+        hot = []
+        for numbers in windows:
+            counts = Counter(numbers)
+            hot.append(set(sorted(wheel.numbers, key=lambda n: -counts[n])[:top]))
+        for current, following, spins in zip(hot, hot[1:], windows[1:]):
+            repeated += len(current & following)
+            hits += sum(n in current for n in spins)
+            pairs += 1
+    return repeated / (pairs * top), hits / (pairs * window)
+
+@pytest.mark.parametrize('interleaved', [False, True])
+@pytest.mark.parametrize('chunk', [1, 7, 1 << 20])
+def test_session_analytics_match_naive_loop(tmp_path, interleaved, chunk):
+    wheel = Wheel.from_setting('little')
+    rng = random.Random(5)
+    # -- Pocos números distintos para tener rachas y huecos cortos
+    sequences = [[rng.choice(wheel.numbers[:4]) for _ in range(rng.randint(1, 60))] for _ in range(20)]
+    rows = [(s, r, n) for s, sequence in enumerate(sequences) for r, n in enumerate(sequence)]
+    if interleaved:
+        rows.sort(key=lambda row: (row[1], row[0]))
+    path = os.path.join(tmp_path, 'spins.rlog')
+    with SpinLogWriter(path) as log:
+        for session, round_number, number in rows:
+            log.append(session, round_number, number, 0, 0, 0)
+        log.append(0, 99, NO_SPIN, 0, 0, 0, 3)
+
+    result = streaks_and_gaps(SpinLog(path), wheel, chunk=chunk)
+    streaks, gaps = naive_streaks_and_gaps(sequences)
+    assert result['streaks'] == streaks
+    assert result['gaps'] == gaps
+
+    persistence = hot_persistence(SpinLog(path), wheel, window=5, top=2, chunk=chunk)
+    repeat_rate, hit_rate = naive_persistence(wheel, sequences, window=5, top=2)
+    assert persistence['repeat_rate'] == pytest.approx(repeat_rate)
+    assert persistence['next_window_hit_rate'] == pytest.approx(hit_rate)
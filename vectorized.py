@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'vectorized.py'
+__description__ = '''Simulación vectorizada (NumPy) de muchas sesiones en paralelo'''
+
+import numpy as np
+
+from frequency import FrequencyIndex
+from strategies import CommonsStrategy, top_size
+from rng import RandomStreams
+from wheel import Wheel
+from simulation import (SessionConfig, SessionResult, EXIT_FLAGS, NO_SPIN,
+                        EXIT_PROFIT, EXIT_BROKE, EXIT_INSUFFICIENT, EXIT_MAX_ROUNDS)
+
+# -- Códigos de salida guardados en el arreglo `exit_code`
+ACTIVE = 0
+EXIT_CODES = {code: reason for reason, code in EXIT_FLAGS.items()}
+_PROFIT, _BROKE = EXIT_FLAGS[EXIT_PROFIT], EXIT_FLAGS[EXIT_BROKE]
+_INSUFFICIENT, _MAX_ROUNDS = EXIT_FLAGS[EXIT_INSUFFICIENT], EXIT_FLAGS[EXIT_MAX_ROUNDS]
+
+class VectorizedSimulator:
+    '''
+    Avanza N sesiones de la misma configuración en paralelo, una tirada por paso.
+
+    El estado de cada sesión (cartera, índice del gale, frecuencias del historial)
+    se guarda en arreglos. Las frecuencias siguen `frequency_window` o
+    `frequency_decay` de la configuración, igual que `FrequencyIndex`
+    (`history_window`, si se indica, tiene prioridad sobre `frequency_window`). Las apuestas son vectores densos por casilla de la rueda
+    (en el orden de `numbers`), de modo que el pago es un solo gather por paso.
+    '''
+
+    def __init__(self, config:SessionConfig, sessions:int, seed:int=None, history_window:int=None, log=None,
+                 spins:np.ndarray=None):
+        self.config = config
+        # -- `SpinLogWriter` opcional donde se registra cada ronda de cada sesión
+        self.log = log
+        # -- Tiradas fijas opcionales (sesiones x rondas, posiciones en la rueda) para comparar
+        # -- variantes sobre la misma secuencia; sin ellas se sortean en cada paso
+        self.spins = spins
+        self.sessions = sessions
+        # -- Generadores independientes para las tiradas, los desempates y el historial inicial
+        streams = RandomStreams(seed)
+        self.spin_rng = streams.spins.generator
+        self.tie_rng = streams.ties.generator
+        self.history_rng = streams.history.generator
+        self.wheel = Wheel.from_setting(config.numbers)
+        self.numbers = np.asarray(self.wheel.numbers, dtype=np.int64)
+        self.size = len(self.numbers)
+        self.gale = np.asarray(config.gale, dtype=np.int64)
+        if history_window is None:
+            history_window = config.frequency_window
+        if history_window is not None and config.frequency_decay is not None:
+            raise ValueError('Indique una ventana o un decaimiento, no ambos')
+        if history_window is not None and history_window <= 0:
+            raise ValueError('La ventana debe ser mayor que cero')
+        if config.frequency_decay is not None and not 0 < config.frequency_decay < 1:
+            raise ValueError('El decaimiento debe estar entre 0 y 1')
+        self.history_window = history_window
+        self.decay = config.frequency_decay
+
+        self.initial_wallet = config.initial_wallet
+        self.wallet = np.full(sessions, self.initial_wallet, dtype=np.int64)
+        self.peak = self.wallet.copy()
+        self.max_drawdown = np.zeros(sessions, dtype=np.int64)
+        self.index = np.zeros(sessions, dtype=np.int64)
+        self.rounds = np.zeros(sessions, dtype=np.int64)
+        self.exit_code = np.zeros(sessions, dtype=np.int8)
+
+        # -- Frecuencias por casilla y ventana circular de las últimas tiradas. Con
+        # -- decaimiento cada tirada nueva pesa `scale` (por sesión) en vez de reducir las demás
+        self.counts = np.zeros((sessions, self.size), dtype=np.int32 if self.decay is None else np.float64)
+        self.scale = np.ones(sessions) if self.decay is not None else None
+        self.window = None
+        self.window_pos = 0
+        if history_window is not None:
+            self.window = np.full((sessions, history_window), -1, dtype=np.int64)
+
+        self._build_static_plans()
+        self._initialize_history()
+
+    def _build_static_plans(self) -> None:
+        '''
+        Prepara las partes de los planes que no dependen del historial
+        '''
+        positions = np.arange(self.size)
+        self.left = (positions - 1) % self.size
+        self.right = (positions + 1) % self.size
+        # -- Vecinos en el orden de `get_neighbors`: izq 1, der 1, izq 2, der 2, ...
+        self.sides = []
+        for d in range(1, self.config.radius + 1):
+            self.sides.extend(((positions - d) % self.size, (positions + d) % self.size))
+        self.unseen_keys = (-1.0 - positions).astype(np.float32)
+        # -- Distancia circular entre casillas y ceros de la rueda (montos por rol opcionales)
+        steps = (positions[None, :] - positions[:, None]) % self.size
+        self.distance = np.minimum(steps, self.size - steps)
+        self.zeros = np.array([self.wheel.is_zero(n) for n in self.wheel.numbers])
+
+        # -- COMMONS: números de la mesa fija (0-12) jugados; los de la lista a HOT_AMOUNT
+        self.commons_played = np.isin(self.numbers, CommonsStrategy.TABLE)
+        self.commons_hot = np.isin(self.numbers, CommonsStrategy.NUMBERS)
+
+    def _initialize_history(self) -> None:
+        '''
+        Igual que `initialize_history`: bloques de números únicos al azar
+        '''
+        take = min(self.config.history_size, self.size)
+        for _ in range(self.config.initial_history_blocks):
+            blocks = np.argsort(self.history_rng.random((self.sessions, self.size)), axis=1)[:, :take]
+            for column in blocks.T:
+                self._record(np.arange(self.sessions), column)
+
+    def _record(self, rows:np.ndarray, positions:np.ndarray) -> None:
+        '''
+        Agrega una tirada al historial de las sesiones indicadas
+        '''
+        if self.decay is not None:
+            self.scale[rows] /= self.decay
+            self.counts[rows, positions] += self.scale[rows]
+            rescale = rows[self.scale[rows] > FrequencyIndex.RESCALE_AT]
+            if rescale.size:
+                self.counts[rescale] /= self.scale[rescale, None]
+                self.scale[rescale] = 1.0
+            return
+        self.counts[rows, positions] += 1
+        if self.window is not None:
+            slot = self.window_pos % self.history_window
+            expired = self.window[rows, slot]
+            alive = expired >= 0
+            self.counts[rows[alive], expired[alive]] -= 1
+            self.window[rows, slot] = positions
+            self.window_pos += 1
+
+    def hotters(self, rows:np.ndarray, top:int) -> np.ndarray:
+        '''
+        Top `top` posiciones más frecuentes con aleatoriedad ponderada (como `get_hotters`).
+        Las casillas sin apariciones van al final en el orden de la rueda.
+        '''
+        counts = self.counts[rows]
+        if self.decay is not None:
+            counts = counts / self.scale[rows, None]
+        if self.spins is not None:
+            # -- Con tiradas fijas se sortean claves para todas las sesiones, así cada sesión
+            # -- recibe las mismas claves sin importar cuáles siguen activas en cada variante
+            keys = self.tie_rng.random((self.sessions, self.size), dtype=np.float32)[rows]
+        else:
+            keys = self.tie_rng.random(counts.shape, dtype=np.float32)
+        keys *= counts
+        empty = counts == 0
+        keys[empty] = np.broadcast_to(self.unseen_keys, keys.shape)[empty]
+
+        # -- `top` es pequeño: varios argmax son más baratos que ordenar cada fila
+        base = np.arange(len(rows)) * self.size
+        flat = keys.ravel()
+        hot = np.empty((len(rows), top), dtype=np.int64)
+        for j in range(top):
+            hot[:, j] = keys.argmax(axis=1)
+            flat[base + hot[:, j]] = -np.inf
+        return hot
+
+    def plan(self, rows:np.ndarray) -> tuple:
+        '''
+        Devuelve (montos, jugadas) por casilla para las sesiones indicadas, sin multiplicador
+        '''
+        config = self.config
+        n = len(rows)
+        amounts = np.empty((n, self.size), dtype=np.int64)
+        played = np.ones((n, self.size), dtype=bool)
+        base = np.arange(n) * self.size
+
+        top = top_size(config.method)
+        if top is not None:
+            hot = self.hotters(rows, top)
+            hot_flat = (base[:, None] + hot).ravel()
+            taken = np.zeros(n * self.size, dtype=bool)
+            taken[hot_flat] = True
+            neighs = []
+
+            for j in range(hot.shape[1]):
+                for side in self.sides:
+                    candidate = side[hot[:, j]]
+                    # -- Si está ocupado, buscar hacia la izquierda la primera casilla libre
+                    pending = np.flatnonzero(taken[base + candidate])
+                    for _ in range(self.size - 1):
+                        if not len(pending):
+                            break
+                        candidate[pending] = self.left[candidate[pending]]
+                        pending = pending[taken[base[pending] + candidate[pending]]]
+                    flat = base + candidate
+                    if len(pending):
+                        flat = np.delete(flat, pending)
+                    taken[flat] = True
+                    neighs.append(flat)
+
+            amounts.fill(config.other_amount)
+            if config.zero_amount is not None:
+                amounts[:, self.zeros] = config.zero_amount
+            flat_amounts = amounts.ravel()
+            neigh_flat = np.concatenate(neighs)
+            if config.neight_amounts is None:
+                flat_amounts[neigh_flat] = config.neight_amount
+            else:
+                # -- Monto según la distancia al hotter más cercano (como `Strategy.amounts`)
+                nearest = self.distance[hot].min(axis=1).ravel()
+                distance = np.clip(nearest[neigh_flat], 1, config.radius)
+                flat_amounts[neigh_flat] = np.asarray(config.neight_amounts, dtype=np.int64)[distance - 1]
+            flat_amounts[hot_flat] = config.hot_amount
+            return amounts, played
+
+        if config.method == 'COMMONS':
+            hot = self.hotters(rows, 2)
+            played[:] = self.commons_played
+            amounts[:] = np.where(self.commons_hot, config.hot_amount, 0)
+            # -- Los hotters fuera de la mesa fija también se juegan
+            hot_flat = (base[:, None] + hot).ravel()
+            extra = hot_flat[~played.ravel()[hot_flat]]
+            played.ravel()[extra] = True
+            amounts.ravel()[extra] = config.hot_amount
+            return amounts, played
+
+        raise ValueError('El top indicado no es valido')
+
+    def step(self) -> int:
+        '''
+        Avanza una tirada en todas las sesiones activas. Retorna cuántas siguen activas.
+        '''
+        config = self.config
+        rows = np.flatnonzero(self.exit_code == ACTIVE)
+        if len(rows) == 0:
+            return 0
+
+        amounts, played = self.plan(rows)
+        amounts *= self.gale[self.index[rows]][:, None]
+        total_bet = amounts.sum(axis=1)
+
+        # -- Saldo insuficiente: la sesión termina sin jugar
+        insufficient = total_bet > self.wallet[rows]
+        self.exit_code[rows[insufficient]] = _INSUFFICIENT
+        if self.log is not None and insufficient.any():
+            out = rows[insufficient]
+            self.log.extend(out, self.rounds[out], NO_SPIN, 0, self.wallet[out], self.index[out], _INSUFFICIENT)
+        keep = ~insufficient
+        rows, amounts, played, total_bet = rows[keep], amounts[keep], played[keep], total_bet[keep]
+
+        if self.spins is not None:
+            spins = self.spins[rows, self.rounds[rows]].astype(np.int64)
+        else:
+            spins = self.spin_rng.integers(0, self.size, len(rows))
+        cell = np.arange(len(rows)) * self.size + spins
+        hit = played.ravel()[cell]
+        prize = amounts.ravel()[cell] * config.pay_for
+
+        wallet = self.wallet[rows] - total_bet + np.where(hit, prize, -total_bet)
+        self.wallet[rows] = wallet
+        self.rounds[rows] += 1
+        self._record(rows, spins)
+
+        # -- ANTIMARTIGALA
+        if config.use_antigala:
+            index = self.index[rows]
+            index = np.where(hit, (index + 1) % len(self.gale), index)
+            self.index[rows] = index
+        else:
+            self.index[rows] = 0
+
+        peak = np.maximum(self.peak[rows], wallet)
+        self.peak[rows] = peak
+        self.max_drawdown[rows] = np.maximum(self.max_drawdown[rows], peak - wallet)
+
+        profit = np.round(100 * (wallet - self.initial_wallet) / self.initial_wallet, 2)
+        code = np.zeros(len(rows), dtype=np.int8)
+        if config.max_rounds is not None:
+            code[self.rounds[rows] >= config.max_rounds] = _MAX_ROUNDS
+        code[wallet <= 0] = _BROKE
+        code[profit >= config.profit_out] = _PROFIT
+        self.exit_code[rows] = code
+
+        if self.log is not None:
+            self.log.extend(rows, self.rounds[rows], self.numbers[spins], total_bet, wallet, self.index[rows], code)
+
+        return int(np.count_nonzero(self.exit_code == ACTIVE))
+
+    def run(self) -> 'VectorizedSimulator':
+        '''
+        Avanza hasta que todas las sesiones hayan salido
+        '''
+        if self.config.max_rounds is None:
+            raise ValueError('La simulación vectorizada requiere max_rounds')
+        while self.step():
+            pass
+        return self
+
+    def exit_reasons(self) -> np.ndarray:
+        '''
+        Motivo de salida de cada sesión como texto
+        '''
+        names = np.array(['active', *EXIT_CODES.values()])
+        return names[self.exit_code]
+
+    def results(self) -> list:
+        '''
+        Convierte el estado final en una lista de `SessionResult`
+        '''
+        reasons = self.exit_reasons()
+        return [SessionResult(rounds=int(self.rounds[i]),
+                              final_wallet=int(self.wallet[i]),
+                              initial_wallet=self.initial_wallet,
+                              max_drawdown=int(self.max_drawdown[i]),
+                              exit_reason=str(reasons[i]))
+                for i in range(self.sessions)]
+
+def simulate(config:SessionConfig, sessions:int, seed:int=None, history_window:int=None, log=None,
+             spins:np.ndarray=None) -> VectorizedSimulator:
+    '''
+    Simula `sessions` sesiones en paralelo y retorna el simulador con el estado final
+    '''
+    return VectorizedSimulator(config, sessions, seed=seed, history_window=history_window, log=log, spins=spins).run()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+
+__author__ = 'José E. Morales Ventura'
+__date__ = '18/Octubre/2026'
+__proyect__ = 'wheel.py'
+__description__ = '''Topología de la rueda: posiciones, vecinos y sectores precalculados'''
+
+# -- El doble cero de la ruleta americana se representa con el entero 37
+DOUBLE_ZERO = 37
+
+LITTLE_MACHINE = (0, 5, 12, 3, 10, 1, 8, 9, 2, 7, 6, 11, 4)
+
+EUROPEAN = (0, 32, 15, 19, 4, 21, 2, 25, 17, 34, 6, 27, 13, 36, 11, 30, 8, 23, 10,
+            5, 24, 16, 33, 1, 20, 14, 31, 9, 22, 18, 29, 7, 28, 12, 35, 3, 26)
+
+AMERICAN = (0, 28, 9, 26, 30, 11, 7, 20, 32, 17, 5, 22, 34, 15, 3, 24, 36, 13, 1,
+            DOUBLE_ZERO, 27, 10, 25, 29, 12, 8, 19, 31, 18, 6, 21, 33, 16, 4, 23, 35, 14, 2)
+
+# -- Números rojos de las ruedas reales (europea y americana)
+REDS = frozenset((1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36))
+
+EUROPEAN_SECTORS = {
+    'voisins': (22, 18, 29, 7, 28, 12, 35, 3, 26, 0, 32, 15, 19, 4, 21, 2, 25),
+    'tiers': (27, 13, 36, 11, 30, 8, 23, 10, 5, 24, 16, 33),
+    'orphelins': (1, 20, 14, 31, 9, 17, 34, 6),
+}
+
+class Wheel:
+    '''
+    Rueda construida una sola vez a partir del orden físico de sus números.
+    Las consultas de posición, vecinos y sector cuestan O(1).
+    '''
+
+    def __init__(self, numbers, name:str='custom', reds=None, sectors:dict=None):
+        self.numbers = tuple(numbers)
+        if len(set(self.numbers)) != len(self.numbers):
+            raise ValueError('La rueda tiene números repetidos')
+        self.name = name
+        self.size = len(self.numbers)
+        self.positions = {n: i for i, n in enumerate(self.numbers)}
+        self.reds = frozenset(reds) if reds is not None else None
+        self.sectors = {name: tuple(values) for name, values in (sectors or {}).items()}
+        self.sector_of = {n: name for name, values in self.sectors.items() for n in values}
+        # -- Tablas de vecinos por radio, calculadas la primera vez que se piden
+        self._neighbors = {}
+
+    @classmethod
+    def from_setting(cls, value) -> 'Wheel':
+        '''
+        Crea la rueda desde el valor `numbers` del .env: el nombre de una rueda
+        incorporada (little, european, american) o la lista de números separada por coma
+        '''
+        if isinstance(value, Wheel):
+            return value
+        if not isinstance(value, str):
+            return cls(value)
+        key = value.strip().lower()
+        if key in LAYOUTS:
+            return LAYOUTS[key]()
+        return cls(int(x) for x in value.replace(' ', '').split(','))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        return iter(self.numbers)
+
+    def __contains__(self, number) -> bool:
+        return number in self.positions
+
+    def position(self, number:int) -> int:
+        return self.positions[number]
+
+    def left(self, number:int, distance:int=1) -> int:
+        return self.numbers[(self.positions[number] - distance) % self.size]
+
+    def right(self, number:int, distance:int=1) -> int:
+        return self.numbers[(self.positions[number] + distance) % self.size]
+
+    def neighbor_table(self, radius:int=1) -> dict:
+        '''
+        Tabla número -> (izq 1, der 1, izq 2, der 2, ...) hasta `radius`
+        '''
+        table = self._neighbors.get(radius)
+        if table is None:
+            table = {}
+            for i, n in enumerate(self.numbers):
+                around = []
+                for d in range(1, radius + 1):
+                    around.append(self.numbers[(i - d) % self.size])
+                    around.append(self.numbers[(i + d) % self.size])
+                table[n] = tuple(around)
+            self._neighbors[radius] = table
+        return table
+
+    def neighbors(self, number:int, radius:int=1) -> tuple:
+        return self.neighbor_table(radius)[number]
+
+    def sector(self, number:int) -> str:
+        '''
+        Sector al que pertenece el número (None si la rueda no define sectores)
+        '''
+        return self.sector_of.get(number)
+
+    def sector_numbers(self, name:str) -> tuple:
+        return self.sectors[name]
+
+    def is_zero(self, number:int) -> bool:
+        return number == 0 or (number == DOUBLE_ZERO and self.name == 'american')
+
+    def is_red(self, number:int) -> bool:
+        '''
+        Rojo según la rueda real; en la máquina pequeña los impares son rojos
+        '''
+        if self.reds is not None:
+            return number in self.reds
+        return number % 2 == 1
+
+    def label(self, number:int) -> str:
+        if number == DOUBLE_ZERO and self.name == 'american':
+            return '00'
+        return str(number)
+
+class FreeSlots:
+    '''
+    Casillas libres de la rueda con búsqueda de "la siguiente libre hacia la izquierda".
+
+    Union-find con compresión de caminos: cada casilla ocupada apunta a su vecina
+    izquierda, así `find` salta en tiempo casi constante los tramos ya ocupados.
+    Solo se guardan las casillas ocupadas, por lo que crearla no depende del tamaño de la rueda.
+    '''
+
+    def __init__(self, size:int, taken=()):
+        self.size = size
+        self.parent = {}
+        for position in taken:
+            self.take(position)
+
+    @property
+    def free(self) -> int:
+        return self.size - len(self.parent)
+
+    def find(self, position:int):
+        '''
+        Primera posición libre en `position` o a su izquierda; None si la rueda está llena
+        '''
+        if len(self.parent) >= self.size:
+            return None
+        parent = self.parent
+        root = position
+        while root in parent:
+            root = parent[root]
+        # -- Compresión de caminos
+        while position != root:
+            parent[position], position = root, parent[position]
+        return root
+
+    def take(self, position:int) -> None:
+        if position not in self.parent:
+            self.parent[position] = (position - 1) % self.size
+
+LAYOUTS = {
+    'little': lambda: Wheel(LITTLE_MACHINE, name='little'),
+    'european': lambda: Wheel(EUROPEAN, name='european', reds=REDS, sectors=EUROPEAN_SECTORS),
+    'american': lambda: Wheel(AMERICAN, name='american', reds=REDS),
+}